@@ -1,44 +1,221 @@
-from typing import Any, Dict, List, Optional, Type
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+from becs.archetype import Archetype
 from becs.atomic import AtomicID
-from becs.exceptions import ComponentInstanceNotFound, ComponentNotFound, EntityNotFound
-from becs.meta import ComponentMeta, FieldMeta
+from becs.columnar import ColumnRow, ColumnStore, is_numeric
+from becs.commands import CommandBuffer
+from becs.compiled import SlotComponent
+from becs.exceptions import (
+    ComponentInstanceNotFound,
+    HistoryNotEnabled,
+    ComponentNotColumnar,
+    ComponentNotFound,
+    EntityNotFound,
+    FieldNotFound,
+    PrefabNotFound,
+    ProfilingNotEnabled,
+)
+from becs.meta import TAG_INSTANCE, ComponentMeta, FieldMeta
+from becs.slotmap import SequenceID, SlotMap
 from becs.reactive_dict import EVT_ITEM_ADDED, EVT_ITEM_CHANGED, EVT_ITEM_REMOVED, ReactiveDict
-from becs.events import EventDispatcherMixin
+from becs.events import (
+    EventDispatcherMixin,
+    EventQueue,
+    ImmediateListener,
+    WeakListener,
+)
+from becs.index import (
+    INDEX_HASH,
+    MISSING,
+    Index,
+    find_index,
+    matches_lookup,
+    new_index,
+)
+from becs.instrument import WORLD_OPERATIONS, Profiler
+from becs.filter import Selection
+from becs.pool import ComponentPool
+from becs.prefab import Prefab
+from becs.query import Query
+from becs.storage import StorageBackend
+from becs import snapshot
+from becs.system import DEFAULT_STAGES, Scheduler, System
 
 EVT_ENTITY_ADDED = "entity-added"
 EVT_ENTITY_REMOVED = "entity-removed"
 EVT_COMPONENT_ADDED = "component-added"
 EVT_COMPONENT_REMOVED = "component-removed"
 EVT_COMPONENT_DEFINED = "component-defined"
+EVT_COMPONENT_MODIFIED = "component-modified"
+EVT_ENTITIES_ADDED = "entities-added"
+EVT_ENTITIES_REMOVED = "entities-removed"
+EVT_COMPONENTS_ADDED = "components-added"
+EVT_COMPONENTS_REMOVED = "components-removed"
+EVT_COMPONENTS_MODIFIED = "components-modified"
+EVT_ARCHETYPE_CREATED = "archetype-created"
+EVT_SYSTEM_ADDED = "system-added"
+EVT_SYSTEM_REMOVED = "system-removed"
+EVT_TICK = "tick"
+
+HANDLES_GLOBAL = "global"
+HANDLES_LOCAL = "local"
+
+
+# while deferred, repeated changes of a component field collapse into one event
+COMPONENT_MODIFIED_COALESCE = (
+    lambda kargs: kargs[:3],
+    lambda queued, kargs: kargs[:4] + (queued[4],),
+)
 
 
 class World(EventDispatcherMixin):
     _entities: Dict[str, Dict[str, str]]
-    _components: Dict[str, ReactiveDict]
+    _components: Union[Dict[str, ReactiveDict], StorageBackend]
+    _storage: Optional[StorageBackend] = None
     _componentMeta: Dict[str, ComponentMeta]
+    _columns: Dict[str, ColumnStore]
+    _slot_classes: Dict[str, Type[SlotComponent]]
+    _pools: Dict[str, ComponentPool]
+    _indexes: Dict[str, List[Index]]
+    _tags: Dict[str, Set[str]]
+    _commands: CommandBuffer
+    _prefabs: Dict[str, Prefab]
+    _archetypes: Dict[FrozenSet[str], Archetype]
+    _entity_archetype: Dict[str, Archetype]
+    _queries: Dict[Tuple[Tuple[str, ...], FrozenSet[str]], Query]
+    _scheduler: Scheduler
+    _tick: int = 0
+    _change_tick: int = 0
+    _changes: Dict[str, Dict[str, int]]
+    _event_queue: Optional[EventQueue] = None
+    _profiler: Optional[Profiler] = None
+    _history: Optional[Any] = None
     _eid: AtomicID
-    _cid: AtomicID
+    _cid: Union[AtomicID, SequenceID]
+    _slots: Optional[SlotMap] = None
+    _global_ids: Dict[int, int]
     _node_id: int = 1
+    _coalesce = {EVT_COMPONENT_MODIFIED: COMPONENT_MODIFIED_COALESCE}
 
-    def __init__(self, node_id: Optional[int] = None):
+    def __init__(
+        self,
+        node_id: Optional[int] = None,
+        stages: Iterable[str] = DEFAULT_STAGES,
+        max_workers: Optional[int] = None,
+        handles: str = HANDLES_GLOBAL,
+        storage: Optional[StorageBackend] = None,
+    ):
         self._entities = dict()
         self._components = dict()
+        if storage is not None:
+            # component instances are paged in and out of the backend, archetype
+            # rows hold component ids instead of instances
+            storage.bind(self._load_component)
+            self._components = self._storage = storage
+
         self._componentMeta = dict()
+        self._columns = dict()
+        self._slot_classes = dict()
+        self._pools = dict()
+        # instances waiting for the event queue to flush before going back to a pool
+        self._released = []
+        self._indexes = dict()
+        self._tags = dict()
+        self._commands = CommandBuffer()
+        self._prefabs = dict()
+        self._archetypes = dict()
+        self._entity_archetype = dict()
+        self._queries = dict()
+        self._changes = dict()
+        self._scheduler = Scheduler(stages, max_workers, self._end_batch)
+
+        # shared by every component instance so they don't keep the world alive
+        # change ticks, history and indexes are updated as the write happens, only
+        # EVT_COMPONENT_MODIFIED waits for the flush while events are deferred
+        self._modified_listener = ImmediateListener(
+            WeakListener(self._on_component_modified)
+        )
+        self._root_archetype = self._get_archetype(frozenset())
 
         if node_id:
             self._node_id = node_id
 
         self._eid = AtomicID(node_id=self._node_id)
-        self._cid = AtomicID(node_id=self._node_id)
+        self._handles = handles
+
+        if handles == HANDLES_LOCAL:
+            # entities are slot map handles, snowflake ids are only computed when
+            # asked for through global_id
+            self._slots = SlotMap()
+            self._global_ids = dict()
+            self._cid = SequenceID()
+        elif handles == HANDLES_GLOBAL:
+            self._cid = AtomicID(node_id=self._node_id)
+        else:
+            raise ValueError("Unknown entity handle mode: {}".format(handles))
+
+    def define_component(
+        self,
+        meta: ComponentMeta,
+        columnar: bool = False,
+        slots: bool = False,
+        observable: bool = True,
+        pool_size: int = 0,
+    ):
+        if columnar and not meta.is_tag:
+            if not is_numeric(meta):
+                raise ComponentNotColumnar(meta.component_name)
+
+            self._columns[meta.component_name] = ColumnStore(meta)
+        elif meta.is_tag and not slots:
+            # tag components only record membership, no per-entity instance
+            self._tags[meta.component_name] = set()
+        elif slots:
+            # instances of a class compiled from the meta, observable=False drops
+            # change events and tracking for the fastest field writes
+            self._slot_classes[meta.component_name] = meta.compile(observable)
+
+        if self._storage is not None and meta.component_name not in self._tags:
+            self._storage.define(
+                meta, meta.component_name in self._columns, not slots or observable
+            )
+
+        pooled = (
+            pool_size > 0
+            and self._storage is None
+            and meta.component_name not in self._columns
+            and meta.component_name not in self._tags
+        )
+        if pooled:
+            # released instances are reset and reused instead of reallocated
+            self._pools[meta.component_name] = ComponentPool(
+                meta, self._slot_classes.get(meta.component_name), pool_size
+            )
+        else:
+            self._pools.pop(meta.component_name, None)
 
-    def define_component(self, meta: ComponentMeta):
         self._componentMeta[meta.component_name] = meta
+        self._changes.setdefault(meta.component_name, dict())
         self.fire(EVT_COMPONENT_DEFINED, meta)
 
     def add_entity(self, *components: List[str]):
-        id = str(self._eid.next())
+        if self._slots is not None:
+            id = self._slots.allocate()
+        else:
+            id = str(self._eid.next())
+
         if id not in self._entities:
-            self._entities[id] = dict()
+            self._insert_entity(id)
 
         for comp in components:
             self.add_component(id, comp)
@@ -55,7 +232,19 @@ class World(EventDispatcherMixin):
         for comp_name in components:
             self.remove_component(entity_id, comp_name)
 
+        for comp_name, tagged in self._tags.items():
+            if entity_id in tagged:
+                self.remove_component(entity_id, comp_name)
+
+        archetype = self._entity_archetype.pop(entity_id, None)
+        if archetype is not None:
+            archetype.remove(entity_id)
+
+        if self._history is not None:
+            self._history.despawned([entity_id])
+
         del self._entities[entity_id]
+        self._release_entity(entity_id)
         self.fire(EVT_ENTITY_REMOVED, entity_id)
 
     def add_component(self, entity_id: str, component: str):
@@ -64,25 +253,204 @@ class World(EventDispatcherMixin):
 
         if component not in self._componentMeta:
             raise ComponentNotFound(component)
-        
-        id = str(self._cid.next())
 
-        meta = self._componentMeta[component]
-        comp_instance = meta.instantiate()
-        comp_instance.tag = {
-            "id": id,
-            "entity_id": entity_id,
-            "component": component
-        }
-        comp_instance.on(EVT_ITEM_CHANGED, self._on_component_modified)
+        tagged = self._tags.get(component)
+        if tagged is not None:
+            if self._history is not None and entity_id not in tagged:
+                self._history.created(component, [entity_id])
 
-        self._components[id] = comp_instance
-        self._entities[entity_id][component] = id
+            tagged.add(entity_id)
+            self._mark_entity_changed(component, entity_id)
+            self.fire(EVT_COMPONENT_ADDED, entity_id, None, component)
+            return None
+
+        id, comp_instance = self._create_component(entity_id, component)
+        self._move_entity(entity_id, component, self._cell(id, comp_instance))
 
         self.fire(EVT_COMPONENT_ADDED, entity_id, id, component)
 
         return id
 
+    def add_entities(
+        self,
+        count: int,
+        components: Iterable[str],
+        initial_values: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List[str]:
+        components = tuple(dict.fromkeys(components))
+        for comp in components:
+            if comp not in self._componentMeta:
+                raise ComponentNotFound(comp)
+
+        initial_values = initial_values or {}
+        if self._slots is not None:
+            ids = self._slots.allocate_many(count)
+        else:
+            ids = [str(id) for id in self._eid.next_batch(count)]
+
+        for id in ids:
+            self._entities[id] = dict()
+
+        if self._history is not None:
+            self._history.spawned(ids)
+
+        tags = [comp for comp in components if comp in self._tags]
+        for comp in tags:
+            if self._history is not None:
+                self._history.created(comp, ids)
+
+            self._tags[comp].update(ids)
+            self._mark_changed_many(comp, ids)
+
+        stored = [comp for comp in components if comp not in self._tags]
+        cells = dict()
+        for comp in stored:
+            instances = self._instantiate_many(comp, ids, initial_values.get(comp))
+            cids = self._next_component_ids(len(ids))
+            self._create_components(comp, ids, instances, cids)
+            cells[comp] = instances if self._storage is None else cids
+
+        archetype = self._get_archetype(frozenset(stored))
+        archetype.extend(ids, cells)
+        for id in ids:
+            self._entity_archetype[id] = archetype
+
+        self.fire(EVT_ENTITIES_ADDED, ids, components)
+
+        return ids
+
+    def remove_entities(self, entity_ids: Iterable[str]):
+        entity_ids = list(dict.fromkeys(entity_ids))
+        for entity_id in entity_ids:
+            if entity_id not in self._entities:
+                raise EntityNotFound(entity_id)
+
+        if self._history is not None:
+            for comp, tagged in self._tags.items():
+                self._history.destroyed(comp, [id for id in entity_ids if id in tagged])
+            self._history.despawned(entity_ids)
+
+        for entity_id in entity_ids:
+            for comp_name in list(self._entities[entity_id]):
+                self._destroy_component(entity_id, comp_name)
+
+            archetype = self._entity_archetype.pop(entity_id, None)
+            if archetype is not None:
+                archetype.remove(entity_id)
+
+            del self._entities[entity_id]
+            self._release_entity(entity_id)
+
+        for comp, tagged in self._tags.items():
+            tagged.difference_update(entity_ids)
+            changes = self._changes[comp]
+            for entity_id in entity_ids:
+                changes.pop(entity_id, None)
+
+        self.fire(EVT_ENTITIES_REMOVED, entity_ids)
+
+    def add_components(self, entity_ids: Iterable[str], component: str) -> List[str]:
+        entity_ids = list(dict.fromkeys(entity_ids))
+        for entity_id in entity_ids:
+            if entity_id not in self._entities:
+                raise EntityNotFound(entity_id)
+
+        if component not in self._componentMeta:
+            raise ComponentNotFound(component)
+
+        tagged = self._tags.get(component)
+        if tagged is not None:
+            if self._history is not None:
+                self._history.created(
+                    component, [id for id in entity_ids if id not in tagged]
+                )
+
+            tagged.update(entity_ids)
+            self._mark_changed_many(component, entity_ids)
+            ids = [None] * len(entity_ids)
+            self.fire(EVT_COMPONENTS_ADDED, entity_ids, ids, component)
+            return ids
+
+        ids = self._next_component_ids(len(entity_ids))
+        instances = self._instantiate_many(component, entity_ids)
+        self._create_components(component, entity_ids, instances, ids)
+        for entity_id, id, comp_instance in zip(entity_ids, ids, instances):
+            self._move_entity(entity_id, component, self._cell(id, comp_instance))
+
+        self.fire(EVT_COMPONENTS_ADDED, entity_ids, ids, component)
+
+        return ids
+
+    def remove_components(self, entity_ids: Iterable[str], component: str):
+        entity_ids = list(dict.fromkeys(entity_ids))
+        tagged = self._tags.get(component)
+        if tagged is not None:
+            missing = set(entity_ids).difference(tagged)
+            if missing:
+                entity_id = next(id for id in entity_ids if id in missing)
+                if entity_id not in self._entities:
+                    raise EntityNotFound(entity_id)
+
+                raise ComponentNotFound(component)
+
+            if self._history is not None:
+                self._history.destroyed(component, entity_ids)
+
+            tagged.difference_update(entity_ids)
+            changes = self._changes[component]
+            for entity_id in entity_ids:
+                changes.pop(entity_id, None)
+
+            self.fire(
+                EVT_COMPONENTS_REMOVED, entity_ids, [None] * len(entity_ids), component
+            )
+            return
+
+        for entity_id in entity_ids:
+            if entity_id not in self._entities:
+                raise EntityNotFound(entity_id)
+
+            if component not in self._entities[entity_id]:
+                raise ComponentNotFound(component)
+
+        ids = []
+        for entity_id in entity_ids:
+            ids.append(self._destroy_component(entity_id, component))
+            self._move_entity(entity_id, component)
+
+        self.fire(EVT_COMPONENTS_REMOVED, entity_ids, ids, component)
+
+    def define_prefab(
+        self, name: str, components: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Prefab:
+        values = dict()
+        for comp, overrides in components.items():
+            if comp not in self._componentMeta:
+                raise ComponentNotFound(comp)
+
+            defaults = self._componentMeta[comp].defaults()
+            for field in overrides or ():
+                if field not in defaults:
+                    raise FieldNotFound(field)
+
+            if overrides:
+                values[comp] = dict(overrides)
+
+        prefab = self._prefabs[name] = Prefab(name, tuple(components), values)
+
+        return prefab
+
+    def get_prefab(self, name: str) -> Prefab:
+        if name not in self._prefabs:
+            raise PrefabNotFound(name)
+
+        return self._prefabs[name]
+
+    def spawn(self, prefab: str, count: int = 1) -> List[str]:
+        prefab = self.get_prefab(prefab)
+
+        return self.add_entities(count, prefab.components, prefab.values)
+
     def get_component_meta(self, component: str):
         if component not in self._componentMeta:
             raise ComponentNotFound(component)
@@ -96,45 +464,642 @@ class World(EventDispatcherMixin):
         entity = self._entities[entity_id]
 
         if component not in entity:
+            if entity_id in self._tags.get(component, ()):
+                return TAG_INSTANCE
+
             raise ComponentNotFound("component")
 
         cid = entity[component]
+        comp_instance = self._components.get(cid)
 
-        if cid not in self._components:
+        if comp_instance is None:
             raise ComponentInstanceNotFound(cid)
 
-        return self._components[cid]
+        return comp_instance
+
+    def columns(self, component: str):
+        if component not in self._componentMeta:
+            raise ComponentNotFound(component)
+
+        if component not in self._columns:
+            raise ComponentNotColumnar(component)
+
+        return self._columns[component].columns()
+
+    def column_store(self, component: str) -> ColumnStore:
+        if component not in self._columns:
+            raise ComponentNotColumnar(component)
+
+        return self._columns[component]
 
     def list_entity_components(self, entity_id: str):
         if entity_id not in self._entities:
             raise EntityNotFound(entity_id)
 
-        return self._entities[entity_id].keys()
+        components = self._entities[entity_id].keys()
+        if self._tags:
+            components = list(components) + [
+                tag for tag, tagged in self._tags.items() if entity_id in tagged
+            ]
+
+        return components
 
     def entity_has_component(self, entity_id: str, component: str):
         if entity_id not in self._entities:
             raise EntityNotFound(entity_id)
 
+        tagged = self._tags.get(component)
+        if tagged is not None:
+            return entity_id in tagged
+
         return component in self._entities[entity_id]
 
     def remove_component(self, entity_id: str, component: str):
         if entity_id not in self._entities:
             raise EntityNotFound(entity_id)
 
+        tagged = self._tags.get(component)
+        if tagged is not None:
+            if entity_id not in tagged:
+                raise ComponentNotFound(component)
+
+            if self._history is not None:
+                self._history.destroyed(component, [entity_id])
+
+            tagged.discard(entity_id)
+            self._changes[component].pop(entity_id, None)
+            self.fire(EVT_COMPONENT_REMOVED, entity_id, None, component)
+            return
+
         if component not in self._entities[entity_id]:
             raise ComponentNotFound(component)
 
+        cid = self._destroy_component(entity_id, component)
+        self._move_entity(entity_id, component)
+
+        self.fire(EVT_COMPONENT_REMOVED, entity_id, cid, component)
+
+    def global_id(self, entity_id) -> int:
+        if entity_id not in self._entities:
+            raise EntityNotFound(entity_id)
+
+        if self._slots is None:
+            return int(entity_id)
+
+        gid = self._global_ids.get(entity_id)
+        if gid is None:
+            gid = self._global_ids[entity_id] = self._eid.next()
+
+        return gid
+
+    def _insert_entity(self, entity_id):
+        if self._history is not None:
+            self._history.spawned([entity_id])
+
+        self._entities[entity_id] = dict()
+        self._root_archetype.append(entity_id, {})
+        self._entity_archetype[entity_id] = self._root_archetype
+
+    def _release_entity(self, entity_id):
+        if self._slots is not None:
+            self._slots.release(entity_id)
+            self._global_ids.pop(entity_id, None)
+
+    def _cell(self, cid, comp_instance: Any) -> Any:
+        # what an archetype row holds for a component
+        return comp_instance if self._storage is None else cid
+
+    def _load_component(
+        self, cid, component: str, entity_id: str, values: Dict[str, Any]
+    ) -> Any:
+        # rebuilds an instance paged in from the storage backend
+        if component in self._columns:
+            comp_instance = ColumnRow(self._columns[component], entity_id)
+        elif component in self._slot_classes:
+            comp_instance = self._slot_classes[component](**values)
+        else:
+            comp_instance = ReactiveDict(values)
+
+        comp_instance.tag = {"id": cid, "entity_id": entity_id, "component": component}
+        comp_instance.on(EVT_ITEM_CHANGED, self._modified_listener)
+        if self._event_queue is not None:
+            comp_instance.set_event_queue(self._event_queue)
+
+        return comp_instance
+
+    def _next_component_ids(self, count: int) -> List:
+        ids = self._cid.next_batch(count)
+        if self._slots is None:
+            ids = [str(id) for id in ids]
+
+        return ids
+
+    def _instantiate_many(
+        self,
+        component: str,
+        entity_ids: List[str],
+        values: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        if component in self._columns:
+            return self._columns[component].add_many(entity_ids, values)
+
+        pool = self._pools.get(component)
+        if pool is not None:
+            return pool.acquire_many(len(entity_ids), values)
+
+        slot_class = self._slot_classes.get(component)
+        if slot_class is not None:
+            values = values or {}
+            return [slot_class(**values) for _ in entity_ids]
+
+        template = self._componentMeta[component].defaults()
+        if values:
+            template = dict(template, **values)
+
+        # copies of one template share its values until a field is set
+        return [ReactiveDict(template) for _ in entity_ids]
+
+    def _create_components(
+        self,
+        component: str,
+        entity_ids: List[str],
+        instances: List[Any],
+        ids: List[str],
+    ):
+        # _create_component for many instances at once
+        components = self._components
+        entities = self._entities
+        for entity_id, id, comp_instance in zip(entity_ids, ids, instances):
+            comp_instance.tag = {
+                "id": id,
+                "entity_id": entity_id,
+                "component": component,
+            }
+            components[id] = comp_instance
+            entities[entity_id][component] = id
+
+        EventDispatcherMixin.on_many(
+            instances, EVT_ITEM_CHANGED, self._modified_listener
+        )
+        if self._event_queue is not None:
+            for comp_instance in instances:
+                comp_instance.set_event_queue(self._event_queue)
+
+        self._mark_changed_many(component, entity_ids)
+        if self._history is not None:
+            self._history.created(component, entity_ids)
+
+        for index in self._indexes.get(component, ()):
+            for entity_id, comp_instance in zip(entity_ids, instances):
+                index.add(entity_id, comp_instance.get(index.field))
+
+    def _create_component(
+        self,
+        entity_id: str,
+        component: str,
+        comp_instance: Any = None,
+        id: Optional[str] = None,
+    ) -> Tuple[str, Any]:
+        if id is None:
+            id = self._cid.next()
+            if self._slots is None:
+                id = str(id)
+
+        if comp_instance is None:
+            if component in self._columns:
+                comp_instance = self._columns[component].add(entity_id)
+            elif component in self._pools:
+                comp_instance = self._pools[component].acquire()
+            elif component in self._slot_classes:
+                comp_instance = self._slot_classes[component]()
+            else:
+                comp_instance = self._componentMeta[component].instantiate()
+
+        comp_instance.tag = {
+            "id": id,
+            "entity_id": entity_id,
+            "component": component
+        }
+        comp_instance.on(EVT_ITEM_CHANGED, self._modified_listener)
+        if self._event_queue is not None:
+            comp_instance.set_event_queue(self._event_queue)
+
+        self._components[id] = comp_instance
+        self._entities[entity_id][component] = id
+        self._mark_entity_changed(component, entity_id)
+        if self._history is not None:
+            self._history.created(component, [entity_id])
+
+        for index in self._indexes.get(component, ()):
+            index.add(entity_id, comp_instance.get(index.field))
+
+        return id, comp_instance
+
+    def _destroy_component(self, entity_id: str, component: str) -> str:
         cid = self._entities[entity_id][component]
         del self._entities[entity_id][component]
 
-        if cid not in self._components:
+        comp_instance = self._components.get(cid)
+        if comp_instance is None:
             raise ComponentInstanceNotFound(cid)
 
-        self._components[cid].off(EVT_ITEM_CHANGED, self._on_component_modified)
+        if self._history is not None:
+            self._history.destroyed(component, [entity_id], [comp_instance])
+
+        pool = self._pools.get(component)
+        if pool is None or self._event_queue is not None:
+            # released instances lose all their listeners in the pool
+            comp_instance.off(EVT_ITEM_CHANGED, self._on_component_modified)
+            if self._event_queue is not None:
+                comp_instance.set_event_queue(None)
+
+        for index in self._indexes.get(component, ()):
+            index.remove(entity_id)
 
         del self._components[cid]
+        if component in self._columns:
+            self._columns[component].remove(entity_id)
 
-        self.fire(EVT_COMPONENT_REMOVED, entity_id, cid, component)
+        changes = self._changes.get(component)
+        if changes:
+            changes.pop(entity_id, None)
+
+        if pool is not None:
+            if self._event_queue is None:
+                pool.release(comp_instance)
+            else:
+                # queued events still point at the instance, reuse it after they ran
+                self._released.append((pool, comp_instance))
+
+        return cid
+
+    def _end_batch(self) -> int:
+        # sync point between system batches, structural changes systems recorded
+        # are applied with the batch's change tick
+        self._commands.apply(self)
+        tick = self._change_tick
+        self._change_tick += 1
+
+        return tick
+
+    def _mark_changed_many(self, component: str, entity_ids: List[str]):
+        changes = self._changes[component]
+        for entity_id in entity_ids:
+            changes.pop(entity_id, None)
+
+        changes.update(dict.fromkeys(entity_ids, self._change_tick))
+
+    def _mark_entity_changed(self, component: str, entity_id: str):
+        changes = self._changes.get(component)
+        if changes is None:
+            changes = self._changes[component] = dict()
+
+        tick = self._change_tick
+        if changes.get(entity_id) != tick:
+            changes.pop(entity_id, None)
+            changes[entity_id] = tick
+
+    def _on_component_modified(self, component, key, value, old_value):
+        tag = component.tag
+        self._mark_entity_changed(tag["component"], tag["entity_id"])
+        if self._history is not None:
+            self._history.modified(
+                tag["entity_id"], tag["component"], key, value, old_value
+            )
+
+        for index in self._indexes.get(tag["component"], ()):
+            if index.field == key:
+                index.update(tag["entity_id"], value)
+        self.fire(
+            EVT_COMPONENT_MODIFIED,
+            tag["entity_id"],
+            tag["component"],
+            key,
+            value,
+            old_value,
+        )
+
+    def query(self, *components: str, exclude: Optional[Iterable[str]] = None):
+        for comp in components:
+            if comp not in self._componentMeta:
+                raise ComponentNotFound(comp)
+
+        key = (components, frozenset(exclude or ()))
+        query = self._queries.get(key)
+
+        if query is None:
+            query = Query(*key, self._tags, self._entity_archetype, self._storage)
+            for archetype in self._archetypes.values():
+                query._on_archetype_created(archetype)
+
+            self._queries[key] = query
+
+        return query
+
+    def select(
+        self, *components: str, exclude: Optional[Iterable[str]] = None
+    ) -> Selection:
+        # entities with the components, narrowed down by field with where(F(...) < x)
+        for comp in components:
+            if comp not in self._componentMeta:
+                raise ComponentNotFound(comp)
+
+        return Selection(self, components, exclude or ())
+
+    def create_index(self, component: str, field: str, kind: str = INDEX_HASH) -> Index:
+        if component not in self._componentMeta:
+            raise ComponentNotFound(component)
+
+        fields = self._componentMeta[component].fields
+        if not any(f.field_name == field for f in fields):
+            raise FieldNotFound(field)
+
+        for index in self._indexes.get(component, ()):
+            if index.field == field and index.kind == kind:
+                return index
+
+        index = new_index(kind, component, field)
+        for entity_id, comp_instance in self.query(component):
+            index.add(entity_id, comp_instance.get(field))
+
+        self._indexes.setdefault(component, []).append(index)
+
+        return index
+
+    def drop_index(self, component: str, field: str):
+        remaining = [i for i in self._indexes.get(component, ()) if i.field != field]
+        if remaining:
+            self._indexes[component] = remaining
+        else:
+            self._indexes.pop(component, None)
+
+    def find(
+        self,
+        component: str,
+        field: str,
+        eq: Any = MISSING,
+        lt: Any = None,
+        le: Any = None,
+        gt: Any = None,
+        ge: Any = None,
+    ) -> List[str]:
+        if component not in self._componentMeta:
+            raise ComponentNotFound(component)
+
+        ranged = not (lt is None and le is None and gt is None and ge is None)
+        index = find_index(self._indexes.get(component), field, eq, ranged)
+        if index is not None:
+            return index.find(eq, lt, le, gt, ge)
+
+        if self._storage is not None:
+            found = self._storage.find(component, field, eq, lt, le, gt, ge)
+            if found is not None:
+                return found
+
+        # no index for this lookup, scan the component
+        return [
+            entity_id
+            for entity_id, comp_instance in self.query(component)
+            if matches_lookup(comp_instance.get(field), eq, lt, le, gt, ge)
+        ]
+
+    def add_system(self, system: System):
+        self._scheduler.add(system)
+        self.fire(EVT_SYSTEM_ADDED, system)
+
+        return system
+
+    def remove_system(self, name: str):
+        system = self._scheduler.get(name)
+        self._scheduler.remove(name)
+        self.fire(EVT_SYSTEM_REMOVED, system)
+
+    def get_system(self, name: str) -> System:
+        return self._scheduler.get(name)
+
+    @property
+    def change_tick(self) -> int:
+        return self._change_tick
+
+    def changed_since(self, tick: int, component: str) -> List[str]:
+        if component not in self._componentMeta:
+            raise ComponentNotFound(component)
+
+        # entries are kept in stamp order, walk back until we reach older changes
+        changed = []
+        for entity_id, stamp in reversed(self._changes[component].items()):
+            if stamp <= tick:
+                break
+
+            changed.append(entity_id)
+
+        changed.reverse()
+
+        return changed
+
+    def mark_changed(self, component: str, entity_ids: Optional[Iterable[str]] = None):
+        # for writes that bypass component events, such as vectorized column updates
+        if component not in self._componentMeta:
+            raise ComponentNotFound(component)
+
+        if entity_ids is None:
+            if component in self._columns:
+                entity_ids = self._columns[component].entities
+            elif component in self._tags:
+                entity_ids = self._tags[component]
+            else:
+                entity_ids = [
+                    id for id, entity in self._entities.items() if component in entity
+                ]
+
+        entity_ids = list(entity_ids)
+        self._mark_changed_many(component, entity_ids)
+
+        component_indexes = self._indexes.get(component)
+        if component_indexes:
+            for entity_id in entity_ids:
+                comp_instance = self.get_component(entity_id, component)
+                for index in component_indexes:
+                    index.update(entity_id, comp_instance.get(index.field))
+
+        # which fields changed isn't known, listeners take the components as a whole
+        self.fire(EVT_COMPONENTS_MODIFIED, entity_ids, component)
+
+    @property
+    def commands(self) -> CommandBuffer:
+        return self._commands
+
+    def apply_commands(self) -> int:
+        return self._commands.apply(self)
+
+    def tick(self, dt: float):
+        self._tick += 1
+        self._change_tick += 1
+        self._scheduler.run(self, dt)
+        self._commands.apply(self)
+        self.fire(EVT_TICK, self._tick, dt)
+        self.flush_events()
+        if self._history is not None:
+            self._history.commit(self._tick)
+
+    def defer_events(self, enabled: bool = True):
+        # queue world and component events and deliver them on flush_events, which
+        # tick does once per frame
+        if enabled == (self._event_queue is not None):
+            return
+
+        if enabled:
+            self._event_queue = EventQueue()
+        else:
+            self.flush_events()
+            self._event_queue = None
+
+        self.set_event_queue(self._event_queue)
+        if self._storage is not None:
+            instances = self._storage.resident()
+        else:
+            instances = self._components.values()
+
+        for comp_instance in instances:
+            comp_instance.set_event_queue(self._event_queue)
+
+    def flush_events(self):
+        if self._event_queue is not None:
+            self._event_queue.flush()
+
+        if self._released:
+            released = self._released
+            self._released = []
+            for pool, comp_instance in released:
+                pool.release(comp_instance)
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+    def enable_profiling(self, trace: bool = False) -> Profiler:
+        # swaps instrumented methods in on this world and its scheduler only
+        if self._profiler is None:
+            self._profiler = Profiler(trace)
+            self._profiler.attach(self, WORLD_OPERATIONS)
+            self._profiler.attach_scheduler(self._scheduler)
+
+        return self._profiler
+
+    def disable_profiling(self):
+        if self._profiler is not None:
+            self._profiler.detach()
+            self._profiler = None
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        if self._profiler is None:
+            return dict()
+
+        return self._profiler.stats()
+
+    def export_trace(self, path: str):
+        if self._profiler is None:
+            raise ProfilingNotEnabled()
+
+        self._profiler.export_chrome_trace(path)
+
+    def enable_history(self, ticks: int):
+        # records each tick's changes so the world can be rolled back and replayed
+        from becs.history import History
+
+        if self._history is None or self._history.ticks != ticks:
+            self._history = History(self, ticks)
+
+        return self._history
+
+    def disable_history(self):
+        self._history = None
+
+    def rollback(self, ticks: int = 1) -> int:
+        if self._history is None:
+            raise HistoryNotEnabled()
+
+        undone = self._history.rollback(ticks)
+        self._tick -= undone
+
+        return undone
+
+    def replay(self, ticks: Optional[int] = None) -> int:
+        if self._history is None:
+            raise HistoryNotEnabled()
+
+        redone = self._history.replay(ticks)
+        self._tick += redone
+
+        return redone
+
+    def publish_shared(self, name: str, every: int = 1):
+        # exposes the world read only to other processes through shared memory
+        from becs.shared import SharedWorldPublisher
+
+        return SharedWorldPublisher(self, name, every)
+
+    def apply_delta(self, data: bytes) -> int:
+        from becs.replication import apply_delta
+
+        return apply_delta(self, data)
+
+    def save(self, path: str):
+        snapshot.save(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "World":
+        return snapshot.load(cls, path, mmap)
+
+    @property
+    def storage(self) -> Optional[StorageBackend]:
+        return self._storage
+
+    def shutdown(self):
+        self._scheduler.shutdown()
+        if self._storage is not None:
+            self._storage.flush()
+
+    def _get_archetype(self, signature: FrozenSet[str]) -> Archetype:
+        archetype = self._archetypes.get(signature)
+        if archetype is None:
+            archetype = Archetype(signature)
+            self._archetypes[signature] = archetype
+            # queries are told right away, the event may be queued until the flush
+            for query in self._queries.values():
+                query._on_archetype_created(archetype)
+
+            self.fire(EVT_ARCHETYPE_CREATED, archetype)
+
+        return archetype
+
+    def _move_entity(self, entity_id: str, component: str, instance: Any = None):
+        # moves the entity row to the archetype with the component added, or removed
+        # when no instance is given
+        src = self._entity_archetype.get(entity_id)
+
+        if src is None:
+            # entity was never filed into an archetype, build its row from the record
+            entity = self._entities[entity_id]
+            cells = {
+                name: self._cell(cid, self._components.get(cid))
+                for name, cid in entity.items()
+            }
+            dst = self._get_archetype(frozenset(cells))
+        else:
+            cells = src.remove(entity_id)
+
+            if instance is not None:
+                cells[component] = instance
+                dst = src.add_edges.get(component)
+                if dst is None:
+                    dst = self._get_archetype(src.signature | {component})
+                    src.add_edges[component] = dst
+            else:
+                cells.pop(component, None)
+                dst = src.remove_edges.get(component)
+                if dst is None:
+                    dst = self._get_archetype(src.signature - {component})
+                    src.remove_edges[component] = dst
 
-    def _on_component_modified(self, component, key, value):
-        pass
\ No newline at end of file
+        dst.append(entity_id, cells)
+        self._entity_archetype[entity_id] = dst
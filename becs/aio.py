@@ -0,0 +1,110 @@
+import asyncio
+from timeit import default_timer as timer
+from typing import Dict, Optional
+from becs.events import EventDispatcherMixin
+
+EVT_OVERRUN = "overrun"
+
+DEFAULT_RATE = 60
+DEFAULT_MAX_CATCH_UP = 5
+
+
+class AsyncWorldRunner(EventDispatcherMixin):
+    # Ticks a world at a fixed rate from an asyncio event loop. Ticks run on the
+    # loop between I/O callbacks and coroutine listeners are only scheduled, so
+    # handlers never run inside a tick. A runner that falls behind runs the
+    # missed ticks back to back, up to max_catch_up of them, and drops the rest.
+    # Falling behind fires EVT_OVERRUN with (tick, seconds late, ticks dropped).
+    rate: float
+    max_catch_up: int
+    ticks: int = 0
+    overruns: int = 0
+    dropped: int = 0
+    max_tick_seconds: float = 0.0
+    _task: Optional[asyncio.Task] = None
+
+    def __init__(
+        self,
+        world,
+        rate: float = DEFAULT_RATE,
+        max_catch_up: int = DEFAULT_MAX_CATCH_UP,
+    ):
+        if rate <= 0:
+            raise ValueError("Tick rate must be positive: {}".format(rate))
+
+        self.world = world
+        self.rate = rate
+        self.max_catch_up = max(1, max_catch_up)
+        self._stop = False
+
+    @property
+    def dt(self) -> float:
+        return 1.0 / self.rate
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> asyncio.Task:
+        if not self.running:
+            # reset here rather than in the task, a stop() before its first step
+            # must still end it
+            self._stop = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        return self._task
+
+    async def stop(self):
+        self._stop = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def run(self, ticks: Optional[int] = None):
+        # runs until stopped, or for a number of ticks
+        self._stop = False
+        await self._run(ticks)
+
+    async def _run(self, ticks: Optional[int] = None):
+        loop = asyncio.get_running_loop()
+        dt = self.dt
+        target = None if ticks is None else self.ticks + ticks
+        next_time = loop.time()
+
+        while not self._stop and (target is None or self.ticks < target):
+            late = loop.time() - next_time
+            if late < 0:
+                await asyncio.sleep(-late)
+                continue
+
+            due = int(late / dt) + 1
+            if due > 1:
+                dropped = max(0, due - self.max_catch_up)
+                self.overruns += 1
+                self.dropped += dropped
+                next_time += dropped * dt
+                due -= dropped
+                self.fire(EVT_OVERRUN, self.world._tick, late, dropped)
+
+            if target is not None:
+                due = min(due, target - self.ticks)
+
+            for _ in range(due):
+                start = timer()
+                self.world.tick(dt)
+                elapsed = timer() - start
+                self.ticks += 1
+                next_time += dt
+                if elapsed > self.max_tick_seconds:
+                    self.max_tick_seconds = elapsed
+
+            # yield even when behind, so catching up doesn't starve I/O
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "dropped": self.dropped,
+            "max_tick_seconds": self.max_tick_seconds,
+        }
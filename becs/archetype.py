@@ -0,0 +1,65 @@
+from typing import Any, Dict, FrozenSet, Iterable, List
+
+
+class Archetype:
+    signature: FrozenSet[str]
+    entities: List[str]
+    columns: Dict[str, List[Any]]
+    add_edges: Dict[str, "Archetype"]
+    remove_edges: Dict[str, "Archetype"]
+    _rows: Dict[str, int]
+
+    def __init__(self, signature: Iterable[str]):
+        self.signature = frozenset(signature)
+        self.entities = []
+        self.columns = {name: [] for name in sorted(self.signature)}
+        self.add_edges = dict()
+        self.remove_edges = dict()
+        self._rows = dict()
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity_id: str):
+        return entity_id in self._rows
+
+    def row(self, entity_id: str) -> int:
+        return self._rows[entity_id]
+
+    def append(self, entity_id: str, cells: Dict[str, Any]) -> int:
+        row = len(self.entities)
+        self.entities.append(entity_id)
+        for name, column in self.columns.items():
+            column.append(cells[name])
+
+        self._rows[entity_id] = row
+
+        return row
+
+    def extend(self, entity_ids: List[str], cells: Dict[str, List[Any]]):
+        start = len(self.entities)
+        self.entities.extend(entity_ids)
+        for name, column in self.columns.items():
+            column.extend(cells[name])
+
+        self._rows.update(zip(entity_ids, range(start, len(self.entities))))
+
+    def remove(self, entity_id: str) -> Dict[str, Any]:
+        row = self._rows.pop(entity_id)
+        last = len(self.entities) - 1
+
+        # swap the last row into the freed one so rows stay packed
+        cells = dict()
+        for name, column in self.columns.items():
+            cells[name] = column[row]
+            column[row] = column[last]
+            column.pop()
+
+        moved = self.entities[last]
+        self.entities[row] = moved
+        self.entities.pop()
+
+        if row != last:
+            self._rows[moved] = row
+
+        return cells
@@ -3,8 +3,9 @@
 
 import datetime
 import math
-from time import time
-from typing import Optional
+import threading
+from time import sleep, time
+from typing import List, Optional, Tuple
 
 from becs.exceptions import InvalidSystemClock
 
@@ -13,6 +14,7 @@ EPOCH_BITS = 41  # 2199023255551
 NODE_ID_BITS = 10  # up to 1024 nodes
 SEQUENCE_BITS = 12  # internal counter, up to 4095 max values
 MAX_SEQUENCE = int(math.pow(2, SEQUENCE_BITS) - 1)
+MAX_DRIFT = 100  # milliseconds ids may be borrowed ahead of the system clock
 
 
 class AtomicID:
@@ -20,9 +22,13 @@ class AtomicID:
     _node_id: int = 1
     _last_timestamp: int = -1
     _sequence: int = 0
+    _max_drift: int = MAX_DRIFT
 
     def __init__(
-        self, node_id: Optional[int] = None, custom_epoc: Optional[int] = None
+        self,
+        node_id: Optional[int] = None,
+        custom_epoc: Optional[int] = None,
+        max_drift: Optional[int] = None,
     ):
         if custom_epoc:
             self._epoch = custom_epoc
@@ -30,28 +36,73 @@ class AtomicID:
         if node_id:
             self._node_id = node_id
 
+        if max_drift is not None:
+            self._max_drift = max_drift
+
+        self._lock = threading.Lock()
+
     def _timestamp(self) -> int:
         return int(time() * 1000) - self._epoch
 
-    def next(self) -> int:
+    def _advance(self) -> int:
+        # moves the sequence one step forward and returns the timestamp it belongs to
         ts = self._timestamp()
-        if ts < self._last_timestamp:
+        if ts < self._last_timestamp - self._max_drift:
             raise InvalidSystemClock()
 
-        if ts == self._last_timestamp:
+        if ts <= self._last_timestamp:
+            ts = self._last_timestamp
             self._sequence = (self._sequence + 1) & MAX_SEQUENCE
             if self._sequence == 0:
-                # block until we've moved one millisecond forward
-                while ts == self._last_timestamp:
-                    ts = self._timestamp()
+                # sequence exhausted, check the clock once more and otherwise borrow
+                # the next millisecond instead of spinning until it arrives
+                ts = self._timestamp()
+                if ts <= self._last_timestamp:
+                    ahead = self._last_timestamp + 1 - ts
+                    if ahead > self._max_drift:
+                        sleep((ahead - self._max_drift) / 1000)
+
+                    ts = self._last_timestamp + 1
 
         else:
             self._sequence = 0
 
         self._last_timestamp = ts
 
+        return ts
+
+    def _compose(self, ts: int, sequence: int) -> int:
         id = ts << (NODE_ID_BITS + SEQUENCE_BITS)
         id |= self._node_id << SEQUENCE_BITS
-        id |= self._sequence
+        id |= sequence
 
         return id
+
+    def next(self) -> int:
+        with self._lock:
+            ts = self._advance()
+            return self._compose(ts, self._sequence)
+
+    def next_batch(self, count: int) -> List[int]:
+        ids: List[int] = []
+
+        with self._lock:
+            while count > 0:
+                ts = self._advance()
+                first = self._sequence
+                taken = min(count, MAX_SEQUENCE - first + 1)
+                self._sequence = first + taken - 1
+
+                start = self._compose(ts, first)
+                ids.extend(range(start, start + taken))
+                count -= taken
+
+        return ids
+
+    def state(self) -> Tuple[int, int]:
+        with self._lock:
+            return self._last_timestamp, self._sequence
+
+    def restore(self, state: Tuple[int, int]):
+        with self._lock:
+            self._last_timestamp, self._sequence = state
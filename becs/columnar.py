@@ -0,0 +1,179 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
+from becs.events import EventDispatcherMixin
+from becs.meta import ComponentMeta
+from becs.reactive_dict import EVT_ITEM_CHANGED, ITEM_CHANGED_COALESCE
+from becs.tag import TagMixin
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+INITIAL_CAPACITY = 64
+
+
+def field_dtype(field_type: Type):
+    if numpy is None:
+        raise ImportError("numpy is required for columnar component storage")
+
+    if field_type is bool or field_type is numpy.bool_:
+        return numpy.dtype(numpy.bool_)
+
+    if field_type is int:
+        return numpy.dtype(numpy.int64)
+
+    if field_type is float:
+        return numpy.dtype(numpy.float64)
+
+    if isinstance(field_type, type) and issubclass(field_type, numpy.number):
+        return numpy.dtype(field_type)
+
+    return None
+
+
+def is_numeric(meta: ComponentMeta) -> bool:
+    return all(field_dtype(field.field_type) is not None for field in meta.fields)
+
+
+class ColumnRow(EventDispatcherMixin, TagMixin):
+    _coalesce = {EVT_ITEM_CHANGED: ITEM_CHANGED_COALESCE}
+
+    def __init__(self, store: "ColumnStore", entity_id: str):
+        self._store = store
+        self._entity_id = entity_id
+
+    def __getitem__(self, key: str) -> Any:
+        store = self._store
+        return store._data[key][store._rows[self._entity_id]].item()
+
+    def __setitem__(self, key: str, value: Any):
+        store = self._store
+        row = store._rows[self._entity_id]
+        column = store._data[key]
+        old_val = column[row].item()
+        column[row] = value
+
+        if old_val != value:
+            self.fire(EVT_ITEM_CHANGED, self, key, value, old_val)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._store.dtype.names:
+            return default
+
+        return self[key]
+
+    def keys(self):
+        return self._store.dtype.names
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._store.dtype.names)
+
+    def __contains__(self, key: str):
+        return key in self._store.dtype.names
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __repr__(self):
+        return "ColumnRow({!r})".format(dict(self.items()))
+
+
+class ColumnStore:
+    meta: ComponentMeta
+    entities: List[str]
+    _rows: Dict[str, int]
+
+    def __init__(self, meta: ComponentMeta, capacity: int = INITIAL_CAPACITY):
+        self.meta = meta
+        self.dtype = numpy.dtype(
+            [(field.field_name, field_dtype(field.field_type)) for field in meta.fields]
+        )
+        self._defaults = numpy.zeros(1, dtype=self.dtype)[0]
+        for field in meta.fields:
+            if field.default_value is not None:
+                self._defaults[field.field_name] = field.default_value
+
+        self._data = numpy.zeros(max(capacity, 1), dtype=self.dtype)
+        self.entities = []
+        self._rows = dict()
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity_id: str):
+        return entity_id in self._rows
+
+    def columns(self):
+        # views are invalidated when the store grows, fetch them again every tick
+        return self._data[: len(self.entities)]
+
+    def rows(self, entity_ids: Iterable[str]):
+        rows = self._rows
+        return numpy.fromiter(
+            (rows[entity_id] for entity_id in entity_ids), dtype=numpy.intp
+        )
+
+    def add(self, entity_id: str) -> ColumnRow:
+        row = self._rows.get(entity_id)
+
+        if row is None:
+            row = len(self.entities)
+            if row == len(self._data):
+                self._grow(row * 2)
+
+            self.entities.append(entity_id)
+            self._rows[entity_id] = row
+
+        self._data[row] = self._defaults
+
+        return ColumnRow(self, entity_id)
+
+    def add_many(
+        self, entity_ids: List[str], values: Optional[Dict[str, Any]] = None
+    ) -> List[ColumnRow]:
+        new = [entity_id for entity_id in entity_ids if entity_id not in self._rows]
+        start = len(self.entities)
+        end = start + len(new)
+        if end > len(self._data):
+            self._grow(max(end, len(self._data) * 2))
+
+        self.entities.extend(new)
+        self._rows.update(zip(new, range(start, end)))
+
+        if len(new) == len(entity_ids):
+            rows = slice(start, end)
+        else:
+            rows = self.rows(entity_ids)
+
+        self._data[rows] = self._defaults
+        for key, value in (values or {}).items():
+            self._data[key][rows] = value
+
+        return [ColumnRow(self, entity_id) for entity_id in entity_ids]
+
+    def remove(self, entity_id: str):
+        row = self._rows.pop(entity_id)
+        last = len(self.entities) - 1
+
+        # swap the last row into the freed one so the columns stay packed
+        if row != last:
+            moved = self.entities[last]
+            self._data[row] = self._data[last]
+            self.entities[row] = moved
+            self._rows[moved] = row
+
+        self.entities.pop()
+
+    def _grow(self, capacity: int):
+        data = numpy.zeros(capacity, dtype=self.dtype)
+        data[: len(self._data)] = self._data
+        self._data = data
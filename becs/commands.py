@@ -0,0 +1,177 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from becs.exceptions import ComponentNotFound
+
+CMD_SPAWN = "spawn"
+CMD_DESPAWN = "despawn"
+CMD_ADD = "add"
+CMD_REMOVE = "remove"
+
+Command = Tuple[str, Any, Any, Any, Optional[Callable[[List], None]]]
+
+
+def _spawn_key(components: Tuple[str, ...], values: Optional[Dict[str, Dict]]):
+    values = sorted(
+        (name, sorted(fields.items())) for name, fields in (values or {}).items()
+    )
+    return components, repr(values)
+
+
+class CommandBuffer:
+    # Structural changes recorded while iterating, from any thread, and applied
+    # later as one batch. Commands are grouped and sorted on apply so the result
+    # doesn't depend on the order threads recorded them in: components are
+    # removed first, then entities despawned, components added and finally new
+    # entities spawned. Commands made moot by the world's state, like removing
+    # a component the entity no longer has, are dropped. A spawn's callback gets
+    # the ids of its entities once the buffer is applied.
+    _commands: List[Command]
+
+    def __init__(self):
+        self._commands = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._commands)
+
+    def spawn(
+        self,
+        components: Iterable[str],
+        initial_values: Optional[Dict[str, Dict[str, Any]]] = None,
+        count: int = 1,
+        callback: Optional[Callable[[List], None]] = None,
+    ):
+        components = tuple(dict.fromkeys(components))
+        with self._lock:
+            self._commands.append(
+                (CMD_SPAWN, count, components, initial_values, callback)
+            )
+
+    def despawn(self, entity_id):
+        with self._lock:
+            self._commands.append((CMD_DESPAWN, entity_id, None, None, None))
+
+    def add(self, entity_id, component: str, values: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._commands.append((CMD_ADD, entity_id, component, values, None))
+
+    def remove(self, entity_id, component: str):
+        with self._lock:
+            self._commands.append((CMD_REMOVE, entity_id, component, None, None))
+
+    def clear(self):
+        with self._lock:
+            self._commands = []
+
+    def apply(self, world) -> int:
+        with self._lock:
+            commands = self._commands
+            self._commands = []
+
+        if not commands:
+            return 0
+
+        # a command naming an unknown component fails the whole buffer before the
+        # world changes, and the commands stay recorded
+        defined = world._componentMeta
+        for op, target, component, values, callback in commands:
+            for name in component if op == CMD_SPAWN else (component,):
+                if name is not None and name not in defined:
+                    with self._lock:
+                        self._commands[:0] = commands
+
+                    raise ComponentNotFound(name)
+
+        spawns: Dict[Tuple, List] = dict()
+        despawns = set()
+        adds: Dict[str, Dict[Any, Optional[Dict[str, Any]]]] = dict()
+        removes: Dict[str, set] = dict()
+        for op, target, component, values, callback in commands:
+            if op == CMD_SPAWN:
+                key = _spawn_key(component, values)
+                group = spawns.get(key)
+                if group is None:
+                    group = spawns[key] = [component, values, 0, []]
+
+                group[2] += target
+                group[3].append((target, callback))
+            elif op == CMD_DESPAWN:
+                despawns.add(target)
+            elif op == CMD_ADD:
+                # the last values recorded win, merged with earlier ones
+                pending = adds.setdefault(component, dict())
+                merged = dict(pending.get(target) or {}, **(values or {}))
+                pending[target] = merged
+            else:
+                removes.setdefault(component, set()).add(target)
+
+        entities = world._entities
+        has = world.entity_has_component
+
+        for component in sorted(removes):
+            ids = [
+                entity_id
+                for entity_id in self._order(world, removes[component])
+                if entity_id not in despawns
+                and entity_id in entities
+                and has(entity_id, component)
+            ]
+            if ids:
+                world.remove_components(ids, component)
+
+        ids = [entity_id for entity_id in sorted(despawns) if entity_id in entities]
+        if ids:
+            world.remove_entities(ids)
+
+        for component in sorted(adds):
+            pending = adds[component]
+            ids = [
+                entity_id
+                for entity_id in self._order(world, pending)
+                if entity_id in entities and not has(entity_id, component)
+            ]
+            if not ids:
+                continue
+
+            world.add_components(ids, component)
+            for entity_id in ids:
+                values = pending[entity_id]
+                if values:
+                    instance = world.get_component(entity_id, component)
+                    for key, value in values.items():
+                        instance[key] = value
+
+        spawned = []
+        for key in sorted(spawns):
+            components, values, count, callbacks = spawns[key]
+            ids = world.add_entities(count, components, values)
+            start = 0
+            for size, callback in callbacks:
+                if callback is not None:
+                    spawned.append((callback, ids[start : start + size]))
+
+                start += size
+
+        # after every change is in, so callbacks see the world as applied
+        for callback, ids in spawned:
+            callback(ids)
+
+        return len(commands)
+
+    @staticmethod
+    def _order(world, entity_ids: Iterable) -> List:
+        # entities sharing an archetype are moved together, in id order
+        archetypes = world._entity_archetype
+        signatures = dict()
+
+        def key(entity_id):
+            archetype = archetypes.get(entity_id)
+            signature = signatures.get(archetype)
+            if signature is None:
+                signature = signatures[archetype] = (
+                    tuple(sorted(archetype.signature)) if archetype is not None else ()
+                )
+
+            return signature, entity_id
+
+        return sorted(entity_ids, key=key)
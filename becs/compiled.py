@@ -0,0 +1,153 @@
+import keyword
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Tuple, Type
+from becs.events import EventDispatcherMixin
+from becs.exceptions import InvalidFieldName
+from becs.reactive_dict import EVT_ITEM_CHANGED, ITEM_CHANGED_COALESCE
+
+
+class SlotComponent:
+    # Base of the classes compiled from a ComponentMeta: one slot per field, read
+    # and written as attributes or through the same mapping interface as
+    # ReactiveDict. Plain slot components fire no events.
+    __slots__ = ("tag",)
+    _fields: Tuple[str, ...] = ()
+    _field_set: FrozenSet[str] = frozenset()
+    # field name -> slot getter, a missing key raises KeyError like a dict
+    _getters: Dict[str, Callable[[Any], Any]] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        return self._getters[key](self)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._field_set:
+            raise KeyError(key)
+
+        setattr(self, key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._field_set:
+            return default
+
+        return getattr(self, key)
+
+    def update(self, values: Dict[str, Any] = None, **kwargs):
+        for key, value in dict(values or {}, **kwargs).items():
+            self[key] = value
+
+    def keys(self):
+        return self._fields
+
+    def values(self) -> List[Any]:
+        return [getattr(self, key) for key in self._fields]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, getattr(self, key)) for key in self._fields]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, key: str):
+        return key in self._field_set
+
+    def __eq__(self, other):
+        if isinstance(other, SlotComponent):
+            other = dict(other.items())
+
+        return dict(self.items()) == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, dict(self.items()))
+
+    def on(self, event: str, callback, weak: bool = False):
+        pass
+
+    def off(self, event: str, callback):
+        pass
+
+    def fire(self, event, *kargs, **kwargs):
+        pass
+
+    def set_event_queue(self, queue):
+        pass
+
+    def clear_listeners(self):
+        pass
+
+
+class ObservableSlotComponent(SlotComponent):
+    # Fires EVT_ITEM_CHANGED like ReactiveDict. The dispatcher methods are borrowed
+    # from EventDispatcherMixin, its private attributes live in slots.
+    __slots__ = (
+        "_EventDispatcherMixin__events",
+        "_EventDispatcherMixin__queue",
+        "__weakref__",
+    )
+    _coalesce = {EVT_ITEM_CHANGED: ITEM_CHANGED_COALESCE}
+
+    on = EventDispatcherMixin.on
+    off = EventDispatcherMixin.off
+    fire = EventDispatcherMixin.fire
+    _dispatch = EventDispatcherMixin._dispatch
+    set_event_queue = EventDispatcherMixin.set_event_queue
+    clear_listeners = EventDispatcherMixin.clear_listeners
+
+    def __setattr__(self, key: str, value: Any):
+        if key in self._field_set:
+            old_val = getattr(self, key)
+            object.__setattr__(self, key, value)
+
+            if old_val != value:
+                self.fire(EVT_ITEM_CHANGED, self, key, value, old_val)
+        else:
+            object.__setattr__(self, key, value)
+
+
+RESERVED_NAMES = frozenset(dir(ObservableSlotComponent))
+
+
+def compile_component(
+    class_name: str, fields: List[Tuple[str, Any]], observable: bool = True
+) -> Type[SlotComponent]:
+    names = tuple(name for name, _ in fields)
+    for name in names:
+        if not name.isidentifier() or keyword.iskeyword(name) or name in RESERVED_NAMES:
+            raise InvalidFieldName(name)
+
+    base = ObservableSlotComponent if observable else SlotComponent
+
+    # __init__ takes every field as an optional argument and writes the slots
+    # directly, so building an instance fires nothing
+    args = "".join(
+        ", {0}=_defaults[{1}]".format(name, i) for i, name in enumerate(names)
+    )
+    body = ["    _set(self, 'tag', None)"]
+    if observable:
+        body.append("    _set(self, '_EventDispatcherMixin__events', None)")
+        body.append("    _set(self, '_EventDispatcherMixin__queue', None)")
+    body.extend("    _set(self, '{0}', {0})".format(name) for name in names)
+
+    source = "def __init__(self{}):\n{}\n".format(args, "\n".join(body))
+    namespace: Dict[str, Any] = {
+        "_defaults": tuple(default for _, default in fields),
+        "_set": object.__setattr__,
+    }
+    exec(source, namespace)
+
+    cls = type(
+        class_name,
+        (base,),
+        {
+            "__slots__": names,
+            "__init__": namespace["__init__"],
+            "_fields": names,
+            "_field_set": frozenset(names),
+        },
+    )
+    cls._getters = {name: vars(cls)[name].__get__ for name in names}
+
+    return cls
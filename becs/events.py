@@ -1,28 +1,289 @@
-from typing import Callable, Dict, List
-from unittest.mock import call
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from weakref import WeakMethod, ref
+from becs.exceptions import NoEventLoop
+
+Coalesce = Tuple[Callable[[tuple], Any], Optional[Callable[[tuple, tuple], tuple]]]
+
+
+class WeakListener:
+    __slots__ = ("_ref",)
+
+    def __init__(self, callback: Callable):
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            self._ref = WeakMethod(callback)
+        else:
+            self._ref = ref(callback)
+
+    @property
+    def alive(self) -> bool:
+        return self._ref() is not None
+
+    def __call__(self, *kargs, **kwargs):
+        callback = self._ref()
+        if callback is not None:
+            return callback(*kargs, **kwargs)
+
+    def __eq__(self, other):
+        if isinstance(other, WeakListener):
+            return self._ref == other._ref
+
+        callback = self._ref()
+        return callback is not None and callback == other
+
+    def __hash__(self):
+        return hash(self._ref)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _call_in_loop(loop: asyncio.AbstractEventLoop, callback: Callable, *kargs):
+    # events can be fired from system threads, loops are only touched from their own
+    if _running_loop() is loop:
+        callback(*kargs)
+    else:
+        loop.call_soon_threadsafe(callback, *kargs)
+
+
+class AsyncListener:
+    # Schedules a coroutine listener as a task on its event loop instead of
+    # awaiting it, so the code firing the event never waits for it. The loop is
+    # the one running when the listener subscribed, or else when it's called.
+    __slots__ = ("callback", "loop", "_tasks")
+
+    def __init__(
+        self, callback: Callable, loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        self.callback = callback
+        self.loop = loop or _running_loop()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def alive(self) -> bool:
+        return not isinstance(self.callback, WeakListener) or self.callback.alive
+
+    def __call__(self, *kargs, **kwargs):
+        loop = self.loop or _running_loop()
+        if loop is None:
+            raise NoEventLoop(self.callback)
+
+        coro = self.callback(*kargs, **kwargs)
+        if coro is not None:
+            _call_in_loop(loop, self._schedule, loop, coro)
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, coro):
+        # the loop only keeps weak references to tasks
+        task = loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncListener):
+            return self.callback == other.callback
+
+        return self.callback == other
+
+    def __hash__(self):
+        return hash(self.callback)
+
+
+class ImmediateListener:
+    # Runs as soon as the event fires, even on a dispatcher whose events are
+    # queued. Meant for bookkeeping that must not lag behind the change, the
+    # queued event skips it when it's delivered.
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: Callable):
+        self.callback = callback
+
+    @property
+    def alive(self) -> bool:
+        return not isinstance(self.callback, WeakListener) or self.callback.alive
+
+    def __call__(self, *kargs, **kwargs):
+        return self.callback(*kargs, **kwargs)
+
+    def __eq__(self, other):
+        if isinstance(other, ImmediateListener):
+            return self.callback == other.callback
+
+        return self.callback == other
+
+    def __hash__(self):
+        return hash(self.callback)
+
+
+class EventQueue:
+    _pending: Dict[Any, Tuple["EventDispatcherMixin", str, tuple, dict]]
+
+    def __init__(self):
+        self._pending = dict()
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def push(
+        self,
+        dispatcher: "EventDispatcherMixin",
+        event: str,
+        kargs: tuple,
+        kwargs: dict,
+        coalesce: Optional[Coalesce] = None,
+    ):
+        if coalesce is None:
+            self._seq += 1
+            self._pending[self._seq] = (dispatcher, event, kargs, kwargs)
+            return
+
+        key_of, merge = coalesce
+        key = (id(dispatcher), event, key_of(kargs))
+        queued = self._pending.pop(key, None)
+        if queued is not None and merge is not None:
+            kargs = merge(queued[2], kargs)
+
+        self._pending[key] = (dispatcher, event, kargs, kwargs)
+
+    def flush(self):
+        # listeners may fire more events while flushing, keep going until drained
+        while self._pending:
+            pending = self._pending
+            self._pending = dict()
+
+            for dispatcher, event, kargs, kwargs in pending.values():
+                dispatcher._dispatch(event, kargs, kwargs)
+
+
+WEAK_LISTENERS = (WeakListener, AsyncListener, ImmediateListener)
 
 
 class EventDispatcherMixin:
-    def on(self, event: str, callback: Callable):
-        if not getattr(self, "_EventDispatcherMixin__events", None):
-            self.__events: Dict[str, List[Callable]] = dict()
+    __events: Optional[Dict[str, List[Callable]]] = None
+    __queue: Optional[EventQueue] = None
+
+    # event name -> (key of the event args, merge of queued and new args) used to
+    # coalesce repeated events while deferred
+    _coalesce: Dict[str, Coalesce] = {}
 
-        if event not in self.__events:
-            self.__events[event] = []
+    def on(self, event: str, callback: Callable, weak: bool = False):
+        events = self.__events
+        if events is None:
+            events = self.__events = dict()
 
-        self.__events[event].append(callback)
+        coroutine = inspect.iscoroutinefunction(callback)
+        if weak and not isinstance(callback, WeakListener):
+            callback = WeakListener(callback)
+
+        if coroutine:
+            callback = AsyncListener(callback)
+
+        # listener lists are replaced instead of mutated so fire can walk them
+        # without copying while callbacks subscribe or unsubscribe
+        listeners = events.get(event)
+        if not listeners:
+            events[event] = [callback]
+            return
+
+        if isinstance(callback, WEAK_LISTENERS):
+            listeners = [
+                cb for cb in listeners if not isinstance(cb, WEAK_LISTENERS) or cb.alive
+            ]
+
+        events[event] = listeners + [callback]
+
+    @staticmethod
+    def on_many(dispatchers: Iterable[Any], event: str, callback: Callable):
+        # dispatchers without listeners share one list, which is safe because
+        # listener lists are never mutated in place
+        shared = [callback]
+        for dispatcher in dispatchers:
+            if (
+                type(dispatcher).on is EventDispatcherMixin.on
+                and not dispatcher.__events
+            ):
+                dispatcher.__events = {event: shared}
+            else:
+                dispatcher.on(event, callback)
 
     def off(self, event: str, callback: Callable):
         if not getattr(self, "_EventDispatcherMixin__events", None):
             self.__events: Dict[str, List[Callable]] = dict()
 
         if event in self.__events:
-            self.__events[event].remove(callback)
+            listeners = list(self.__events[event])
+            listeners.remove(callback)
+            self.__events[event] = listeners
 
     def fire(self, event, *kargs, **kwargs):
-        if not getattr(self, "_EventDispatcherMixin__events", None):
-            self.__events = dict()
+        events = self.__events
+        if events:
+            listeners = events.get(event)
+            if listeners:
+                if self.__queue is None:
+                    for callback in listeners:
+                        callback(*kargs, **kwargs)
+                else:
+                    queued = False
+                    for callback in listeners:
+                        if type(callback) is ImmediateListener:
+                            callback(*kargs, **kwargs)
+                        else:
+                            queued = True
 
-        if event in self.__events:
-            for callback in self.__events[event]:
-                callback(*kargs, **kwargs)
+                    if queued:
+                        self.__queue.push(
+                            self, event, kargs, kwargs, self._coalesce.get(event)
+                        )
+
+    def _dispatch(self, event, kargs: tuple, kwargs: dict):
+        # delivers a queued event, immediate listeners already ran when it fired
+        events = self.__events
+        listeners = events.get(event) if events else None
+        if listeners:
+            for callback in listeners:
+                if type(callback) is not ImmediateListener:
+                    callback(*kargs, **kwargs)
+
+    async def wait_for(
+        self,
+        event: str,
+        predicate: Optional[Callable[..., bool]] = None,
+        timeout: Optional[float] = None,
+    ) -> tuple:
+        # waits for the next event matching predicate(*args), returns its args
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(kargs: tuple):
+            if not future.done():
+                future.set_result(kargs)
+
+        def fail(error: Exception):
+            if not future.done():
+                future.set_exception(error)
+
+        def listener(*kargs, **kwargs):
+            try:
+                if predicate is None or predicate(*kargs, **kwargs):
+                    _call_in_loop(loop, resolve, kargs)
+            except Exception as e:
+                _call_in_loop(loop, fail, e)
+
+        self.on(event, listener)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.off(event, listener)
+
+    def set_event_queue(self, queue: Optional[EventQueue]):
+        self.__queue = queue
+
+    def clear_listeners(self):
+        self.__events = None
+        self.__queue = None
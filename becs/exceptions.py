@@ -15,4 +15,82 @@ class ComponentInstanceNotFound(Exception):
         self.component_id = component_id
 
 class InvalidSystemClock(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class ComponentNotColumnar(Exception):
+    def __init__(self, component):
+        super().__init__("Component is not columnar: {}".format(component))
+        self.component = component
+
+
+class SystemNotFound(Exception):
+    def __init__(self, system):
+        super().__init__("System not found: {}".format(system))
+        self.system = system
+
+
+class StageNotFound(Exception):
+    def __init__(self, stage):
+        super().__init__("Stage not found: {}".format(stage))
+        self.stage = stage
+
+
+class CyclicSystemOrder(Exception):
+    def __init__(self, systems):
+        super().__init__("Cyclic system ordering: {}".format(", ".join(systems)))
+        self.systems = systems
+
+
+class InvalidSnapshot(Exception):
+    def __init__(self, path):
+        super().__init__("Invalid world snapshot: {}".format(path))
+        self.path = path
+
+
+class InvalidDelta(Exception):
+    def __init__(self, reason):
+        super().__init__("Invalid world delta: {}".format(reason))
+        self.reason = reason
+
+
+class ProfilingNotEnabled(Exception):
+    def __init__(self):
+        super().__init__("Profiling is not enabled, call World.enable_profiling first")
+
+
+class HistoryNotEnabled(Exception):
+    def __init__(self):
+        super().__init__("History is not enabled, call World.enable_history first")
+
+
+class InvalidFieldName(Exception):
+    def __init__(self, field_name):
+        super().__init__(
+            "Field name can't be used in a slot component: {}".format(field_name)
+        )
+        self.field_name = field_name
+
+
+class FieldNotFound(Exception):
+    def __init__(self, field_name):
+        super().__init__("Field not found: {}".format(field_name))
+        self.field_name = field_name
+
+
+class PrefabNotFound(Exception):
+    def __init__(self, prefab):
+        super().__init__("Prefab not found: {}".format(prefab))
+        self.prefab = prefab
+
+
+class ShardFailed(Exception):
+    def __init__(self, node_id):
+        super().__init__("Shard worker is not running: {}".format(node_id))
+        self.node_id = node_id
+
+
+class NoEventLoop(Exception):
+    def __init__(self, listener):
+        super().__init__("No event loop for coroutine listener: {}".format(listener))
+        self.listener = listener
@@ -0,0 +1,433 @@
+import math
+import operator
+from array import array
+from itertools import compress
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from becs.columnar import numpy
+from becs.exceptions import ComponentNotFound, FieldNotFound
+from becs.query import PAGE_SIZE
+
+# component name -> variable holding its instance in compiled filters
+Names = Dict[str, str]
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _literal(value: Any) -> Optional[str]:
+    if value is None or type(value) in (int, str, bool):
+        return repr(value)
+
+    if type(value) is float and math.isfinite(value):
+        return repr(value)
+
+    return None
+
+
+class Expression:
+    # Combine with & (and), | (or) and ~ (not). Python's and/or/not can't be
+    # overloaded, using them raises instead of silently keeping one side.
+    def components(self) -> FrozenSet[str]:
+        raise NotImplementedError()
+
+    def source(self, names: Names, values: List[Any], slots: FrozenSet[str]) -> str:
+        raise NotImplementedError()
+
+    def mask(self, columns: Any):
+        raise NotImplementedError()
+
+    def __and__(self, other: "Expression") -> "Expression":
+        return And(self, other)
+
+    def __or__(self, other: "Expression") -> "Expression":
+        return Or(self, other)
+
+    def __invert__(self) -> "Expression":
+        return Not(self)
+
+    def __bool__(self):
+        raise TypeError("Combine filter expressions with &, | and ~, not and/or/not")
+
+
+class Compare(Expression):
+    component: str
+    field: str
+    op: str
+    value: Any
+
+    def __init__(self, component: str, field: str, op: str, value: Any):
+        self.component = component
+        self.field = field
+        self.op = op
+        self.value = value
+
+    def components(self) -> FrozenSet[str]:
+        return frozenset((self.component,))
+
+    def source(self, names: Names, values: List[Any], slots: FrozenSet[str]) -> str:
+        if self.component in slots:
+            read = "{}.{}".format(names[self.component], self.field)
+        else:
+            read = "{}[{!r}]".format(names[self.component], self.field)
+
+        # constants are inlined, they read faster than globals
+        value = _literal(self.value)
+        if value is None:
+            values.append(self.value)
+            value = "_v{}".format(len(values) - 1)
+
+        return "({} {} {})".format(read, self.op, value)
+
+    def mask(self, columns: Any):
+        return OPERATORS[self.op](columns[self.field], self.value)
+
+    def __repr__(self):
+        return "F({!r}) {} {!r}".format(
+            "{}.{}".format(self.component, self.field), self.op, self.value
+        )
+
+
+class And(Expression):
+    def __init__(self, *parts: Expression):
+        self.parts = parts
+
+    def components(self) -> FrozenSet[str]:
+        return frozenset().union(*(part.components() for part in self.parts))
+
+    def source(self, names: Names, values: List[Any], slots: FrozenSet[str]) -> str:
+        return "({})".format(
+            " and ".join(part.source(names, values, slots) for part in self.parts)
+        )
+
+    def mask(self, columns: Any):
+        mask = self.parts[0].mask(columns)
+        for part in self.parts[1:]:
+            mask = mask & part.mask(columns)
+
+        return mask
+
+
+class Or(Expression):
+    def __init__(self, *parts: Expression):
+        self.parts = parts
+
+    def components(self) -> FrozenSet[str]:
+        return frozenset().union(*(part.components() for part in self.parts))
+
+    def source(self, names: Names, values: List[Any], slots: FrozenSet[str]) -> str:
+        return "({})".format(
+            " or ".join(part.source(names, values, slots) for part in self.parts)
+        )
+
+    def mask(self, columns: Any):
+        mask = self.parts[0].mask(columns)
+        for part in self.parts[1:]:
+            mask = mask | part.mask(columns)
+
+        return mask
+
+
+class Not(Expression):
+    def __init__(self, part: Expression):
+        self.part = part
+
+    def components(self) -> FrozenSet[str]:
+        return self.part.components()
+
+    def source(self, names: Names, values: List[Any], slots: FrozenSet[str]) -> str:
+        return "(not {})".format(self.part.source(names, values, slots))
+
+    def mask(self, columns: Any):
+        return ~self.part.mask(columns)
+
+
+class F:
+    # A component field, F("health.hp"), compared to a value to build a filter
+    path: str
+
+    def __init__(self, path: str):
+        component, dot, field = path.partition(".")
+        if not dot or not component or not field:
+            raise FieldNotFound(path)
+
+        self.path = path
+        self.component = component
+        self.field = field
+
+    def _compare(self, op: str, value: Any) -> Compare:
+        return Compare(self.component, self.field, op, value)
+
+    def __lt__(self, value: Any) -> Compare:
+        return self._compare("<", value)
+
+    def __le__(self, value: Any) -> Compare:
+        return self._compare("<=", value)
+
+    def __gt__(self, value: Any) -> Compare:
+        return self._compare(">", value)
+
+    def __ge__(self, value: Any) -> Compare:
+        return self._compare(">=", value)
+
+    def __eq__(self, value: Any) -> Compare:
+        return self._compare("==", value)
+
+    def __ne__(self, value: Any) -> Compare:
+        return self._compare("!=", value)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "F({!r})".format(self.path)
+
+
+def compile_filter(
+    expression: Expression, components: Tuple[str, ...], slots: FrozenSet[str]
+) -> Callable[..., List]:
+    # builds one list comprehension over the entity ids and the component columns
+    # of an archetype, so testing a row costs no Python call
+    names = {name: "_c{}".format(i) for i, name in enumerate(components)}
+    values: List[Any] = []
+    condition = expression.source(names, values, slots)
+    rows = ", ".join(names[name] for name in components)
+    columns = ", ".join("_l{}".format(i) for i in range(len(components)))
+
+    source = (
+        "def _filter(_entities, {1}):\n"
+        "    return [_e for _e, {0} in zip(_entities, {1}) if {2}]\n"
+    ).format(rows, columns, condition)
+    namespace: Dict[str, Any] = {
+        "_v{}".format(i): value for i, value in enumerate(values)
+    }
+    exec(source, namespace)
+
+    return namespace["_filter"]
+
+
+class Selection:
+    # Entities with the selected components whose fields match every where
+    # expression. Expressions on a single columnar component are evaluated with
+    # NumPy over the whole column store, the others are compiled into one list
+    # comprehension run per archetype, or over the rows the columns let through.
+    components: Tuple[str, ...]
+    exclude: FrozenSet[str]
+    expressions: Tuple[Expression, ...]
+    _filter: Optional[Callable[..., List]] = None
+
+    def __init__(
+        self,
+        world,
+        components: Iterable[str],
+        exclude: Iterable[str] = (),
+        expressions: Tuple[Expression, ...] = (),
+    ):
+        self._world = world
+        self.components = tuple(components)
+        self.exclude = frozenset(exclude)
+        self.expressions = expressions
+
+        referenced = set()
+        for expression in expressions:
+            referenced.update(expression.components())
+
+        # filtering on a component requires it, selected or not
+        self._required = self.components + tuple(
+            sorted(referenced.difference(self.components))
+        )
+        vectorized = []
+        compiled = []
+        for expression in expressions:
+            names = expression.components()
+            if numpy is not None and len(names) == 1 and names <= world._columns.keys():
+                vectorized.append(expression)
+            else:
+                compiled.append(expression)
+
+        self._vectorized = vectorized
+        self._compiled = compiled
+        self._referenced = tuple(
+            sorted(set().union(*(expression.components() for expression in compiled)))
+        )
+
+    def where(self, *expressions: Expression) -> "Selection":
+        world = self._world
+        for expression in expressions:
+            _validate(world, expression)
+
+        return Selection(
+            world, self.components, self.exclude, self.expressions + expressions
+        )
+
+    def entities(self) -> List:
+        query = self._world.query(*self._required, exclude=self.exclude)
+        if not self.expressions:
+            return list(query.entities())
+
+        if self._vectorized:
+            return self._filter_rows(query, self._vectorize(query))
+
+        return self._scan(query)
+
+    def ids(self):
+        # entity ids as an int64 array, snowflake ids included
+        entities = self.entities()
+        if numpy is not None:
+            return numpy.fromiter(
+                map(int, entities), dtype=numpy.int64, count=len(entities)
+            )
+
+        return array("q", map(int, entities))
+
+    def count(self) -> int:
+        return len(self.entities())
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        get_component = self._world.get_component
+        for entity_id in self.entities():
+            yield (entity_id,) + tuple(
+                get_component(entity_id, name) for name in self.components
+            )
+
+    def _compiled_filter(self) -> Callable[..., List]:
+        if self._filter is None:
+            self._filter = compile_filter(
+                And(*self._compiled),
+                self._referenced,
+                frozenset(self._world._slot_classes),
+            )
+
+        return self._filter
+
+    def _vectorize(self, query) -> List:
+        world = self._world
+        masks = dict()
+        for expression in self._vectorized:
+            component = next(iter(expression.components()))
+            mask = expression.mask(world._columns[component].columns())
+            if component in masks:
+                mask = masks[component] & mask
+
+            masks[component] = mask
+
+        # walk the component with the fewest matches, stores holding the same
+        # entities in the same order combine masks directly, the others are looked
+        # up by row
+        first = min(masks, key=lambda component: numpy.count_nonzero(masks[component]))
+        entities = world._columns[first].entities
+        mask = masks[first]
+        others = []
+        for component, other in masks.items():
+            if component != first:
+                if world._columns[component].entities == entities:
+                    mask = mask & other
+                else:
+                    others.append((world._columns[component]._rows, other))
+
+        found = list(map(entities.__getitem__, numpy.flatnonzero(mask).tolist()))
+        for rows, other in others:
+            if found:
+                # entities without the component get row -1, a False appended to mask
+                rows = numpy.fromiter(
+                    (rows.get(entity_id, -1) for entity_id in found),
+                    dtype=numpy.intp,
+                    count=len(found),
+                )
+                keep = numpy.append(other, False)[rows]
+                found = list(compress(found, keep.tolist()))
+
+        # the columns cover every required component, everything found matches
+        if query.include == frozenset(masks) and not (
+            query.exclude or query._required or query._excluded
+        ):
+            return found
+
+        entity_archetype = world._entity_archetype
+        matched = query._matched
+        keep = query._keep
+        return [
+            entity_id
+            for entity_id in found
+            if entity_archetype.get(entity_id) in matched and keep(entity_id)
+        ]
+
+    def _filter_rows(self, query, entity_ids: List) -> List:
+        if not self._compiled:
+            return entity_ids
+
+        world = self._world
+        storage = world._storage
+        entity_archetype = world._entity_archetype
+        columns = [[] for _ in self._referenced]
+        for entity_id in entity_ids:
+            archetype = entity_archetype[entity_id]
+            row = archetype.row(entity_id)
+            for column, name in zip(columns, self._referenced):
+                cell = archetype.columns[name][row]
+                column.append(cell if storage is None else storage[cell])
+
+        return self._compiled_filter()(entity_ids, *columns)
+
+    def _scan(self, query) -> List:
+        world = self._world
+        storage = world._storage
+        test = self._compiled_filter()
+        found = []
+        for archetype in query.archetypes():
+            entities = archetype.entities
+            if not entities:
+                continue
+
+            if storage is None:
+                columns = [archetype.columns[name] for name in self._referenced]
+                found.extend(test(entities, *columns))
+                continue
+
+            # page instances in from the storage a batch of rows at a time
+            for start in range(0, len(entities), PAGE_SIZE):
+                stop = start + PAGE_SIZE
+                columns = [
+                    storage.get_many(archetype.columns[name][start:stop])
+                    for name in self._referenced
+                ]
+                found.extend(test(entities[start:stop], *columns))
+
+        if query._required or query._excluded:
+            found = list(compress(found, map(query._keep, found)))
+
+        return found
+
+
+def _validate(world, expression: Expression):
+    if isinstance(expression, Compare):
+        meta = world._componentMeta.get(expression.component)
+        if meta is None:
+            raise ComponentNotFound(expression.component)
+
+        if not any(field.field_name == expression.field for field in meta.fields):
+            raise FieldNotFound(expression.field)
+    elif isinstance(expression, Not):
+        _validate(world, expression.part)
+    elif isinstance(expression, (And, Or)):
+        for part in expression.parts:
+            _validate(world, part)
+    else:
+        raise TypeError("Not a filter expression: {!r}".format(expression))
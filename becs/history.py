@@ -0,0 +1,303 @@
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from becs import EVT_ENTITY_ADDED
+
+Key = Tuple[Any, str]
+
+
+def _values(comp_instance: Any) -> Dict[str, Any]:
+    if comp_instance is None:
+        return {}
+
+    return dict(comp_instance.items())
+
+
+def _has(world, entity_id, component: str) -> bool:
+    return entity_id in world._entities and world.entity_has_component(
+        entity_id, component
+    )
+
+
+class TickRecord:
+    # What one tick changed, kept as the state before and after the tick for each
+    # entity and component it touched, so a tick is undone or redone as a whole
+    # whatever order its changes happened in.
+    __slots__ = ("tick", "entities", "components", "fields")
+
+    # entity id -> (existed before, exists after)
+    entities: Dict[Any, List[Optional[bool]]]
+    # (entity id, component) -> [values before, values after], None when absent
+    components: Dict[Key, List[Optional[Dict[str, Any]]]]
+    # (entity id, component) -> field -> [value before, value after]
+    fields: Dict[Key, Dict[str, List[Any]]]
+
+    def __init__(self):
+        self.tick = None
+        self.entities = dict()
+        self.components = dict()
+        self.fields = dict()
+
+    def __bool__(self):
+        return bool(self.entities or self.components or self.fields)
+
+    def __len__(self):
+        return (
+            len(self.entities)
+            + len(self.components)
+            + sum(len(fields) for fields in self.fields.values())
+        )
+
+
+class History:
+    # Ring buffer of the last ticks' changes fed by World. Only field deltas and
+    # structural changes are kept, so memory follows the volume of change and
+    # undoing a tick touches only what it changed. Writes that fire no events,
+    # such as vectorized column writes or unobservable slot components, are not
+    # recorded. Ticks that changed nothing have no record but still count, both
+    # towards the ticks kept and when rolling back.
+    ticks: int
+    _records: Deque[TickRecord]
+    _redo: List[TickRecord]
+    # oldest tick the world can be rolled back to
+    _floor: int
+    # tick the last rollback started from, replay goes no further
+    _head: Optional[int] = None
+
+    def __init__(self, world, ticks: int):
+        if ticks < 1:
+            raise ValueError("History must keep at least one tick: {}".format(ticks))
+
+        self.ticks = ticks
+        self._world = world
+        self._records = deque()
+        self._redo = []
+        self._floor = world._tick
+        self._pending = TickRecord()
+        self._applying = False
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def replayable(self) -> int:
+        if self._head is None:
+            return 0
+
+        return self._head - self._world._tick
+
+    def spawned(self, entity_ids: Iterable):
+        if self._applying:
+            return
+
+        entities = self._pending.entities
+        for entity_id in entity_ids:
+            if entity_id not in entities:
+                entities[entity_id] = [False, None]
+
+    def despawned(self, entity_ids: Iterable):
+        if self._applying:
+            return
+
+        entities = self._pending.entities
+        for entity_id in entity_ids:
+            if entity_id not in entities:
+                entities[entity_id] = [True, None]
+
+    def created(self, component: str, entity_ids: Iterable):
+        if self._applying:
+            return
+
+        components = self._pending.components
+        for entity_id in entity_ids:
+            key = (entity_id, component)
+            if key not in components:
+                components[key] = [None, None]
+
+    def destroyed(
+        self, component: str, entity_ids: Iterable, instances: Optional[Iterable] = None
+    ):
+        # called before the instances go away, tags have none
+        if self._applying:
+            return
+
+        entity_ids = list(entity_ids)
+        if instances is None:
+            instances = [None] * len(entity_ids)
+
+        components = self._pending.components
+        fields = self._pending.fields
+        for entity_id, comp_instance in zip(entity_ids, instances):
+            key = (entity_id, component)
+            if key in components:
+                continue
+
+            values = _values(comp_instance)
+            # fields changed earlier in the tick go back to their old values
+            for field, (old_value, _) in fields.pop(key, {}).items():
+                values[field] = old_value
+
+            components[key] = [values, None]
+
+    def modified(self, entity_id, component: str, key: str, value: Any, old_value: Any):
+        if self._applying:
+            return
+
+        record_key = (entity_id, component)
+        if record_key in self._pending.components:
+            # the values around structural changes are read from the component
+            return
+
+        fields = self._pending.fields.setdefault(record_key, dict())
+        delta = fields.get(key)
+        if delta is None:
+            fields[key] = [old_value, value]
+        else:
+            delta[1] = value
+
+    def commit(self, tick: int):
+        # the world moved on, what was rolled back can't be replayed
+        self._redo = []
+        self._head = None
+
+        records = self._records
+        self._floor = max(self._floor, tick - self.ticks)
+        while records and records[0].tick <= self._floor:
+            records.popleft()
+
+        record = self._pending
+        self._pending = TickRecord()
+        if not record:
+            return
+
+        world = self._world
+        for entity_id, state in record.entities.items():
+            state[1] = entity_id in world._entities
+
+        for (entity_id, component), state in record.components.items():
+            if _has(world, entity_id, component):
+                state[1] = _values(world.get_component(entity_id, component))
+
+        # changes undone and redone within the tick leave nothing to record
+        record.entities = {
+            entity_id: state
+            for entity_id, state in record.entities.items()
+            if state[0] != state[1]
+        }
+        record.components = {
+            key: state
+            for key, state in record.components.items()
+            if state[0] != state[1]
+        }
+        for key, fields in list(record.fields.items()):
+            changed = {
+                field: delta for field, delta in fields.items() if delta[0] != delta[1]
+            }
+            if changed:
+                record.fields[key] = changed
+            else:
+                del record.fields[key]
+
+        if record:
+            record.tick = tick
+            records.append(record)
+
+    def rollback(self, ticks: int = 1) -> int:
+        # returns the ticks gone back, changes since the last tick are discarded
+        self._world.flush_events()
+        self._apply(self._pending, 0)
+        self._pending = TickRecord()
+
+        current = self._world._tick
+        target = max(current - ticks, self._floor)
+        if target >= current:
+            return 0
+
+        while self._records and self._records[-1].tick > target:
+            record = self._records.pop()
+            self._apply(record, 0)
+            self._redo.append(record)
+
+        if self._head is None:
+            self._head = current
+
+        return current - target
+
+    def replay(self, ticks: Optional[int] = None) -> int:
+        # returns the ticks gone forward
+        if self._head is None:
+            return 0
+
+        current = self._world._tick
+        target = self._head
+        if ticks is not None:
+            target = max(current, min(current + ticks, target))
+        while self._redo and self._redo[-1].tick <= target:
+            record = self._redo.pop()
+            self._apply(record, 1)
+            self._records.append(record)
+
+        if target == self._head:
+            self._head = None
+
+        return target - current
+
+    def clear(self):
+        self._records.clear()
+        self._redo = []
+        self._head = None
+        self._floor = self._world._tick
+        self._pending = TickRecord()
+
+    def _apply(self, record: TickRecord, side: int):
+        # side 0 restores the state before the record, 1 the state after
+        world = self._world
+        self._applying = True
+        try:
+            # entities go away first so their handles can be claimed again
+            gone = [
+                entity_id
+                for entity_id, state in record.entities.items()
+                if not state[side] and entity_id in world._entities
+            ]
+            if gone:
+                world.remove_entities(gone)
+
+            for entity_id, state in record.entities.items():
+                if state[side] and entity_id not in world._entities:
+                    if world._slots is not None:
+                        world._slots.claim(entity_id)
+
+                    world._insert_entity(entity_id)
+                    world.fire(EVT_ENTITY_ADDED, entity_id, ())
+
+            for (entity_id, component), state in record.components.items():
+                if entity_id not in world._entities:
+                    continue
+
+                values = state[side]
+                present = world.entity_has_component(entity_id, component)
+                if values is None:
+                    if present:
+                        world.remove_component(entity_id, component)
+                    continue
+
+                if not present:
+                    world.add_component(entity_id, component)
+
+                if values:
+                    comp_instance = world.get_component(entity_id, component)
+                    for key, value in values.items():
+                        comp_instance[key] = value
+
+            for (entity_id, component), fields in record.fields.items():
+                if not _has(world, entity_id, component):
+                    continue
+
+                comp_instance = world.get_component(entity_id, component)
+                for key, delta in fields.items():
+                    comp_instance[key] = delta[side]
+
+            # deliver what the changes fired while they are still ignored here
+            world.flush_events()
+        finally:
+            self._applying = False
@@ -0,0 +1,183 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Set
+
+INDEX_HASH = "hash"
+INDEX_SORTED = "sorted"
+
+# marks an equality lookup that wasn't asked for, None is a valid value to find
+MISSING = object()
+
+
+class Index:
+    # Maps a component field's values back to the entities holding them. Each
+    # index remembers the value it filed an entity under so it can move the
+    # entity without asking the component for the old value.
+    kind: str
+    component: str
+    field: str
+    _values: Dict[Any, Any]
+
+    def __init__(self, component: str, field: str):
+        self.component = component
+        self.field = field
+        self._values = dict()
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, entity_id, value):
+        if entity_id in self._values:
+            self.remove(entity_id)
+
+        self._values[entity_id] = value
+        self._insert(entity_id, value)
+
+    def remove(self, entity_id):
+        value = self._values.pop(entity_id, MISSING)
+        if value is not MISSING:
+            self._delete(entity_id, value)
+
+    def update(self, entity_id, value):
+        old_value = self._values.get(entity_id, MISSING)
+        if old_value is MISSING or old_value != value:
+            self.add(entity_id, value)
+
+    def _insert(self, entity_id, value):
+        raise NotImplementedError()
+
+    def _delete(self, entity_id, value):
+        raise NotImplementedError()
+
+    def find(self, eq=MISSING, lt=None, le=None, gt=None, ge=None) -> List:
+        raise NotImplementedError()
+
+
+class HashIndex(Index):
+    kind = INDEX_HASH
+    _buckets: Dict[Any, Set[Any]]
+
+    def __init__(self, component: str, field: str):
+        super().__init__(component, field)
+        self._buckets = dict()
+
+    def _insert(self, entity_id, value):
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            bucket = self._buckets[value] = set()
+
+        bucket.add(entity_id)
+
+    def _delete(self, entity_id, value):
+        bucket = self._buckets[value]
+        bucket.discard(entity_id)
+        if not bucket:
+            del self._buckets[value]
+
+    def find(self, eq=MISSING, lt=None, le=None, gt=None, ge=None) -> List:
+        if eq is MISSING or any(bound is not None for bound in (lt, le, gt, ge)):
+            raise ValueError("Hash indexes only support equality lookups")
+
+        return list(self._buckets.get(eq, ()))
+
+
+class SortedIndex(Index):
+    # parallel lists ordered by value, None can't be ordered and is kept apart
+    kind = INDEX_SORTED
+    _keys: List[Any]
+    _entities: List[Any]
+    _none: Set[Any]
+
+    def __init__(self, component: str, field: str):
+        super().__init__(component, field)
+        self._keys = []
+        self._entities = []
+        self._none = set()
+
+    def _insert(self, entity_id, value):
+        if value is None:
+            self._none.add(entity_id)
+            return
+
+        i = bisect_right(self._keys, value)
+        self._keys.insert(i, value)
+        self._entities.insert(i, entity_id)
+
+    def _delete(self, entity_id, value):
+        if value is None:
+            self._none.discard(entity_id)
+            return
+
+        start = bisect_left(self._keys, value)
+        end = bisect_right(self._keys, value, start)
+        i = self._entities.index(entity_id, start, end)
+        del self._keys[i]
+        del self._entities[i]
+
+    def find(self, eq=MISSING, lt=None, le=None, gt=None, ge=None) -> List:
+        keys = self._keys
+        start = 0
+        end = len(keys)
+
+        if eq is not MISSING:
+            if eq is None:
+                ranged = any(bound is not None for bound in (lt, le, gt, ge))
+                return [] if ranged else list(self._none)
+
+            start = bisect_left(keys, eq)
+            end = bisect_right(keys, eq, start)
+
+        if gt is not None:
+            start = max(start, bisect_right(keys, gt))
+        if ge is not None:
+            start = max(start, bisect_left(keys, ge))
+        if lt is not None:
+            end = min(end, bisect_left(keys, lt))
+        if le is not None:
+            end = min(end, bisect_right(keys, le))
+
+        return self._entities[start:end] if start < end else []
+
+
+INDEX_TYPES = {INDEX_HASH: HashIndex, INDEX_SORTED: SortedIndex}
+
+
+def new_index(kind: str, component: str, field: str) -> Index:
+    index_type = INDEX_TYPES.get(kind)
+    if index_type is None:
+        raise ValueError("Unknown index kind: {}".format(kind))
+
+    return index_type(component, field)
+
+
+def matches_lookup(value, eq=MISSING, lt=None, le=None, gt=None, ge=None) -> bool:
+    # the same lookup as Index.find, for scans over components without an index
+    if eq is not MISSING and value != eq:
+        return False
+
+    if lt is None and le is None and gt is None and ge is None:
+        return True
+
+    if value is None:
+        return False
+
+    return not (
+        (lt is not None and not value < lt)
+        or (le is not None and not value <= le)
+        or (gt is not None and not value > gt)
+        or (ge is not None and not value >= ge)
+    )
+
+
+def find_index(
+    indexes: Optional[List[Index]], field: str, eq: Any, ranged: bool
+) -> Optional[Index]:
+    # any index answers an equality lookup, ranges need a sorted one. A lookup
+    # without criteria matches every entity, None values included, so it scans
+    if eq is MISSING and not ranged:
+        return None
+
+    for index in indexes or ():
+        if index.field == field and (not ranged or index.kind == INDEX_SORTED):
+            return index
+
+    return None
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from becs.events import EventDispatcherMixin, ImmediateListener, WeakListener
+
+CATEGORY_OPERATION = "operation"
+CATEGORY_EVENT = "event"
+CATEGORY_LISTENER = "listener"
+CATEGORY_SYSTEM = "system"
+
+WORLD_OPERATIONS = (
+    "add_entity",
+    "remove_entity",
+    "add_component",
+    "remove_component",
+    "get_component",
+    "add_entities",
+    "remove_entities",
+    "add_components",
+    "remove_components",
+    "query",
+    "flush_events",
+    "tick",
+)
+
+MAX_TRACE_EVENTS = 1_000_000
+
+
+def listener_name(callback: Callable) -> str:
+    if isinstance(callback, ImmediateListener):
+        callback = callback.callback
+
+    if isinstance(callback, WeakListener):
+        callback = callback._ref() or callback
+
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class Profiler:
+    # Counts and times world operations, event dispatch, listeners and systems.
+    # Instrumented methods are set on the instances only while attached, the
+    # classes are never touched so disabled profiling costs nothing.
+    _stats: Dict[Tuple[str, str], List[float]]
+    _trace: Optional[Deque[Tuple[str, str, float, float, int]]]
+    _attached: List[Tuple[Any, Tuple[str, ...]]]
+
+    def __init__(self, trace: bool = False, max_trace_events: int = MAX_TRACE_EVENTS):
+        self._stats = dict()
+        self._trace = deque(maxlen=max_trace_events) if trace else None
+        self._attached = []
+        self._lock = threading.Lock()
+        self._origin = perf_counter()
+
+    def record(self, category: str, name: str, start: float, elapsed: float):
+        key = (category, name)
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                self._stats[key] = [1, elapsed, elapsed]
+            else:
+                stat[0] += 1
+                stat[1] += elapsed
+                if elapsed > stat[2]:
+                    stat[2] = elapsed
+
+            if self._trace is not None:
+                self._trace.append(
+                    (category, name, start, elapsed, threading.get_ident())
+                )
+
+    def timed(self, category: str, name: str, func: Callable) -> Callable:
+        record = self.record
+
+        def timed(*kargs, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*kargs, **kwargs)
+            finally:
+                record(category, name, start, perf_counter() - start)
+
+        return timed
+
+    def attach(self, target: Any, operations: Tuple[str, ...] = ()):
+        overrides = dict()
+        for name in operations:
+            overrides[name] = self.timed(
+                CATEGORY_OPERATION, name, getattr(target, name)
+            )
+
+        if isinstance(target, EventDispatcherMixin):
+            overrides.update(self._dispatch_overrides(target))
+
+        vars(target).update(overrides)
+        self._attached.append((target, tuple(overrides)))
+
+    def attach_scheduler(self, scheduler):
+        run_system = scheduler._run_system
+        record = self.record
+
+        def _run_system(system, world, dt: float):
+            start = perf_counter()
+            try:
+                run_system(system, world, dt)
+            finally:
+                record(CATEGORY_SYSTEM, system.name, start, perf_counter() - start)
+
+        scheduler._run_system = _run_system
+        self._attached.append((scheduler, ("_run_system",)))
+
+    def detach(self):
+        for target, names in self._attached:
+            for name in names:
+                vars(target).pop(name, None)
+
+        self._attached = []
+
+    def _dispatch_overrides(
+        self, dispatcher: EventDispatcherMixin
+    ) -> Dict[str, Callable]:
+        fire = dispatcher.fire
+        record = self.record
+
+        def deliver(event, kargs: tuple, kwargs: dict, queued: bool):
+            events = dispatcher._EventDispatcherMixin__events
+            listeners = events.get(event) if events else None
+            if listeners:
+                for callback in listeners:
+                    if queued and type(callback) is ImmediateListener:
+                        continue
+
+                    start = perf_counter()
+                    try:
+                        callback(*kargs, **kwargs)
+                    finally:
+                        record(
+                            CATEGORY_LISTENER,
+                            listener_name(callback),
+                            start,
+                            perf_counter() - start,
+                        )
+
+        def _dispatch(event, kargs: tuple, kwargs: dict):
+            deliver(event, kargs, kwargs, True)
+
+        def instrumented_fire(event, *kargs, **kwargs):
+            start = perf_counter()
+            try:
+                if dispatcher._EventDispatcherMixin__queue is None:
+                    deliver(event, kargs, kwargs, False)
+                else:
+                    fire(event, *kargs, **kwargs)
+            finally:
+                record(CATEGORY_EVENT, event, start, perf_counter() - start)
+
+        return {"fire": instrumented_fire, "_dispatch": _dispatch}
+
+    def reset(self):
+        with self._lock:
+            self._stats = dict()
+            if self._trace is not None:
+                self._trace.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        with self._lock:
+            result: Dict[str, Dict[str, Dict[str, float]]] = dict()
+            for (category, name), (count, total, longest) in self._stats.items():
+                result.setdefault(category, dict())[name] = {
+                    "count": count,
+                    "total_seconds": total,
+                    "max_seconds": longest,
+                }
+
+            return result
+
+    def trace_events(self) -> List[Dict[str, Any]]:
+        if self._trace is None:
+            return []
+
+        with self._lock:
+            trace = list(self._trace)
+
+        pid = os.getpid()
+        origin = self._origin
+
+        return [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - origin) * 1e6,
+                "dur": elapsed * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for category, name, start, elapsed, tid in trace
+        ]
+
+    def export_chrome_trace(self, path: str):
+        # loads in chrome://tracing and ui.perfetto.dev
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
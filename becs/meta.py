@@ -1,8 +1,13 @@
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, Dict, List, Type
 
+from becs.compiled import compile_component
 from becs.reactive_dict import ReactiveDict
 
+# what every tag component reads as, shared and read only
+TAG_INSTANCE = MappingProxyType({})
+
 @dataclass
 class FieldMeta:
     label: str
@@ -21,5 +26,26 @@ class ComponentMeta:
         assert(isinstance(self.component_name, str))
         assert(isinstance(self.label, str))
 
+    @property
+    def is_tag(self) -> bool:
+        return not self.fields
+
+    def compile(self, observable: bool = True) -> Type:
+        return compile_component(
+            self.label,
+            [(field.field_name, field.default_value) for field in self.fields],
+            observable,
+        )
+
+    def defaults(self) -> Dict[str, Any]:
+        # built once, instances copy it instead of walking the fields
+        defaults = self.__dict__.get("_defaults")
+        if defaults is None:
+            defaults = self._defaults = {
+                field.field_name: field.default_value for field in self.fields
+            }
+
+        return defaults
+
     def instantiate(self):
-        return ReactiveDict({ field.field_name: field.default_value for field in self.fields })
\ No newline at end of file
+        return ReactiveDict(self.defaults())
\ No newline at end of file
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional, Type
+from becs.compiled import SlotComponent
+from becs.meta import ComponentMeta
+from becs.reactive_dict import ReactiveDict
+
+DEFAULT_POOL_SIZE = 1024
+
+
+class ComponentPool:
+    # Free list of released instances of one component type. Instances are reset
+    # to the field defaults, untagged and stripped of their listeners when they
+    # come back, so acquiring one only has to apply the initial values.
+    meta: ComponentMeta
+    max_size: int
+    hits: int = 0
+    misses: int = 0
+    released: int = 0
+    discarded: int = 0
+
+    def __init__(
+        self,
+        meta: ComponentMeta,
+        slot_class: Optional[Type[SlotComponent]] = None,
+        max_size: int = DEFAULT_POOL_SIZE,
+    ):
+        self.meta = meta
+        self.max_size = max_size
+        self._slot_class = slot_class
+        self._defaults = meta.defaults()
+        self._free: List[Any] = []
+
+    def __len__(self):
+        return len(self._free)
+
+    def acquire(self, values: Optional[Dict[str, Any]] = None) -> Any:
+        return self.acquire_many(1, values)[0]
+
+    def acquire_many(
+        self, count: int, values: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        free = self._free
+        reused = min(count, len(free))
+        if reused:
+            instances = free[len(free) - reused :]
+            del free[len(free) - reused :]
+        else:
+            instances = []
+
+        self.hits += reused
+        self.misses += count - reused
+
+        if values:
+            if self._slot_class is not None:
+                # listeners were cleared on release, setting fields fires nothing
+                for comp_instance in instances:
+                    comp_instance.update(values)
+            else:
+                for comp_instance in instances:
+                    dict.update(comp_instance, values)
+
+        if reused < count:
+            instances.extend(self._create(count - reused, values))
+
+        return instances
+
+    def release(self, comp_instance: Any) -> bool:
+        # listeners go either way, a dropped instance must not report to its owner
+        comp_instance.clear_listeners()
+        if len(self._free) >= self.max_size:
+            self.discarded += 1
+            return False
+
+        if self._slot_class is not None:
+            # __init__ writes the default of every slot and clears the tag
+            self._slot_class.__init__(comp_instance)
+        else:
+            dict.clear(comp_instance)
+            dict.update(comp_instance, self._defaults)
+            comp_instance.tag = None
+
+        self._free.append(comp_instance)
+        self.released += 1
+
+        return True
+
+    def clear(self):
+        self._free.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "released": self.released,
+            "discarded": self.discarded,
+            "size": len(self._free),
+            "max_size": self.max_size,
+        }
+
+    def _create(self, count: int, values: Optional[Dict[str, Any]]) -> List[Any]:
+        if self._slot_class is not None:
+            values = values or {}
+            return [self._slot_class(**values) for _ in range(count)]
+
+        template = self._defaults
+        if values:
+            template = dict(template, **values)
+
+        return [ReactiveDict(template) for _ in range(count)]
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+
+@dataclass
+class Prefab:
+    name: str
+    components: Tuple[str, ...]
+    # overrides per component, merged over the component defaults on spawn
+    values: Dict[str, Dict[str, Any]]
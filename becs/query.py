@@ -0,0 +1,168 @@
+from itertools import repeat
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from becs.archetype import Archetype
+from becs.meta import TAG_INSTANCE
+
+# rows resolved from a storage backend at a time
+PAGE_SIZE = 512
+
+
+class Query:
+    components: Tuple[str, ...]
+    include: FrozenSet[str]
+    exclude: FrozenSet[str]
+    _archetypes: List[Archetype]
+    _matched: Set[Archetype]
+    _required: List[Set[str]]
+    _excluded: List[Set[str]]
+
+    def __init__(
+        self,
+        components: Iterable[str],
+        exclude: Iterable[str] = (),
+        tags: Optional[Dict[str, Set[str]]] = None,
+        entity_archetype: Optional[Dict[str, Archetype]] = None,
+        storage: Optional[Any] = None,
+    ):
+        # tag components aren't part of archetypes, they filter the matched rows
+        # through their membership sets
+        tags = tags or {}
+        exclude = frozenset(exclude)
+        self.components = tuple(components)
+        self.include = frozenset(name for name in self.components if name not in tags)
+        self.exclude = frozenset(name for name in exclude if name not in tags)
+        self._required = [tags[name] for name in self.components if name in tags]
+        self._excluded = [tags[name] for name in exclude if name in tags]
+        self._entity_archetype = entity_archetype
+        # archetype rows hold component ids when the world has a storage backend
+        self._storage = storage
+        self._archetypes = []
+        self._matched = set()
+
+    def matches(self, archetype: Archetype) -> bool:
+        return self.include <= archetype.signature and self.exclude.isdisjoint(
+            archetype.signature
+        )
+
+    def _on_archetype_created(self, archetype: Archetype):
+        if archetype not in self._matched and self.matches(archetype):
+            self._archetypes.append(archetype)
+            self._matched.add(archetype)
+
+    def archetypes(self) -> List[Archetype]:
+        return self._archetypes
+
+    def _keep(self, entity_id: str) -> bool:
+        for tagged in self._required:
+            if entity_id not in tagged:
+                return False
+
+        for tagged in self._excluded:
+            if entity_id in tagged:
+                return False
+
+        return True
+
+    def _tagged(self) -> Optional[Set[str]]:
+        # the smallest required tag set when walking it beats walking the rows
+        if not self._required or self._entity_archetype is None:
+            return None
+
+        tagged = min(self._required, key=len)
+        if len(tagged) >= sum(len(archetype) for archetype in self._archetypes):
+            return None
+
+        return tagged
+
+    def _rows(self) -> Iterator[Tuple[Any, ...]]:
+        tagged = self._tagged()
+        if tagged is not None:
+            entity_archetype = self._entity_archetype
+            for entity_id in tagged:
+                archetype = entity_archetype.get(entity_id)
+                if archetype in self._matched and self._keep(entity_id):
+                    row = archetype.row(entity_id)
+                    yield (entity_id,) + tuple(
+                        self._cell(archetype, name, row) for name in self.components
+                    )
+            return
+
+        for archetype in self._archetypes:
+            for row in self._archetype_rows(archetype):
+                if self._keep(row[0]):
+                    yield row
+
+    def _cell(self, archetype: Archetype, name: str, row: int) -> Any:
+        if name not in self.include:
+            return TAG_INSTANCE
+
+        cell = archetype.columns[name][row]
+        return cell if self._storage is None else self._storage[cell]
+
+    def _archetype_rows(self, archetype: Archetype) -> Iterator[Tuple[Any, ...]]:
+        if not archetype.entities:
+            return
+
+        if self._storage is None:
+            columns = [
+                archetype.columns[name]
+                if name in self.include
+                else repeat(TAG_INSTANCE)
+                for name in self.components
+            ]
+            yield from zip(archetype.entities, *columns)
+            return
+
+        # page instances in from the storage a batch of rows at a time
+        entities = archetype.entities
+        for start in range(0, len(entities), PAGE_SIZE):
+            stop = start + PAGE_SIZE
+            columns = [
+                self._storage.get_many(archetype.columns[name][start:stop])
+                if name in self.include
+                else repeat(TAG_INSTANCE)
+                for name in self.components
+            ]
+            yield from zip(entities[start:stop], *columns)
+
+    def entities(self) -> Iterator[str]:
+        if self._required or self._excluded:
+            for row in self._rows():
+                yield row[0]
+            return
+
+        for archetype in self._archetypes:
+            yield from archetype.entities
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        if self._required or self._excluded:
+            yield from self._rows()
+            return
+
+        if self._storage is not None:
+            for archetype in self._archetypes:
+                yield from self._archetype_rows(archetype)
+            return
+
+        for archetype in self._archetypes:
+            if not archetype.entities:
+                continue
+
+            columns = [archetype.columns[name] for name in self.components]
+            yield from zip(archetype.entities, *columns)
+
+    def __len__(self):
+        if self._required or self._excluded:
+            return sum(1 for _ in self._rows())
+
+        return sum(len(archetype) for archetype in self._archetypes)
+
+    def __contains__(self, entity_id: str):
+        if not self._keep(entity_id):
+            return False
+
+        for archetype in self._archetypes:
+            if entity_id in archetype:
+                return True
+
+        return False
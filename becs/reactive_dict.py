@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict
 from becs.events import EventDispatcherMixin
 from becs.tag import TagMixin
 
@@ -6,43 +6,29 @@ EVT_ITEM_ADDED = "item-added"
 EVT_ITEM_REMOVED = "item-removed"
 EVT_ITEM_CHANGED = "item-changed"
 
+# while deferred, repeated changes of a key collapse into one event that carries
+# the latest value and the value from before the first change
+ITEM_CHANGED_COALESCE = (
+    lambda kargs: kargs[1],
+    lambda queued, kargs: kargs[:3] + (queued[3],),
+)
+
 
 class ReactiveDict(Dict[str, Any], EventDispatcherMixin, TagMixin):
-    def __init__(self, *kargs, **kwargs):
-        self.__keys_changed: List = []
-        super().__init__(*kargs, **kwargs)
+    _coalesce = {EVT_ITEM_CHANGED: ITEM_CHANGED_COALESCE}
 
     def __setitem__(self, __k, v) -> None:
-        evt = None
-        old_val = self.get(__k, None)
-        if not old_val:
-            evt = EVT_ITEM_ADDED
-        elif old_val != v:
-            evt = EVT_ITEM_CHANGED
-            self.__keys_changed.append(__k)
+        if __k not in self:
+            super().__setitem__(__k, v)
+            self.fire(EVT_ITEM_ADDED, self, __k, v, None)
+            return
 
-        result = super().__setitem__(__k, v)
+        old_val = super().__getitem__(__k)
+        super().__setitem__(__k, v)
 
-        self.fire(evt, self,  __k, v, old_val)
-        return result
+        if old_val != v:
+            self.fire(EVT_ITEM_CHANGED, self, __k, v, old_val)
 
     def __delitem__(self, __v) -> None:
         super().__delitem__(__v)
         self.fire(EVT_ITEM_REMOVED, self, __v)
-
-    def __getitem__(self, __k):
-        if __k in self.__keys_changed:
-            self.__keys_changed.remove(__k)
-        return super().__getitem__(__k)
-
-    def items(self):
-        self.__keys_changed.clear()
-        return super().items()
-
-    def keys_changed(self) -> List[str]:
-        return self.__keys_changed
-
-    def get(self, key:str, default: Optional[Any] = None) -> Any:
-        if key in self.__keys_changed:
-            self.__keys_changed.remove(key)
-        return super().get(key, default)
\ No newline at end of file
@@ -0,0 +1,553 @@
+import pickle
+import queue
+import socket
+import struct
+from multiprocessing import Pipe
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple, Union
+from becs import (
+    EVT_COMPONENT_ADDED,
+    EVT_COMPONENT_MODIFIED,
+    EVT_COMPONENT_REMOVED,
+    EVT_COMPONENTS_ADDED,
+    EVT_COMPONENTS_MODIFIED,
+    EVT_COMPONENTS_REMOVED,
+    EVT_ENTITIES_ADDED,
+    EVT_ENTITIES_REMOVED,
+    EVT_ENTITY_ADDED,
+    EVT_ENTITY_REMOVED,
+    EVT_TICK,
+    World,
+)
+from becs.events import WeakListener
+from becs.exceptions import InvalidDelta
+
+# delta layout: preamble, name table (component and field names), then one op per
+# structural change or changed component, each starting with its opcode
+MAGIC = b"BD"
+VERSION = 1
+PREAMBLE = struct.Struct("<2sBBQH")
+FLAG_STR_IDS = 1
+
+OP_DESPAWN = 1
+OP_SPAWN = 2
+OP_REMOVE = 3
+OP_ADD = 4
+OP_SET = 5
+
+_ID = struct.Struct("<Q")
+_ID_NAME = struct.Struct("<QH")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+
+ComponentKey = Tuple[Any, str]
+
+
+def _encode_value(out: bytearray, value: Any):
+    kind = type(value)
+    if value is None:
+        out += b"n"
+    elif kind is bool:
+        out += b"t" if value else b"f"
+    elif kind is int and -(1 << 63) <= value < (1 << 63):
+        out += b"i"
+        out += _INT.pack(value)
+    elif kind is float:
+        out += b"d"
+        out += _FLOAT.pack(value)
+    elif kind is str:
+        data = value.encode("utf-8")
+        out += b"s"
+        out += _U32.pack(len(data))
+        out += data
+    else:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        out += b"p"
+        out += _U32.pack(len(data))
+        out += data
+
+
+def _decode_value(data: memoryview, offset: int) -> Tuple[Any, int]:
+    kind = data[offset]
+    offset += 1
+    if kind == ord("n"):
+        return None, offset
+    if kind == ord("t"):
+        return True, offset
+    if kind == ord("f"):
+        return False, offset
+    if kind == ord("i"):
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if kind == ord("d"):
+        return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+
+    (size,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    raw = data[offset : offset + size]
+    if kind == ord("s"):
+        return str(raw, "utf-8"), offset + size
+    if kind == ord("p"):
+        return pickle.loads(raw), offset + size
+
+    raise InvalidDelta("unknown value type {}".format(kind))
+
+
+class _DeltaWriter:
+    def __init__(self, string_ids: bool):
+        self.string_ids = string_ids
+        self.names: Dict[str, int] = dict()
+        self.ops = bytearray()
+
+    def name(self, name: str) -> int:
+        index = self.names.get(name)
+        if index is None:
+            index = self.names[name] = len(self.names)
+
+        return index
+
+    def op(self, opcode: int, entity_id: Any, component: Optional[str] = None):
+        self.ops.append(opcode)
+        if component is None:
+            self.ops += _ID.pack(int(entity_id))
+        else:
+            self.ops += _ID_NAME.pack(int(entity_id), self.name(component))
+
+    def values(self, values: Dict[str, Any]):
+        self.ops += _U16.pack(len(values))
+        for key, value in values.items():
+            self.ops += _U16.pack(self.name(key))
+            _encode_value(self.ops, value)
+
+    def getvalue(self, tick: int) -> bytes:
+        out = bytearray(
+            PREAMBLE.pack(
+                MAGIC,
+                VERSION,
+                FLAG_STR_IDS if self.string_ids else 0,
+                tick,
+                len(self.names),
+            )
+        )
+        for name in self.names:
+            data = name.encode("utf-8")
+            out += _U16.pack(len(data))
+            out += data
+
+        out += self.ops
+
+        return bytes(out)
+
+
+class DeltaRecorder:
+    # Collects the structural changes and field level changes of a world and turns
+    # them into one compact delta per flush, changes undone within the same flush
+    # never reach the log.
+    _spawned: Dict[Any, None]
+    _despawned: Dict[Any, None]
+    _added: Dict[ComponentKey, None]
+    _removed: Dict[ComponentKey, None]
+    _fields: Dict[ComponentKey, Dict[str, Any]]
+    _modified: Dict[ComponentKey, None]
+
+    def __init__(self, world: World):
+        self.world = world
+        self._clear()
+
+        self._listeners = {
+            EVT_ENTITY_ADDED: self._on_entity_added,
+            EVT_ENTITY_REMOVED: self._on_entity_removed,
+            EVT_ENTITIES_ADDED: self._on_entities_added,
+            EVT_ENTITIES_REMOVED: self._on_entities_removed,
+            EVT_COMPONENT_ADDED: self._on_component_added,
+            EVT_COMPONENT_REMOVED: self._on_component_removed,
+            EVT_COMPONENTS_ADDED: self._on_components_added,
+            EVT_COMPONENTS_REMOVED: self._on_components_removed,
+            EVT_COMPONENT_MODIFIED: self._on_component_modified,
+            EVT_COMPONENTS_MODIFIED: self._on_components_modified,
+        }
+        for event, listener in self._listeners.items():
+            world.on(event, listener, weak=True)
+
+    def close(self):
+        for event, listener in self._listeners.items():
+            self.world.off(event, listener)
+
+    def _clear(self):
+        self._spawned = dict()
+        self._despawned = dict()
+        self._added = dict()
+        self._removed = dict()
+        self._fields = dict()
+        self._modified = dict()
+
+    def __len__(self):
+        return (
+            len(self._spawned)
+            + len(self._despawned)
+            + len(self._added)
+            + len(self._removed)
+            + len(self._fields)
+            + len(self._modified)
+        )
+
+    def _on_entity_added(self, entity_id, components):
+        self._spawned[entity_id] = None
+
+    def _on_entities_added(self, entity_ids, components):
+        for entity_id in entity_ids:
+            self._spawned[entity_id] = None
+            for component in components:
+                self._added[(entity_id, component)] = None
+
+    def _on_entity_removed(self, entity_id):
+        # removing the entity on the replica drops its components too
+        for component in self.world._componentMeta:
+            self._removed.pop((entity_id, component), None)
+
+        if entity_id in self._spawned:
+            del self._spawned[entity_id]
+        else:
+            self._despawned[entity_id] = None
+
+    def _on_entities_removed(self, entity_ids):
+        for entity_id in entity_ids:
+            # batch removals don't report each component
+            for component in self.world._componentMeta:
+                self._drop_component((entity_id, component))
+
+            self._on_entity_removed(entity_id)
+
+    def _on_component_added(self, entity_id, cid, component):
+        self._added[(entity_id, component)] = None
+        self._fields.pop((entity_id, component), None)
+
+    def _on_components_added(self, entity_ids, cids, component):
+        for entity_id in entity_ids:
+            self._on_component_added(entity_id, None, component)
+
+    def _drop_component(self, key: ComponentKey) -> bool:
+        self._fields.pop(key, None)
+        self._modified.pop(key, None)
+        if key in self._added:
+            del self._added[key]
+            return True
+
+        return False
+
+    def _on_component_removed(self, entity_id, cid, component):
+        key = (entity_id, component)
+        if not self._drop_component(key):
+            self._removed[key] = None
+
+    def _on_components_removed(self, entity_ids, cids, component):
+        for entity_id in entity_ids:
+            self._on_component_removed(entity_id, None, component)
+
+    def _on_component_modified(self, entity_id, component, key, value, old_value):
+        comp_key = (entity_id, component)
+        if comp_key in self._added:
+            # the full component goes out with the add
+            return
+
+        fields = self._fields.get(comp_key)
+        if fields is None:
+            fields = self._fields[comp_key] = dict()
+
+        fields[key] = value
+
+    def _on_components_modified(self, entity_ids, component):
+        # written outside component events, all fields go out with their values at
+        # flush time
+        if component in self.world._tags:
+            return
+
+        for entity_id in entity_ids:
+            comp_key = (entity_id, component)
+            if comp_key not in self._added:
+                self._modified[comp_key] = None
+
+    def _write(self, writer: _DeltaWriter, added: List[ComponentKey]):
+        world = self.world
+
+        for entity_id in self._despawned:
+            writer.op(OP_DESPAWN, entity_id)
+
+        for entity_id in self._spawned:
+            writer.op(OP_SPAWN, entity_id)
+
+        for entity_id, component in self._removed:
+            writer.op(OP_REMOVE, entity_id, component)
+
+        for entity_id, component in added:
+            writer.op(OP_ADD, entity_id, component)
+            writer.values(dict(world.get_component(entity_id, component).items()))
+
+        for (entity_id, component), fields in self._fields.items():
+            if (entity_id, component) not in self._modified:
+                writer.op(OP_SET, entity_id, component)
+                writer.values(fields)
+
+        for entity_id, component in self._modified:
+            writer.op(OP_SET, entity_id, component)
+            writer.values(dict(world.get_component(entity_id, component).items()))
+
+    def flush(self) -> Optional[bytes]:
+        if not len(self):
+            return None
+
+        writer = _DeltaWriter(self.world._slots is None)
+        self._write(writer, list(self._added))
+        self._clear()
+
+        return writer.getvalue(self.world._tick)
+
+    def full_state(self) -> bytes:
+        # everything a new replica needs, independent of what is pending
+        world = self.world
+        writer = _DeltaWriter(world._slots is None)
+
+        for entity_id in world._entities:
+            writer.op(OP_SPAWN, entity_id)
+            for component in world.list_entity_components(entity_id):
+                writer.op(OP_ADD, entity_id, component)
+                writer.values(dict(world.get_component(entity_id, component).items()))
+
+        return writer.getvalue(world._tick)
+
+
+def apply_delta(world: World, data: bytes) -> int:
+    view = memoryview(data)
+    if len(view) < PREAMBLE.size:
+        raise InvalidDelta("too short")
+
+    magic, version, flags, tick, name_count = PREAMBLE.unpack_from(view, 0)
+    if magic != MAGIC or version != VERSION:
+        raise InvalidDelta("bad magic or version")
+
+    offset = PREAMBLE.size
+    names = []
+    for _ in range(name_count):
+        (size,) = _U16.unpack_from(view, offset)
+        offset += _U16.size
+        names.append(str(view[offset : offset + size], "utf-8"))
+        offset += size
+
+    string_ids = bool(flags & FLAG_STR_IDS)
+
+    def values() -> Dict[str, Any]:
+        nonlocal offset
+        (count,) = _U16.unpack_from(view, offset)
+        offset += _U16.size
+        result = dict()
+        for _ in range(count):
+            (name,) = _U16.unpack_from(view, offset)
+            result[names[name]], offset = _decode_value(view, offset + _U16.size)
+
+        return result
+
+    ops = 0
+    while offset < len(view):
+        opcode = view[offset]
+        offset += 1
+
+        if opcode in (OP_DESPAWN, OP_SPAWN):
+            (entity_id,) = _ID.unpack_from(view, offset)
+            offset += _ID.size
+            component = None
+        else:
+            entity_id, component = _ID_NAME.unpack_from(view, offset)
+            offset += _ID_NAME.size
+            component = names[component]
+
+        if string_ids:
+            entity_id = str(entity_id)
+
+        if opcode == OP_DESPAWN:
+            world.remove_entity(entity_id)
+        elif opcode == OP_SPAWN:
+            # a full state applied to a replica that already has the entity, its
+            # components are overwritten by the adds that follow
+            if entity_id in world._entities:
+                continue
+
+            if world._slots is not None:
+                world._slots.claim(entity_id)
+
+            world._insert_entity(entity_id)
+            world.fire(EVT_ENTITY_ADDED, entity_id, ())
+        elif opcode == OP_REMOVE:
+            world.remove_component(entity_id, component)
+        elif opcode in (OP_ADD, OP_SET):
+            if opcode == OP_ADD and not world.entity_has_component(
+                entity_id, component
+            ):
+                world.add_component(entity_id, component)
+
+            instance = world.get_component(entity_id, component)
+            for key, value in values().items():
+                instance[key] = value
+        else:
+            raise InvalidDelta("unknown op {}".format(opcode))
+
+        ops += 1
+
+    return ops
+
+
+class Transport:
+    def send(self, data: bytes):
+        raise NotImplementedError()
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class InProcessTransport(Transport):
+    def __init__(self):
+        self._queue: "queue.Queue[bytes]" = queue.Queue()
+
+    def send(self, data: bytes):
+        self._queue.put(data)
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        try:
+            if timeout:
+                return self._queue.get(timeout=timeout)
+
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+
+class PipeTransport(Transport):
+    def __init__(self, connection: Connection):
+        self._connection = connection
+
+    @classmethod
+    def pair(cls) -> Tuple["PipeTransport", "PipeTransport"]:
+        a, b = Pipe()
+        return cls(a), cls(b)
+
+    def send(self, data: bytes):
+        self._connection.send_bytes(data)
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        if not self._connection.poll(timeout or 0):
+            return None
+
+        return self._connection.recv_bytes()
+
+    def close(self):
+        self._connection.close()
+
+
+Address = Union[str, Tuple[str, int]]
+
+
+class SocketTransport(Transport):
+    # length prefixed frames over a stream socket, TCP for (host, port) addresses and
+    # Unix sockets for paths
+    def __init__(self, sock: socket.socket):
+        self._socket = sock
+        self._buffer = bytearray()
+
+    @staticmethod
+    def _family(address: Address) -> int:
+        return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+    @classmethod
+    def connect(cls, address: Address) -> "SocketTransport":
+        sock = socket.socket(cls._family(address), socket.SOCK_STREAM)
+        sock.connect(address)
+        return cls(sock)
+
+    @classmethod
+    def listen(cls, address: Address) -> socket.socket:
+        server = socket.socket(cls._family(address), socket.SOCK_STREAM)
+        server.bind(address)
+        server.listen()
+        return server
+
+    @classmethod
+    def accept(cls, server: socket.socket) -> "SocketTransport":
+        sock, _ = server.accept()
+        return cls(sock)
+
+    def send(self, data: bytes):
+        self._socket.sendall(_U32.pack(len(data)) + data)
+
+    def _frame(self) -> Optional[bytes]:
+        if len(self._buffer) < _U32.size:
+            return None
+
+        (size,) = _U32.unpack_from(self._buffer, 0)
+        end = _U32.size + size
+        if len(self._buffer) < end:
+            return None
+
+        frame = bytes(self._buffer[_U32.size : end])
+        del self._buffer[:end]
+        return frame
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        frame = self._frame()
+        self._socket.settimeout(timeout or 0)
+        while frame is None:
+            try:
+                chunk = self._socket.recv(65536)
+            except (BlockingIOError, socket.timeout):
+                return None
+
+            if not chunk:
+                raise ConnectionError("Replication peer closed the connection")
+
+            self._buffer += chunk
+            frame = self._frame()
+
+        return frame
+
+    def close(self):
+        self._socket.close()
+
+
+class Replicator:
+    # Sends the world's delta on every tick through a transport
+    def __init__(self, world: World, transport: Transport):
+        self.recorder = DeltaRecorder(world)
+        self.transport = transport
+        self._listener = WeakListener(self._on_tick)
+        world.on(EVT_TICK, self._listener)
+
+    def _on_tick(self, tick: int, dt: float):
+        self.send()
+
+    def send(self):
+        data = self.recorder.flush()
+        if data is not None:
+            self.transport.send(data)
+
+    def send_full_state(self):
+        self.transport.send(self.recorder.full_state())
+
+    def close(self):
+        self.recorder.world.off(EVT_TICK, self._listener)
+        self.recorder.close()
+
+
+def receive_deltas(
+    world: World, transport: Transport, timeout: Optional[float] = None
+) -> int:
+    # applies every delta waiting on the transport, returns how many were applied
+    count = 0
+    data = transport.receive(timeout)
+    while data is not None:
+        world.apply_delta(data)
+        count += 1
+        data = transport.receive()
+
+    return count
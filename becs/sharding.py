@@ -0,0 +1,421 @@
+import multiprocessing
+import os
+import threading
+from itertools import count as counter
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from becs import HANDLES_GLOBAL, World
+from becs.atomic import NODE_ID_BITS, SEQUENCE_BITS
+from becs.exceptions import EntityNotFound, ShardFailed
+from becs.index import MISSING
+from becs.meta import ComponentMeta
+from becs.system import System
+
+NODE_MASK = (1 << NODE_ID_BITS) - 1
+
+# (World method name or function called with the world, args, kwargs)
+Call = Tuple[Any, tuple, dict]
+
+
+def node_of(entity_id) -> int:
+    # the node id bits of a snowflake entity id, which shard created it
+    return (int(entity_id) >> SEQUENCE_BITS) & NODE_MASK
+
+
+def _error_state(error: Exception) -> Tuple[type, str, Dict[str, Any]]:
+    # becs exceptions don't pickle through their constructors, ship their state
+    return type(error), str(error), dict(vars(error))
+
+
+def _rebuild_error(state: Tuple[type, str, Dict[str, Any]]) -> Exception:
+    error_type, message, attributes = state
+    error = error_type.__new__(error_type)
+    Exception.__init__(error, message)
+    error.__dict__.update(attributes)
+
+    return error
+
+
+def _serve(conn: Connection, node_id: int, options: Dict[str, Any]):
+    world = World(node_id=node_id, **options)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+
+            target, args, kwargs = message
+            try:
+                if isinstance(target, str):
+                    result = getattr(world, target)(*args, **kwargs)
+                else:
+                    result = target(world, *args, **kwargs)
+
+                conn.send((True, result))
+            except Exception as e:
+                conn.send((False, _error_state(e)))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        world.shutdown()
+        conn.close()
+
+
+def _component_values(world: World, entity_id, component: str) -> Dict[str, Any]:
+    return dict(world.get_component(entity_id, component).items())
+
+
+def _set_fields(world: World, entity_id, component: str, values: Dict[str, Any]):
+    comp_instance = world.get_component(entity_id, component)
+    for key, value in values.items():
+        comp_instance[key] = value
+
+
+def _list_components(world: World, entity_id) -> List[str]:
+    return list(world.list_entity_components(entity_id))
+
+
+def _query_entities(world: World, components: Tuple[str, ...], exclude) -> List:
+    return list(world.query(*components, exclude=exclude).entities())
+
+
+def _query_count(world: World, components: Tuple[str, ...], exclude) -> int:
+    return len(world.query(*components, exclude=exclude))
+
+
+def _add_system(world: World, system: System):
+    world.add_system(system)
+
+
+class Shard:
+    # A World running in a worker process, called over a pipe one request at a
+    # time.
+    node_id: int
+
+    def __init__(self, node_id: int, process, conn: Connection):
+        self.node_id = node_id
+        self.process = process
+        self.lock = threading.Lock()
+        self._conn = conn
+
+    def send(self, target: Any, args: tuple = (), kwargs: Optional[dict] = None):
+        try:
+            self._conn.send((target, args, kwargs or {}))
+        except (BrokenPipeError, OSError):
+            raise ShardFailed(self.node_id)
+
+    def receive(self) -> Any:
+        try:
+            ok, result = self._conn.recv()
+        except (EOFError, OSError):
+            raise ShardFailed(self.node_id)
+
+        if not ok:
+            raise _rebuild_error(result)
+
+        return result
+
+    def call(self, target: Any, *args, **kwargs) -> Any:
+        with self.lock:
+            self.send(target, args, kwargs)
+            return self.receive()
+
+    def stop(self, timeout: Optional[float] = None):
+        with self.lock:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+
+            self._conn.close()
+
+
+class RemoteComponent(dict):
+    # Copy of a component living in a shard, writes are sent to the shard.
+    def __init__(self, world: "ShardedWorld", entity_id, component: str, values: Dict):
+        super().__init__(values)
+        self.entity_id = entity_id
+        self.component = component
+        self._world = world
+
+    def __setitem__(self, key: str, value: Any):
+        self._world.set_component(self.entity_id, self.component, {key: value})
+        super().__setitem__(key, value)
+
+    def update(self, values: Optional[Dict[str, Any]] = None, **kwargs):
+        values = dict(values or {}, **kwargs)
+        self._world.set_component(self.entity_id, self.component, values)
+        super().update(values)
+
+
+class ShardedWorld:
+    # Runs one World per worker process, each with its own node id. Entity ids
+    # carry the node id of the shard that created them, so calls about an entity
+    # go straight to its owner and batch calls are split between shards and sent
+    # to all of them before waiting for any. Systems run on every shard against
+    # its own entities, in parallel, and events stay inside their shard.
+    _shards: List[Shard]
+    _by_node: Dict[int, Shard]
+
+    def __init__(
+        self,
+        shards: Optional[int] = None,
+        context: Optional[str] = None,
+        **options,
+    ):
+        shards = shards or os.cpu_count() or 1
+        if not 1 <= shards <= NODE_MASK:
+            raise ValueError(
+                "Shard count must be between 1 and {}: {}".format(NODE_MASK, shards)
+            )
+
+        if options.get("handles", HANDLES_GLOBAL) != HANDLES_GLOBAL:
+            raise ValueError("Sharded worlds need global entity handles")
+
+        ctx = multiprocessing.get_context(context)
+        self._shards = []
+        for node_id in range(1, shards + 1):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_serve,
+                args=(child, node_id, options),
+                name="becs-shard-{}".format(node_id),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._shards.append(Shard(node_id, process, parent))
+
+        self._by_node = {shard.node_id: shard for shard in self._shards}
+        self._next = counter()
+
+    def __len__(self):
+        return len(self._shards)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    @property
+    def shards(self) -> List[Shard]:
+        return list(self._shards)
+
+    def shard_of(self, entity_id) -> Shard:
+        try:
+            shard = self._by_node.get(node_of(entity_id))
+        except (TypeError, ValueError):
+            shard = None
+
+        if shard is None:
+            raise EntityNotFound(entity_id)
+
+        return shard
+
+    def define_component(self, meta: ComponentMeta, **kwargs):
+        self._broadcast("define_component", meta, **kwargs)
+
+    def define_prefab(self, name: str, components: Dict[str, Optional[Dict[str, Any]]]):
+        return self._broadcast("define_prefab", name, components)[0]
+
+    def add_system(self, system: System) -> System:
+        # systems are pickled to every shard, their run function must be importable
+        self._broadcast(_add_system, system)
+
+        return system
+
+    def remove_system(self, name: str):
+        self._broadcast("remove_system", name)
+
+    def add_entity(self, *components: str):
+        return self._pick().call("add_entity", *components)
+
+    def add_entities(
+        self,
+        count: int,
+        components: Iterable[str],
+        initial_values: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List:
+        components = tuple(components)
+        return self._spread(
+            count,
+            lambda share: ("add_entities", (share, components, initial_values), {}),
+        )
+
+    def spawn(self, prefab: str, count: int = 1) -> List:
+        return self._spread(count, lambda share: ("spawn", (prefab, share), {}))
+
+    def remove_entity(self, entity_id):
+        self.shard_of(entity_id).call("remove_entity", entity_id)
+
+    def remove_entities(self, entity_ids: Iterable):
+        self._split(entity_ids, lambda ids: ("remove_entities", (ids,), {}))
+
+    def add_component(self, entity_id, component: str):
+        return self.shard_of(entity_id).call("add_component", entity_id, component)
+
+    def add_components(self, entity_ids: Iterable, component: str) -> List:
+        return self._split(
+            entity_ids, lambda ids: ("add_components", (ids, component), {})
+        )
+
+    def remove_component(self, entity_id, component: str):
+        self.shard_of(entity_id).call("remove_component", entity_id, component)
+
+    def remove_components(self, entity_ids: Iterable, component: str):
+        self._split(entity_ids, lambda ids: ("remove_components", (ids, component), {}))
+
+    def get_component(self, entity_id, component: str) -> RemoteComponent:
+        values = self.shard_of(entity_id).call(_component_values, entity_id, component)
+
+        return RemoteComponent(self, entity_id, component, values)
+
+    def set_component(self, entity_id, component: str, values: Dict[str, Any]):
+        self.shard_of(entity_id).call(_set_fields, entity_id, component, values)
+
+    def entity_has_component(self, entity_id, component: str) -> bool:
+        return self.shard_of(entity_id).call(
+            "entity_has_component", entity_id, component
+        )
+
+    def list_entity_components(self, entity_id) -> List[str]:
+        return self.shard_of(entity_id).call(_list_components, entity_id)
+
+    def entities(
+        self, *components: str, exclude: Optional[Iterable[str]] = None
+    ) -> List:
+        exclude = tuple(exclude or ())
+        return [
+            entity_id
+            for found in self._broadcast(_query_entities, components, exclude)
+            for entity_id in found
+        ]
+
+    def count(self, *components: str, exclude: Optional[Iterable[str]] = None) -> int:
+        return sum(self._broadcast(_query_count, components, tuple(exclude or ())))
+
+    def find(
+        self,
+        component: str,
+        field: str,
+        eq: Any = MISSING,
+        lt: Any = None,
+        le: Any = None,
+        gt: Any = None,
+        ge: Any = None,
+    ) -> List:
+        lookup = dict(lt=lt, le=le, gt=gt, ge=ge)
+        if eq is not MISSING:
+            lookup["eq"] = eq
+
+        return [
+            entity_id
+            for found in self._broadcast("find", component, field, **lookup)
+            for entity_id in found
+        ]
+
+    def map(self, function: Callable[..., Any], *args) -> List[Any]:
+        # calls function(world, *args) in every shard at once, results in shard order
+        return self._broadcast(function, *args)
+
+    def tick(self, dt: float):
+        self._broadcast("tick", dt)
+
+    def shutdown(self, timeout: Optional[float] = 5.0):
+        shards = self._shards
+        self._shards = []
+        self._by_node = {}
+        for shard in shards:
+            shard.stop(timeout)
+
+    def _pick(self) -> Shard:
+        if not self._shards:
+            raise ShardFailed(None)
+
+        return self._shards[next(self._next) % len(self._shards)]
+
+    def _broadcast(self, target: Any, *args, **kwargs) -> List[Any]:
+        return self._gather([(shard, (target, args, kwargs)) for shard in self._shards])
+
+    def _spread(self, count: int, call: Callable[[int], Call]) -> List:
+        shards = len(self._shards)
+        shares = [count // shards + (i < count % shards) for i in range(shards)]
+        calls = [
+            (shard, call(share)) for shard, share in zip(self._shards, shares) if share
+        ]
+
+        return [item for result in self._gather(calls) for item in result]
+
+    def _split(
+        self, entity_ids: Iterable, call: Callable[[List], Call]
+    ) -> Optional[List]:
+        # groups the ids by owner, results come back in the order of the ids
+        entity_ids = list(dict.fromkeys(entity_ids))
+        if not entity_ids:
+            return []
+
+        groups: Dict[Shard, List] = dict()
+        for entity_id in entity_ids:
+            groups.setdefault(self.shard_of(entity_id), []).append(entity_id)
+
+        calls = [(shard, call(ids)) for shard, ids in groups.items()]
+        results = self._gather(calls)
+        if all(result is None for result in results):
+            return None
+
+        by_id = dict()
+        for ids, result in zip(groups.values(), results):
+            by_id.update(zip(ids, result))
+
+        return [by_id[entity_id] for entity_id in entity_ids]
+
+    def _gather(self, calls: List[Tuple[Shard, Call]]) -> List[Any]:
+        # every shard gets its request before any reply is awaited, so shards work
+        # in parallel. Locks are taken in node order to stay deadlock free.
+        shards = sorted({shard for shard, _ in calls}, key=lambda shard: shard.node_id)
+        for shard in shards:
+            shard.lock.acquire()
+
+        try:
+            sent = []
+            try:
+                for shard, (target, args, kwargs) in calls:
+                    shard.send(target, args, kwargs)
+                    sent.append(shard)
+            except ShardFailed:
+                # the shards called so far still answer, read the replies
+                for shard in sent:
+                    try:
+                        shard.receive()
+                    except Exception:
+                        pass
+                raise
+
+            results = []
+            error = None
+            for shard in sent:
+                # drain every reply so the pipes stay in step, then raise, a lost
+                # shard first
+                try:
+                    results.append(shard.receive())
+                except Exception as e:
+                    results.append(None)
+                    if error is None or (
+                        isinstance(e, ShardFailed)
+                        and not isinstance(error, ShardFailed)
+                    ):
+                        error = e
+
+            if error is not None:
+                raise error
+
+            return results
+        finally:
+            for shard in shards:
+                shard.lock.release()
@@ -0,0 +1,608 @@
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from becs import (
+    EVT_ENTITIES_ADDED,
+    EVT_ENTITIES_REMOVED,
+    EVT_ENTITY_ADDED,
+    EVT_ENTITY_REMOVED,
+    EVT_TICK,
+)
+from becs.columnar import numpy
+from becs.compiled import ObservableSlotComponent
+from becs.events import ImmediateListener, WeakListener
+from becs.exceptions import ComponentNotFound, EntityNotFound, InvalidSnapshot
+from becs.snapshot import TYPECODES, Section, _align, _SectionWriter
+
+# The header segment holds the sequence number of the last complete frame, the
+# one being written and the generation of the frame buffers. Frames alternate
+# between two buffers, so the writer never touches the frame readers are on and
+# a reader knows its frame is intact while no newer write reached its buffer.
+MAGIC = b"BSHM"
+VERSION = 2
+HEADER = struct.Struct("<4sIQQQQ")
+FRAME = struct.Struct("<QQQ")
+INITIAL_SIZE = 1 << 20
+ENTITY_EVENTS = (
+    EVT_ENTITY_ADDED,
+    EVT_ENTITIES_ADDED,
+    EVT_ENTITY_REMOVED,
+    EVT_ENTITIES_REMOVED,
+)
+
+# segments published from this process, views on them leave the tracker alone
+_published = set()
+
+
+def _segment_name(name: str, generation: int, buffer: int) -> str:
+    return "{}.{}.{}".format(name, generation, buffer)
+
+
+def _attach(name: str) -> SharedMemory:
+    if name in _published:
+        return SharedMemory(name=name)
+
+    # readers don't own the segment, keep the resource tracker from removing it
+    # when this process exits
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    segment = SharedMemory(name=name)
+    resource_tracker.unregister(segment._name, "shared_memory")
+
+    return segment
+
+
+def _create(name: str, size: int) -> SharedMemory:
+    segment = SharedMemory(name=name, create=True, size=size)
+    _published.add(name)
+
+    return segment
+
+
+def _unlink(segment: SharedMemory):
+    segment.close()
+    segment.unlink()
+    _published.discard(segment.name)
+
+
+def _encode(writer: _SectionWriter, values: List[Any], field_type) -> Tuple:
+    typecode = TYPECODES.get(field_type)
+    if typecode and all(type(value) is field_type for value in values):
+        return ("array", typecode, field_type, writer.add(array(typecode, values)))
+
+    # one pickle per value so a reader only decodes the rows it reads
+    blobs = [pickle.dumps(value, pickle.HIGHEST_PROTOCOL) for value in values]
+    offsets = array("q", accumulate(map(len, blobs), initial=0))
+
+    return ("objects", writer.add(offsets), writer.add(b"".join(blobs) or b"\0"))
+
+
+def _move(section: Section, base: int) -> Section:
+    return section[0] + base, section[1]
+
+
+def _shift(encoded: Tuple, base: int) -> Tuple:
+    # moves the sections of an encoded field
+    return tuple(_move(item, base) if type(item) is tuple else item for item in encoded)
+
+
+class _Table:
+    # An encoded entity or component table. Its sections start at 0, they're
+    # moved to where the table is placed in a frame.
+    version: int
+    rows: int
+    directory: Dict[str, Any]
+    chunks: List[Any]
+    size: int
+
+    def __init__(self, version: int, rows: int, directory, writer: _SectionWriter):
+        self.version = version
+        self.rows = rows
+        self.directory = directory
+        self.chunks = writer.chunks
+        self.size = writer.offset
+
+    def placed(self, base: int) -> Dict[str, Any]:
+        directory = dict(self.directory)
+        directory["entities"] = _move(self.directory["entities"], base)
+        directory["fields"] = {
+            field: _shift(encoded, base)
+            for field, encoded in self.directory["fields"].items()
+        }
+
+        return directory
+
+
+class SharedWorldPublisher:
+    # Copies a world's entity and component tables into shared memory once every
+    # `every` ticks, or when publish is called. Only tables the change ticks show
+    # changed since the last publish are encoded again, and each buffer is only
+    # written the tables it doesn't hold yet.
+    name: str
+    seq: int = 0
+    generation: int = 0
+
+    def __init__(self, world, name: str, every: int = 1):
+        self.name = name
+        self.every = max(1, every)
+        self._world = world
+        self._ticks = 0
+        self._size = INITIAL_SIZE
+        self._header = _create(name, HEADER.size)
+        self._buffers = self._create_buffers(self._size)
+        self._write_header(0)
+
+        # tables by component, None is the entity table
+        self._tables: Dict[Optional[str], _Table] = dict()
+        self._versions = 0
+        self._change_tick = -1
+        self._entities_changed = True
+        # where each table sits in the data of a frame, and how much it may grow
+        self._layout: Dict[Optional[str], Section] = dict()
+        self._data_start = 0
+        # table versions each buffer holds, by table and base
+        self._written: List[Dict[Optional[str], Tuple[int, int]]] = [dict(), dict()]
+
+        self._entities_listener = ImmediateListener(WeakListener(self._on_entities))
+        for event in ENTITY_EVENTS:
+            world.on(event, self._entities_listener)
+
+        self.publish()
+
+        self._listener = WeakListener(self._on_tick)
+        world.on(EVT_TICK, self._listener)
+
+    def publish(self) -> int:
+        world = self._world
+        self._encode_changed()
+        # a sync point like the end of a system batch, changes made from now on
+        # are stamped newer than what this frame holds
+        self._change_tick = world._change_tick
+        world._change_tick += 1
+
+        tables = self._tables
+        layout = self._layout
+        if layout.keys() != tables.keys() or any(
+            table.size > layout[key][1] for key, table in tables.items()
+        ):
+            # tables keep their place while they fit, so unchanged ones aren't
+            # written again
+            offset = 0
+            layout.clear()
+            for key, table in tables.items():
+                layout[key] = (offset, _align(table.size + table.size // 4))
+                offset += layout[key][1]
+
+        entities = tables[None]
+        directory = {
+            "tick": world._tick,
+            "str_ids": world._slots is None,
+            "entities": _move(entities.directory["entities"], layout[None][0]),
+            "components": {
+                name: table.placed(layout[name][0])
+                for name, table in tables.items()
+                if name is not None
+            },
+        }
+        directory_data = pickle.dumps(directory, pickle.HIGHEST_PROTOCOL)
+        if FRAME.size + len(directory_data) > self._data_start:
+            self._data_start = _align(FRAME.size + 2 * len(directory_data))
+
+        size = self._data_start + sum(capacity for _, capacity in layout.values())
+        seq = self.seq + 1
+        if size > self._size:
+            # the frame doesn't fit, move to a new generation of larger buffers
+            while self._size < size:
+                self._size *= 2
+
+            old = self._buffers
+            self.generation += 1
+            self._buffers = self._create_buffers(self._size)
+            self._written = [dict(), dict()]
+            for segment in old:
+                _unlink(segment)
+
+        self._write_header(seq)
+        buffer = self._buffers[seq % 2].buf
+        FRAME.pack_into(buffer, 0, seq, len(directory_data), self._data_start)
+        buffer[FRAME.size : FRAME.size + len(directory_data)] = directory_data
+
+        written = self._written[seq % 2]
+        for key, table in tables.items():
+            offset = self._data_start + layout[key][0]
+            if written.get(key) == (table.version, offset):
+                continue
+
+            written[key] = (table.version, offset)
+            for chunk in table.chunks:
+                end = offset + (
+                    len(chunk) if isinstance(chunk, bytes) else chunk.nbytes
+                )
+                buffer[offset:end] = chunk
+                offset = end
+
+        self.seq = seq
+        self._write_header(seq)
+
+        return seq
+
+    def close(self):
+        self._world.off(EVT_TICK, self._listener)
+        for event in ENTITY_EVENTS:
+            self._world.off(event, self._entities_listener)
+
+        for segment in self._buffers + [self._header]:
+            _unlink(segment)
+
+        self._buffers = []
+
+    def _on_tick(self, tick: int, dt: float):
+        self._ticks += 1
+        if self._ticks % self.every == 0:
+            self.publish()
+
+    def _on_entities(self, *args):
+        self._entities_changed = True
+
+    def _write_header(self, writing: int):
+        HEADER.pack_into(
+            self._header.buf,
+            0,
+            MAGIC,
+            VERSION,
+            self.seq,
+            writing,
+            self.generation,
+            self._size,
+        )
+
+    def _create_buffers(self, size: int) -> List[SharedMemory]:
+        return [
+            _create(_segment_name(self.name, self.generation, buffer), size)
+            for buffer in (0, 1)
+        ]
+
+    def _encode_changed(self):
+        world = self._world
+        tables = self._tables
+        if self._entities_changed or None not in tables:
+            writer = _SectionWriter()
+            ids = array("q", sorted(map(int, world._entities)))
+            directory = {"entities": writer.add(ids), "fields": dict()}
+            tables[None] = self._table(len(ids), directory, writer)
+            self._entities_changed = False
+
+        for name, meta in world._componentMeta.items():
+            store = world._columns.get(name)
+            tagged = world._tags.get(name)
+            if store is not None:
+                rows = len(store.entities)
+            elif tagged is not None:
+                rows = len(tagged)
+            else:
+                rows = len(world.query(name))
+
+            # removals leave no change tick behind, they show in the row count
+            table = tables.get(name)
+            slot_class = world._slot_classes.get(name)
+            changes = world._changes.get(name)
+            if (
+                table is not None
+                and table.rows == rows
+                and (
+                    not changes or next(reversed(changes.values())) <= self._change_tick
+                )
+                and (
+                    slot_class is None
+                    or issubclass(slot_class, ObservableSlotComponent)
+                )
+            ):
+                continue
+
+            tables[name] = self._encode_table(name, meta, rows)
+
+    def _table(self, rows: int, directory, writer: _SectionWriter) -> _Table:
+        self._versions += 1
+        return _Table(self._versions, rows, directory, writer)
+
+    def _encode_table(self, name: str, meta, rows: int) -> _Table:
+        world = self._world
+        writer = _SectionWriter()
+        table = {"meta": meta, "fields": dict()}
+        store = world._columns.get(name)
+        tagged = world._tags.get(name)
+        if store is not None:
+            ids = numpy.fromiter(map(int, store.entities), dtype=numpy.int64)
+            order = numpy.argsort(ids, kind="stable")
+            table["entities"] = writer.add(ids[order])
+            columns = store.columns()
+            for field in meta.fields:
+                column = numpy.ascontiguousarray(columns[field.field_name][order])
+                table["fields"][field.field_name] = (
+                    "array",
+                    memoryview(column).format,
+                    field.field_type,
+                    writer.add(column),
+                )
+        elif tagged is not None:
+            table["entities"] = writer.add(array("q", sorted(map(int, tagged))))
+        else:
+            instances = sorted(
+                (int(entity), instance) for entity, instance in world.query(name)
+            )
+            table["entities"] = writer.add(array("q", [row[0] for row in instances]))
+            for field in meta.fields:
+                key = field.field_name
+                table["fields"][key] = _encode(
+                    writer, [row[1].get(key) for row in instances], field.field_type
+                )
+
+        return self._table(rows, table, writer)
+
+
+class _Frame:
+    # One published frame, read in place from its buffer
+    def __init__(self, buffer: memoryview):
+        self.seq, size, start = FRAME.unpack_from(buffer, 0)
+        self.directory = pickle.loads(buffer[FRAME.size : FRAME.size + size])
+        self.tick = self.directory["tick"]
+        self.str_ids = self.directory["str_ids"]
+        self._data = buffer[start:]
+        self._views: List[memoryview] = []
+        self.entities = self.ints(self.directory["entities"])
+        self.tables = {
+            name: (
+                self.ints(table["entities"]),
+                [(field, self.reader(fmt)) for field, fmt in table["fields"].items()],
+            )
+            for name, table in self.directory["components"].items()
+        }
+
+    def section(self, location: Section) -> memoryview:
+        view = self._data[location[0] : location[0] + location[1]]
+        self._views.append(view)
+
+        return view
+
+    def ints(self, location: Section) -> memoryview:
+        return self.section(location).cast("q")
+
+    def column(self, encoded: Tuple) -> memoryview:
+        start, size = encoded[3]
+        return self._data[start : start + size].cast(encoded[1])
+
+    def reader(self, encoded: Tuple) -> Callable[[int], Any]:
+        if encoded[0] == "objects":
+            offsets = self.ints(encoded[1])
+            blob = self.section(encoded[2])
+            return lambda row: pickle.loads(blob[offsets[row] : offsets[row + 1]])
+
+        column = self.column(encoded)
+        self._views.append(column)
+        if encoded[2] is bool:
+            return lambda row: bool(column[row])
+
+        return column.__getitem__
+
+    def row(self, component: str, key: int) -> Optional[int]:
+        ids = self.tables[component][0]
+        row = bisect_left(ids, key)
+        if row < len(ids) and ids[row] == key:
+            return row
+
+        return None
+
+    def values(self, component: str, row: int) -> Dict[str, Any]:
+        return {field: read(row) for field, read in self.tables[component][1]}
+
+    def release(self):
+        self.tables = {}
+        for view in reversed(self._views):
+            view.release()
+        self._data.release()
+
+
+class SharedWorldView:
+    # Read only view of a world published with World.publish_shared, from any
+    # process. Values are read straight from shared memory, one row at a time,
+    # and every read checks its frame wasn't overwritten meanwhile, moving to the
+    # latest frame and reading again if it was.
+    name: str
+    _frame: Optional[_Frame] = None
+
+    def __init__(self, name: str):
+        self.name = name
+        self._header = _attach(name)
+        magic, version = HEADER.unpack_from(self._header.buf, 0)[:2]
+        if magic != MAGIC or version != VERSION:
+            self._header.close()
+            raise InvalidSnapshot(name)
+
+        self._generation = None
+        self._buffers: List[SharedMemory] = []
+        self.refresh()
+
+    @property
+    def seq(self) -> int:
+        return self._frame.seq
+
+    @property
+    def tick(self) -> int:
+        return self._frame.tick
+
+    def refresh(self) -> bool:
+        # moves to the latest complete frame, False when already there
+        while True:
+            _, _, seq, _, generation, _ = HEADER.unpack_from(self._header.buf, 0)
+            if self._frame is not None and self._frame.seq == seq:
+                return False
+
+            if generation != self._generation:
+                self._release()
+                self._buffers = [
+                    _attach(_segment_name(self.name, generation, buffer))
+                    for buffer in (0, 1)
+                ]
+                self._generation = generation
+
+            try:
+                frame = _Frame(self._buffers[seq % 2].buf)
+            except Exception:
+                # overwritten while decoding its directory
+                continue
+
+            if frame.seq == seq and self._intact(frame):
+                if self._frame is not None:
+                    self._frame.release()
+                self._frame = frame
+                return True
+
+            frame.release()
+
+    def get_component(self, entity_id, component: str) -> Dict[str, Any]:
+        return self._read(self._get_component, entity_id, component)
+
+    def entity_has_component(self, entity_id, component: str) -> bool:
+        return self._read(self._has_component, entity_id, component)
+
+    def list_entity_components(self, entity_id) -> List[str]:
+        return self._read(self._list_components, entity_id)
+
+    def entities(self) -> List:
+        return self._read(
+            lambda frame: [self._entity_id(frame, key) for key in frame.entities]
+        )
+
+    def columns(self, component: str) -> Dict[str, Any]:
+        # zero copy columns of the numeric fields, valid until the next refresh
+        frame = self._frame
+        if component not in frame.tables:
+            raise ComponentNotFound(component)
+
+        fields = frame.directory["components"][component]["fields"]
+        columns = {
+            field: frame.column(encoded)
+            for field, encoded in fields.items()
+            if encoded[0] == "array"
+        }
+        if numpy is not None:
+            columns = {
+                field: numpy.asarray(column) for field, column in columns.items()
+            }
+
+        return columns
+
+    def query(
+        self, *components: str, exclude: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[Any, ...]]:
+        return iter(self._read(self._query, components, tuple(exclude or ())))
+
+    def close(self):
+        self._release()
+        self._header.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read(self, read, *args):
+        while True:
+            frame = self._frame
+            try:
+                result = read(frame, *args)
+            except Exception:
+                if self._intact(frame):
+                    raise
+            else:
+                if self._intact(frame):
+                    return result
+
+            self.refresh()
+
+    def _intact(self, frame: _Frame) -> bool:
+        # the buffer of frame is written again by frame seq + 2
+        _, _, _, writing, generation, _ = HEADER.unpack_from(self._header.buf, 0)
+        return generation != self._generation or writing < frame.seq + 2
+
+    def _entity_id(self, frame: _Frame, key: int):
+        return str(key) if frame.str_ids else key
+
+    def _key(self, frame: _Frame, entity_id) -> int:
+        try:
+            key = int(entity_id)
+        except (TypeError, ValueError):
+            raise EntityNotFound(entity_id)
+
+        row = bisect_left(frame.entities, key)
+        if row == len(frame.entities) or frame.entities[row] != key:
+            raise EntityNotFound(entity_id)
+
+        return key
+
+    def _get_component(
+        self, frame: _Frame, entity_id, component: str
+    ) -> Dict[str, Any]:
+        key = self._key(frame, entity_id)
+        if component not in frame.tables:
+            raise ComponentNotFound(component)
+
+        row = frame.row(component, key)
+        if row is None:
+            raise ComponentNotFound(component)
+
+        return frame.values(component, row)
+
+    def _has_component(self, frame: _Frame, entity_id, component: str) -> bool:
+        key = self._key(frame, entity_id)
+        return component in frame.tables and frame.row(component, key) is not None
+
+    def _list_components(self, frame: _Frame, entity_id) -> List[str]:
+        key = self._key(frame, entity_id)
+        return [name for name in frame.tables if frame.row(name, key) is not None]
+
+    def _query(
+        self, frame: _Frame, components: Tuple[str, ...], exclude: Tuple[str, ...]
+    ) -> List[Tuple[Any, ...]]:
+        for name in components:
+            if name not in frame.tables:
+                raise ComponentNotFound(name)
+
+        exclude = [name for name in exclude if name in frame.tables]
+        if not components:
+            return []
+
+        # walk the smallest table, find the rows of the others by bisecting
+        smallest = min(components, key=lambda name: len(frame.tables[name][0]))
+        rows = []
+        for key in frame.tables[smallest][0]:
+            found = [frame.row(name, key) for name in components]
+            if None in found or any(
+                frame.row(name, key) is not None for name in exclude
+            ):
+                continue
+
+            rows.append(
+                (self._entity_id(frame, key),)
+                + tuple(frame.values(name, row) for name, row in zip(components, found))
+            )
+
+        return rows
+
+    def _release(self):
+        if self._frame is not None:
+            self._frame.release()
+            self._frame = None
+
+        for segment in self._buffers:
+            segment.close()
+
+        self._buffers = []
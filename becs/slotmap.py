@@ -0,0 +1,117 @@
+import threading
+from array import array
+from itertools import count as counter
+from typing import List, Tuple
+
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+GENERATION_MASK = (1 << 32) - 1
+
+
+class SlotMap:
+    # Hands out entity handles made of a dense 32-bit slot index and the slot's
+    # generation, released slots are reused with a bumped generation so stale
+    # handles never match a live entity.
+    _generations: array
+    _free: List[int]
+
+    def __init__(self):
+        self._generations = array("I")
+        self._free = []
+
+    def __len__(self):
+        return len(self._generations) - len(self._free)
+
+    def allocate(self) -> int:
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._generations)
+            if slot > SLOT_MASK:
+                raise OverflowError("Out of entity slots")
+
+            self._generations.append(0)
+
+        return (self._generations[slot] << SLOT_BITS) | slot
+
+    def allocate_many(self, count: int) -> List[int]:
+        reused = min(count, len(self._free))
+        handles = [self.allocate() for _ in range(reused)]
+
+        start = len(self._generations)
+        fresh = count - reused
+        if start + fresh - 1 > SLOT_MASK:
+            raise OverflowError("Out of entity slots")
+
+        # new slots start at generation 0, so their handle is the slot itself
+        self._generations.extend(array("I", bytes(fresh * self._generations.itemsize)))
+        handles.extend(range(start, start + fresh))
+
+        return handles
+
+    def claim(self, handle: int):
+        # takes over a handle allocated elsewhere, used by replicas mirroring a world
+        slot = handle & SLOT_MASK
+        fresh = slot + 1 - len(self._generations)
+        if fresh > 0:
+            start = len(self._generations)
+            self._generations.extend(
+                array("I", bytes(fresh * self._generations.itemsize))
+            )
+            self._free.extend(range(start, slot))
+        else:
+            self._free.remove(slot)
+
+        self._generations[slot] = handle >> SLOT_BITS
+
+    def release(self, handle: int):
+        slot = handle & SLOT_MASK
+        self._generations[slot] = (self._generations[slot] + 1) & GENERATION_MASK
+        self._free.append(slot)
+
+    def state(self) -> Tuple[array, List[int]]:
+        return self._generations, self._free
+
+    def restore(self, generations: array, free: List[int]):
+        self._generations = array("I", generations)
+        self._free = list(free)
+
+    def is_alive(self, handle: int) -> bool:
+        slot = handle & SLOT_MASK
+        return (
+            slot < len(self._generations)
+            and self._generations[slot] == handle >> SLOT_BITS
+        )
+
+
+def slot_of(handle: int) -> int:
+    return handle & SLOT_MASK
+
+
+def generation_of(handle: int) -> int:
+    return handle >> SLOT_BITS
+
+
+class SequenceID:
+    # Local counterpart of AtomicID for ids that never leave the process
+    def __init__(self, start: int = 1):
+        self._counter = counter(start)
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        return next(self._counter)
+
+    def next_batch(self, count: int) -> List[int]:
+        with self._lock:
+            return [next(self._counter) for _ in range(count)]
+
+    def state(self) -> int:
+        with self._lock:
+            value = next(self._counter)
+            self._counter = counter(value)
+
+            return value
+
+    def restore(self, state: int):
+        with self._lock:
+            self._counter = counter(state)
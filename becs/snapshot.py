@@ -0,0 +1,275 @@
+import mmap as _mmap
+import pickle
+import struct
+from array import array
+from typing import Any, Dict, List, Tuple
+from becs.columnar import ColumnRow, numpy
+from becs.compiled import ObservableSlotComponent
+from becs.exceptions import InvalidSnapshot
+from becs.reactive_dict import ReactiveDict
+
+# file layout: preamble, pickled header, then 64 byte aligned sections the header
+# points at with (offset, length) pairs relative to the first section
+MAGIC = b"BECS"
+VERSION = 1
+PREAMBLE = struct.Struct("<4sIQ")
+ALIGNMENT = 64
+
+TYPECODES = {int: "q", float: "d", bool: "b"}
+
+Section = Tuple[int, int]
+
+
+def _align(offset: int) -> int:
+    return offset + (-offset) % ALIGNMENT
+
+
+class _SectionWriter:
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.offset = 0
+
+    def add(self, data) -> Section:
+        data = memoryview(data).cast("B")
+        start = _align(self.offset)
+        if start != self.offset:
+            self.chunks.append(bytes(start - self.offset))
+
+        self.chunks.append(data)
+        self.offset = start + data.nbytes
+
+        return start, data.nbytes
+
+    def add_column(self, values: List[Any], field_type) -> Tuple:
+        typecode = TYPECODES.get(field_type)
+        if typecode and all(type(value) is field_type for value in values):
+            return ("array", typecode, field_type, self.add(array(typecode, values)))
+
+        return ("pickle", self.add(pickle.dumps(values, pickle.HIGHEST_PROTOCOL)))
+
+
+def _ids(values: List[Any]) -> array:
+    return array("q", map(int, values))
+
+
+def save(world, path: str):
+    writer = _SectionWriter()
+
+    # entity -> component -> component id, regrouped per component type
+    owners: Dict[str, List[Any]] = {name: [] for name in world._componentMeta}
+    for entity_id, entity in world._entities.items():
+        for name in entity:
+            owners[name].append(entity_id)
+
+    header = {
+        "node_id": world._node_id,
+        "handles": world._handles,
+        "eid": world._eid.state(),
+        "cid": world._cid.state(),
+        "entities": writer.add(_ids(world._entities)),
+        "components": [],
+        "prefabs": list(world._prefabs.values()),
+        "indexes": [
+            (index.component, index.field, index.kind)
+            for component_indexes in world._indexes.values()
+            for index in component_indexes
+        ],
+    }
+
+    if world._slots is not None:
+        generations, free = world._slots.state()
+        header["slots"] = (writer.add(generations), writer.add(array("I", free)))
+        header["global_ids"] = writer.add(
+            array("q", [id for pair in world._global_ids.items() for id in pair])
+        )
+
+    for name, meta in world._componentMeta.items():
+        store = world._columns.get(name)
+        tagged = world._tags.get(name)
+        if tagged is not None:
+            # tags have members but no instances
+            entity_ids = list(tagged)
+            cids = []
+        else:
+            entity_ids = store.entities if store is not None else owners[name]
+            cids = [world._entities[entity_id][name] for entity_id in entity_ids]
+
+        slot_class = world._slot_classes.get(name)
+        comp = {
+            "meta": meta,
+            "columnar": store is not None,
+            "slots": slot_class is not None,
+            "observable": slot_class is None
+            or issubclass(slot_class, ObservableSlotComponent),
+            "entities": writer.add(_ids(entity_ids)),
+            "ids": writer.add(_ids(cids)),
+            "pool_size": world._pools[name].max_size if name in world._pools else 0,
+        }
+
+        if store is not None:
+            comp["dtype"] = store.dtype
+            comp["data"] = writer.add(store.columns())
+        elif tagged is None:
+            instances = [world._components[cid] for cid in cids]
+            names = [field.field_name for field in meta.fields]
+            comp["fields"] = [
+                writer.add_column(
+                    [instance.get(field.field_name) for instance in instances],
+                    field.field_type,
+                )
+                for field in meta.fields
+            ]
+
+            # keys set on an instance beyond the component fields
+            extras = {}
+            for i, instance in enumerate(instances):
+                if len(instance) != len(names) or any(k not in instance for k in names):
+                    extras[i] = {k: v for k, v in instance.items() if k not in names}
+            comp["extras"] = extras
+
+        header["components"].append(comp)
+
+    header_data = pickle.dumps(header, pickle.HIGHEST_PROTOCOL)
+    data_start = _align(PREAMBLE.size + len(header_data))
+
+    with open(path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header_data)))
+        f.write(header_data)
+        f.write(bytes(data_start - PREAMBLE.size - len(header_data)))
+        for chunk in writer.chunks:
+            f.write(chunk)
+
+
+def load(world_type, path: str, mmap: bool = True):
+    # the header and the columns of non numeric values are pickles, which run code
+    # while loading: only load snapshots from a source you trust
+    with open(path, "rb") as f:
+        preamble = f.read(PREAMBLE.size)
+        if len(preamble) != PREAMBLE.size:
+            raise InvalidSnapshot(path)
+
+        magic, version, header_size = PREAMBLE.unpack(preamble)
+        if magic != MAGIC or version != VERSION:
+            raise InvalidSnapshot(path)
+
+        header = pickle.loads(f.read(header_size))
+
+        if mmap:
+            # copy on write, pages are read on demand and changes stay private
+            buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY)
+        else:
+            f.seek(0)
+            buffer = bytearray(f.read())
+
+    view = memoryview(buffer)
+    data_start = _align(PREAMBLE.size + header_size)
+
+    def section(location: Section) -> memoryview:
+        start = data_start + location[0]
+        return view[start : start + location[1]]
+
+    def ints(location: Section, typecode: str = "q") -> List[int]:
+        return section(location).cast(typecode).tolist()
+
+    def column(encoded: Tuple) -> List[Any]:
+        if encoded[0] == "pickle":
+            return pickle.loads(section(encoded[1]))
+
+        _, typecode, field_type, location = encoded
+        values = section(location).cast(typecode).tolist()
+        if field_type is bool:
+            values = [bool(value) for value in values]
+
+        return values
+
+    world = world_type(header["node_id"], handles=header["handles"])
+    world._eid.restore(header["eid"])
+    world._cid.restore(header["cid"])
+
+    local = world._slots is not None
+    entity_ids = ints(header["entities"])
+    if not local:
+        entity_ids = [str(entity_id) for entity_id in entity_ids]
+
+    for entity_id in entity_ids:
+        world._entities[entity_id] = dict()
+
+    if local:
+        generations, free = header["slots"]
+        world._slots.restore(section(generations).cast("I"), ints(free, "I"))
+        pairs = ints(header["global_ids"])
+        world._global_ids = dict(zip(pairs[::2], pairs[1::2]))
+
+    for comp in header["components"]:
+        meta = comp["meta"]
+        name = meta.component_name
+        world.define_component(
+            meta,
+            columnar=comp["columnar"],
+            slots=comp.get("slots", False),
+            observable=comp.get("observable", True),
+            pool_size=comp.get("pool_size", 0),
+        )
+
+        owners = ints(comp["entities"])
+        cids = ints(comp["ids"])
+        if not local:
+            owners = [str(entity_id) for entity_id in owners]
+            cids = [str(cid) for cid in cids]
+
+        if name in world._tags:
+            # tags only keep their members, snapshots from before tags existed
+            # stored empty instances for the same entities
+            world._tags[name].update(owners)
+            continue
+
+        if comp["columnar"]:
+            store = world._columns[name]
+            if owners:
+                store._data = numpy.frombuffer(section(comp["data"]), comp["dtype"])
+
+            store.entities = owners
+            store._rows = dict(zip(owners, range(len(owners))))
+            instances = [ColumnRow(store, entity_id) for entity_id in owners]
+        else:
+            names = [field.field_name for field in meta.fields]
+            columns = [column(encoded) for encoded in comp["fields"]]
+            slot_class = world._slot_classes.get(name)
+            if slot_class is not None and columns:
+                instances = [slot_class(*row) for row in zip(*columns)]
+            elif slot_class is not None:
+                instances = [slot_class() for _ in owners]
+            elif columns:
+                instances = [ReactiveDict(zip(names, row)) for row in zip(*columns)]
+            else:
+                instances = [ReactiveDict() for _ in owners]
+
+            for i, extras in comp["extras"].items():
+                dict.update(instances[i], extras)
+
+        for entity_id, cid, instance in zip(owners, cids, instances):
+            world._create_component(entity_id, name, instance, cid)
+
+    # file entities into their archetypes in one pass per table
+    tables: Dict[frozenset, List[Any]] = dict()
+    for entity_id, entity in world._entities.items():
+        tables.setdefault(frozenset(entity), []).append(entity_id)
+
+    for signature, ids in tables.items():
+        archetype = world._get_archetype(signature)
+        archetype.extend(
+            ids,
+            {
+                name: [world._components[world._entities[id][name]] for id in ids]
+                for name in signature
+            },
+        )
+        world._entity_archetype.update(dict.fromkeys(ids, archetype))
+
+    world._prefabs = {prefab.name: prefab for prefab in header.get("prefabs", ())}
+
+    # indexes are rebuilt from the loaded components rather than stored
+    for component, field, kind in header.get("indexes", ()):
+        world.create_index(component, field, kind)
+
+    return world
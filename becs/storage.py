@@ -0,0 +1,507 @@
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+)
+from weakref import WeakValueDictionary
+from becs.events import ImmediateListener
+from becs.index import MISSING
+from becs.meta import ComponentMeta
+from becs.reactive_dict import EVT_ITEM_ADDED, EVT_ITEM_CHANGED, EVT_ITEM_REMOVED
+
+DEFAULT_CACHE_SIZE = 10_000
+
+# values that go into a field column as they are
+SCALAR_TYPES = (int, float, str, bool, type(None))
+
+# cid, component, entity_id, stored values -> component instance
+Loader = Callable[[Any, str, Any, Dict[str, Any]], Any]
+
+
+def _quote(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+class StorageBackend(MutableMapping):
+    # Holds a world's component instances by component id in place of the world's
+    # dict. The world binds a loader that rebuilds instances paged in from the
+    # backend, and reports every component type it defines.
+    def bind(self, loader: Loader):
+        raise NotImplementedError()
+
+    def define(
+        self, meta: ComponentMeta, columnar: bool = False, observable: bool = True
+    ):
+        raise NotImplementedError()
+
+    def get_many(self, cids: Iterable) -> List[Any]:
+        return [self[cid] for cid in cids]
+
+    def resident(self) -> List[Any]:
+        # instances currently in memory
+        raise NotImplementedError()
+
+    def find(
+        self,
+        component: str,
+        field: str,
+        eq: Any = MISSING,
+        lt: Any = None,
+        le: Any = None,
+        gt: Any = None,
+        ge: Any = None,
+    ) -> Optional[List]:
+        # entity ids matching the lookup, None when the backend can't answer it
+        return None
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        return dict()
+
+
+class SQLiteStorage(StorageBackend):
+    # Keeps the most recently used component instances in a bounded LRU cache and
+    # everything else in SQLite. Changes are detected from the instances' events:
+    # cached instances are written back when evicted or flushed, an evicted
+    # instance that is still referenced and written to is written through. Such
+    # an instance is also what a later lookup of its id returns, so there is never
+    # more than one live instance per component.
+    #
+    # Every component has a row in the components table with its pickled values,
+    # and a table of its own with one column per field that find pushes lookups
+    # down to, indexing the column on first use. The database is scratch space for
+    # one world, its tables are emptied when bound.
+    cache_size: int
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    writes: int = 0
+    _cache: "OrderedDict[Any, Any]"
+    _live: "WeakValueDictionary[Any, Any]"
+    _dirty: Set[Any]
+    _fields: Dict[str, Tuple[str, ...]]
+    _unobserved: Set[str]
+    _opaque: Set[Tuple[str, str]]
+    _indexed: Set[Tuple[str, str]]
+
+    def __init__(self, path: str = ":memory:", cache_size: int = DEFAULT_CACHE_SIZE):
+        if cache_size < 1:
+            raise ValueError("Cache size must be at least 1: {}".format(cache_size))
+
+        self.path = path
+        self.cache_size = cache_size
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()
+        self._loader = None
+        self._cache = OrderedDict()
+        self._live = WeakValueDictionary()
+        self._changed_listener = ImmediateListener(self._on_changed)
+        self._dirty = set()
+        self._fields = dict()
+        self._unobserved = set()
+        self._opaque = set()
+        self._indexed = set()
+
+    def bind(self, loader: Loader):
+        with self._lock:
+            self._loader = loader
+            db = self._db
+            tables = [
+                row[0]
+                for row in db.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            ]
+            for table in tables:
+                db.execute("DROP TABLE {}".format(_quote(table)))
+
+            db.execute(
+                "CREATE TABLE components (cid PRIMARY KEY, component TEXT NOT NULL, "
+                "entity_id NOT NULL, data BLOB)"
+            )
+            db.commit()
+
+    def define(
+        self, meta: ComponentMeta, columnar: bool = False, observable: bool = True
+    ):
+        name = meta.component_name
+        with self._lock:
+            if not observable:
+                # changes can't be seen, write these back on every eviction
+                self._unobserved.add(name)
+
+            if columnar:
+                # values live in the world's column store, rows only map the ids
+                self._fields[name] = ()
+                return
+
+            fields = tuple(field.field_name for field in meta.fields)
+            self._fields[name] = fields
+            self._db.execute("DROP TABLE IF EXISTS {}".format(_quote("c_" + name)))
+            self._db.execute(
+                "CREATE TABLE {} (cid PRIMARY KEY, entity_id NOT NULL{})".format(
+                    _quote("c_" + name),
+                    "".join(", " + _quote(field) for field in fields),
+                )
+            )
+
+    def __getitem__(self, cid):
+        with self._lock:
+            instance = self._cache.get(cid)
+            if instance is not None:
+                self._cache.move_to_end(cid)
+                self.hits += 1
+                return instance
+
+            self.misses += 1
+            instance = self._revive(cid)
+            if instance is not None:
+                self._evict()
+                return instance
+
+            row = self._db.execute(
+                "SELECT cid, component, entity_id, data FROM components WHERE cid = ?",
+                (cid,),
+            ).fetchone()
+            if row is None:
+                raise KeyError(cid)
+
+            instance = self._page_in(*row)
+            self._evict()
+
+            return instance
+
+    def get_many(self, cids: Iterable) -> List[Any]:
+        cids = list(cids)
+        with self._lock:
+            cache = self._cache
+            missing = [cid for cid in cids if cid not in cache]
+            self.hits += len(cids) - len(missing)
+            self.misses += len(missing)
+            missing = [cid for cid in missing if self._revive(cid) is None]
+
+            loaded = dict()
+            for start in range(0, len(missing), 500):
+                chunk = missing[start : start + 500]
+                rows = self._db.execute(
+                    "SELECT cid, component, entity_id, data FROM components "
+                    "WHERE cid IN ({})".format(", ".join("?" * len(chunk))),
+                    chunk,
+                )
+                for row in rows:
+                    loaded[row[0]] = self._page_in(*row)
+
+            instances = []
+            for cid in cids:
+                instance = loaded.get(cid)
+                if instance is None:
+                    instance = cache.get(cid)
+                    if instance is None:
+                        raise KeyError(cid)
+
+                    cache.move_to_end(cid)
+
+                instances.append(instance)
+
+            self._evict()
+
+            return instances
+
+    def __setitem__(self, cid, instance):
+        with self._lock:
+            self._watch(instance)
+            self._remember(cid, instance)
+            self._cache[cid] = instance
+            self._cache.move_to_end(cid)
+            self._dirty.add(cid)
+            self._evict()
+
+    def __delitem__(self, cid):
+        with self._lock:
+            instance = self._cache.pop(cid, None)
+            if instance is None:
+                instance = self._live.get(cid)
+            if instance is not None:
+                self._unwatch(instance)
+            self._live.pop(cid, None)
+            self._dirty.discard(cid)
+
+            row = self._db.execute(
+                "SELECT component FROM components WHERE cid = ?", (cid,)
+            ).fetchone()
+            if row is None:
+                if instance is None:
+                    raise KeyError(cid)
+                return
+
+            self._db.execute("DELETE FROM components WHERE cid = ?", (cid,))
+            if self._fields.get(row[0]):
+                self._db.execute(
+                    "DELETE FROM {} WHERE cid = ?".format(_quote("c_" + row[0])), (cid,)
+                )
+
+    def __contains__(self, cid):
+        with self._lock:
+            if cid in self._cache:
+                return True
+
+            row = self._db.execute(
+                "SELECT 1 FROM components WHERE cid = ?", (cid,)
+            ).fetchone()
+
+            return row is not None
+
+    def __len__(self):
+        with self._lock:
+            self.flush()
+            return self._db.execute("SELECT COUNT(*) FROM components").fetchone()[0]
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            self.flush()
+            cids = [row[0] for row in self._db.execute("SELECT cid FROM components")]
+
+        return iter(cids)
+
+    def resident(self) -> List[Any]:
+        with self._lock:
+            return list(self._cache.values())
+
+    def find(
+        self,
+        component: str,
+        field: str,
+        eq: Any = MISSING,
+        lt: Any = None,
+        le: Any = None,
+        gt: Any = None,
+        ge: Any = None,
+    ) -> Optional[List]:
+        lookup = [value for value in (lt, le, gt, ge) if value is not None]
+        if eq is not MISSING:
+            lookup.append(eq)
+
+        with self._lock:
+            if (
+                field not in self._fields.get(component, ())
+                or (component, field) in self._opaque
+                or not all(isinstance(value, SCALAR_TYPES) for value in lookup)
+            ):
+                return None
+
+            self.flush()
+            column = _quote(field)
+            table = _quote("c_" + component)
+            if (component, field) not in self._indexed:
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS {} ON {} ({})".format(
+                        _quote("i_{}_{}".format(component, field)), table, column
+                    )
+                )
+                self._indexed.add((component, field))
+
+            where = []
+            params = []
+            if eq is None:
+                where.append("{} IS NULL".format(column))
+            elif eq is not MISSING:
+                where.append("{} = ?".format(column))
+                params.append(eq)
+
+            ranges = [("<", lt), ("<=", le), (">", gt), (">=", ge)]
+            if any(value is not None for _, value in ranges):
+                where.append("{} IS NOT NULL".format(column))
+            for op, value in ranges:
+                if value is not None:
+                    where.append("{} {} ?".format(column, op))
+                    params.append(value)
+
+            sql = "SELECT entity_id FROM {}".format(table)
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+
+            return [row[0] for row in self._db.execute(sql, params)]
+
+    def flush(self):
+        with self._lock:
+            cache = self._cache
+            dirty = [cache[cid] for cid in self._dirty if cid in cache]
+            dirty.extend(
+                instance
+                for cid, instance in cache.items()
+                if instance.tag["component"] in self._unobserved
+                and cid not in self._dirty
+            )
+            self._dirty = set()
+            self._write(dirty)
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._db.close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "writes": self.writes,
+                "resident": len(self._cache),
+                "cache_size": self.cache_size,
+            }
+
+    def _page_in(self, cid, component: str, entity_id, data: Optional[bytes]):
+        values = pickle.loads(data) if data is not None else {}
+        instance = self._loader(cid, component, entity_id, values)
+        self._watch(instance)
+        self._remember(cid, instance)
+        self._cache[cid] = instance
+
+        return instance
+
+    def _remember(self, cid, instance):
+        # unobserved instances can't be weakly referenced, nor report writes
+        if instance.tag["component"] not in self._unobserved:
+            self._live[cid] = instance
+
+    def _revive(self, cid) -> Optional[Any]:
+        # an evicted instance that is still referenced comes back as it is
+        instance = self._live.get(cid)
+        if instance is not None:
+            self._cache[cid] = instance
+
+        return instance
+
+    def _watch(self, instance):
+        # dirty marks can't wait for deferred events to be flushed
+        listener = self._changed_listener
+        instance.on(EVT_ITEM_CHANGED, listener)
+        if isinstance(instance, dict):
+            instance.on(EVT_ITEM_ADDED, listener)
+            instance.on(EVT_ITEM_REMOVED, listener)
+
+    def _unwatch(self, instance):
+        listener = self._changed_listener
+        instance.off(EVT_ITEM_CHANGED, listener)
+        if isinstance(instance, dict):
+            instance.off(EVT_ITEM_ADDED, listener)
+            instance.off(EVT_ITEM_REMOVED, listener)
+
+    def _on_changed(self, instance, *kargs):
+        cid = instance.tag["id"]
+        with self._lock:
+            cached = self._cache.get(cid)
+            if cached is instance:
+                self._dirty.add(cid)
+            elif cached is None:
+                self._write([instance], update=True)
+
+    def _evict(self):
+        cache = self._cache
+        if len(cache) <= self.cache_size:
+            return
+
+        # evict in batches so write-backs share a statement
+        target = self.cache_size - self.cache_size // 8
+        evicted = []
+        while len(cache) > target:
+            cid, instance = cache.popitem(last=False)
+            if cid in self._dirty or instance.tag["component"] in self._unobserved:
+                self._dirty.discard(cid)
+                evicted.append(instance)
+            self.evictions += 1
+
+        self._write(evicted)
+
+    def _write(self, instances: List[Any], update: bool = False):
+        if not instances:
+            return
+
+        rows: Dict[str, List[tuple]] = dict()
+        data = []
+        for instance in instances:
+            tag = instance.tag
+            component = tag["component"]
+            fields = self._fields[component]
+            values = dict(instance.items()) if fields else None
+            data.append(
+                (
+                    pickle.dumps(values) if values is not None else None,
+                    tag["id"],
+                    component,
+                    tag["entity_id"],
+                )
+            )
+
+            if fields:
+                columns = [values.get(field) for field in fields]
+                for field, value in zip(fields, columns):
+                    if not isinstance(value, SCALAR_TYPES):
+                        # the column can't hold it, lookups on the field are scanned
+                        self._opaque.add((component, field))
+                        columns = [
+                            v if isinstance(v, SCALAR_TYPES) else None for v in columns
+                        ]
+                        break
+
+                rows.setdefault(component, []).append(
+                    tuple(columns) + (tag["id"], tag["entity_id"])
+                )
+
+        db = self._db
+        if update:
+            db.executemany(
+                "UPDATE components SET data = ? WHERE cid = ?",
+                [row[:2] for row in data],
+            )
+        else:
+            db.executemany(
+                "INSERT OR REPLACE INTO components (data, cid, component, entity_id) "
+                "VALUES (?, ?, ?, ?)",
+                data,
+            )
+
+        for component, component_rows in rows.items():
+            fields = self._fields[component]
+            table = _quote("c_" + component)
+            if update:
+                sql = "UPDATE {} SET {} WHERE cid = ?".format(
+                    table, ", ".join("{} = ?".format(_quote(f)) for f in fields)
+                )
+                component_rows = [row[:-1] for row in component_rows]
+            else:
+                sql = "INSERT OR REPLACE INTO {} ({}, cid, entity_id) VALUES ({})"
+                sql = sql.format(
+                    table,
+                    ", ".join(_quote(f) for f in fields),
+                    ", ".join("?" * (len(fields) + 2)),
+                )
+            db.executemany(sql, component_rows)
+
+        self.writes += len(instances)
@@ -0,0 +1,190 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional
+from becs.exceptions import CyclicSystemOrder, StageNotFound, SystemNotFound
+
+DEFAULT_STAGES = ("pre-update", "update", "post-update")
+DEFAULT_STAGE = "update"
+
+
+class System:
+    name: str
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+    stage: str = DEFAULT_STAGE
+    after: FrozenSet[str] = frozenset()
+    before: FrozenSet[str] = frozenset()
+    # change tick of the last batch this system ran in, for World.changed_since
+    last_change_tick: int = 0
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        reads: Iterable[str] = (),
+        writes: Iterable[str] = (),
+        stage: Optional[str] = None,
+        after: Iterable[str] = (),
+        before: Iterable[str] = (),
+        run: Optional[Callable[[Any, float], None]] = None,
+    ):
+        if run is None and type(self).run is System.run:
+            raise ValueError(
+                "System needs a run callable or a run method: {}".format(
+                    name or type(self).__name__
+                )
+            )
+
+        self._run = run
+        self.name = name or (run.__name__ if run else type(self).__name__)
+        self.reads = frozenset(reads) | type(self).reads
+        self.writes = frozenset(writes) | type(self).writes
+        self.after = frozenset(after) | type(self).after
+        self.before = frozenset(before) | type(self).before
+
+        if stage:
+            self.stage = stage
+
+    @property
+    def exclusive(self) -> bool:
+        # nothing declared, it may touch anything so it runs on its own
+        return not (self.reads or self.writes)
+
+    def conflicts(self, other: "System") -> bool:
+        if self.exclusive or other.exclusive:
+            return True
+
+        return bool(
+            self.writes & (other.reads | other.writes) or other.writes & self.reads
+        )
+
+    def run(self, world, dt: float):
+        self._run(world, dt)
+
+    def __repr__(self):
+        return "System({!r})".format(self.name)
+
+
+class Scheduler:
+    stages: List[str]
+    _systems: Dict[str, System]
+    _plan: Optional[List[List[List[System]]]]
+
+    def __init__(
+        self,
+        stages: Iterable[str] = DEFAULT_STAGES,
+        max_workers: Optional[int] = None,
+        after_batch: Optional[Callable[[], int]] = None,
+    ):
+        self.stages = list(stages)
+        self.max_workers = max_workers
+        self.after_batch = after_batch
+        self._systems = dict()
+        self._plan = None
+        self._executor = None
+
+    def add(self, system: System):
+        if system.stage not in self.stages:
+            raise StageNotFound(system.stage)
+
+        self._systems[system.name] = system
+        self._plan = None
+
+    def remove(self, name: str):
+        if name not in self._systems:
+            raise SystemNotFound(name)
+
+        del self._systems[name]
+        self._plan = None
+
+    def get(self, name: str) -> System:
+        if name not in self._systems:
+            raise SystemNotFound(name)
+
+        return self._systems[name]
+
+    def systems(self) -> List[System]:
+        return list(self._systems.values())
+
+    def plan(self) -> List[List[List[System]]]:
+        # per stage, batches of systems that can run at the same time
+        if self._plan is None:
+            self._plan = [self._plan_stage(stage) for stage in self.stages]
+
+        return self._plan
+
+    def _plan_stage(self, stage: str) -> List[List[System]]:
+        systems = [s for s in self._systems.values() if s.stage == stage]
+        names = {s.name for s in systems}
+
+        deps = {s.name: {name for name in s.after if name in names} for s in systems}
+        for s in systems:
+            for name in s.before:
+                if name in names:
+                    deps[name].add(s.name)
+
+        # topological order, ties broken by registration order
+        ordered: List[System] = []
+        done = set()
+        pending = list(systems)
+        while pending:
+            ready = [s for s in pending if deps[s.name] <= done]
+            if not ready:
+                raise CyclicSystemOrder([s.name for s in pending])
+
+            for s in ready:
+                ordered.append(s)
+                done.add(s.name)
+                pending.remove(s)
+
+        # a system runs after its dependencies and after every earlier system it
+        # conflicts with, otherwise it joins the earliest batch
+        batches: List[List[System]] = []
+        batch_of: Dict[str, int] = dict()
+        for i, s in enumerate(ordered):
+            index = max((batch_of[name] + 1 for name in deps[s.name]), default=0)
+            for other in ordered[:i]:
+                if s.conflicts(other):
+                    index = max(index, batch_of[other.name] + 1)
+
+            if index == len(batches):
+                batches.append([])
+
+            batches[index].append(s)
+            batch_of[s.name] = index
+
+        return batches
+
+    def run(self, world, dt: float):
+        for batches in self.plan():
+            for batch in batches:
+                self._run_batch(batch, world, dt)
+
+                if self.after_batch is not None:
+                    tick = self.after_batch()
+                    for system in batch:
+                        system.last_change_tick = tick
+
+    def _run_batch(self, batch: List[System], world, dt: float):
+        if len(batch) == 1 or self.max_workers == 1:
+            for system in batch:
+                self._run_system(system, world, dt)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="becs-system"
+            )
+
+        futures = [
+            self._executor.submit(self._run_system, system, world, dt)
+            for system in batch
+        ]
+        for future in futures:
+            future.result()
+
+    def _run_system(self, system: System, world, dt: float):
+        system.run(world, dt)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,108 @@
+import argparse
+import importlib
+import json
+import pkgutil
+import platform
+import sys
+from typing import Dict, List
+
+import benchmarks
+
+# metrics named *_per_second are better when higher, every other metric (seconds,
+# nanoseconds, bytes) is better when lower
+HIGHER_IS_BETTER = "_per_second"
+DEFAULT_THRESHOLD = 0.1
+
+
+def discover(pattern: str = "") -> List:
+    found = []
+    for module_info in pkgutil.iter_modules(benchmarks.__path__):
+        if not module_info.name.startswith("bench_"):
+            continue
+
+        module = importlib.import_module("benchmarks." + module_info.name)
+        for name in sorted(vars(module)):
+            bench = getattr(module, name)
+            full_name = "{}.{}".format(module_info.name[len("bench_") :], name)
+            if name.startswith("bench_") and callable(bench) and pattern in full_name:
+                found.append((full_name, bench))
+
+    return found
+
+
+def run(pattern: str = "") -> Dict:
+    results = {}
+    for name, bench in discover(pattern):
+        print("running {}".format(name), file=sys.stderr)
+        results[name] = bench()
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    regressions = []
+    for name, metrics in current["results"].items():
+        base_metrics = baseline["results"].get(name, {})
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if not base:
+                continue
+
+            change = (value - base) / base
+            if not metric.endswith(HIGHER_IS_BETTER):
+                change = -change
+
+            line = "{}.{}: {:.6g} -> {:.6g} ({:+.1%})".format(
+                name, metric, base, value, change
+            )
+            print(line)
+            if change < -threshold:
+                regressions.append(line)
+
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-k", dest="pattern", default="", help="only run matching benchmarks"
+    )
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("-c", "--compare", help="baseline JSON to compare against")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    current = run(args.pattern)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    elif not args.compare:
+        json.dump(current, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(current, json.load(f), args.threshold)
+
+        if regressions:
+            print("\n{} regression(s):".format(len(regressions)))
+            for line in regressions:
+                print("  " + line)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
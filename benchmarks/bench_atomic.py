@@ -0,0 +1,29 @@
+from timeit import default_timer as timer
+from becs.atomic import AtomicID
+
+
+def bench_next(count: int = 200_000):
+    atid = AtomicID(1)
+
+    start = timer()
+    for _ in range(count):
+        atid.next()
+    elapsed = timer() - start
+
+    return {"ids_per_second": count / elapsed}
+
+
+def bench_next_batch(count: int = 200_000, batch: int = 10_000):
+    atid = AtomicID(1, max_drift=1000)
+
+    start = timer()
+    for _ in range(count // batch):
+        atid.next_batch(batch)
+    elapsed = timer() - start
+
+    return {"ids_per_second": count / elapsed}
+
+
+if __name__ == "__main__":
+    for bench in (bench_next, bench_next_batch):
+        print(bench.__name__, bench())
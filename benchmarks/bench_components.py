@@ -0,0 +1,96 @@
+import gc
+import tracemalloc
+from timeit import default_timer as timer
+from becs.meta import ComponentMeta, FieldMeta
+from becs.reactive_dict import EVT_ITEM_CHANGED
+
+POSITION = ComponentMeta(
+    "Position",
+    "position",
+    [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+)
+
+
+def _noop(*kargs):
+    pass
+
+
+def _kinds():
+    observable = POSITION.compile()
+    plain = POSITION.compile(observable=False)
+
+    return {
+        "reactive_dict": POSITION.instantiate,
+        "slots": observable,
+        "slots_unobserved": plain,
+    }
+
+
+def _instance_bytes(factory, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [factory() for _ in range(count)]
+        for instance in instances:
+            # the world listens to every instance and tags it
+            instance.on(EVT_ITEM_CHANGED, _noop)
+            instance.tag = {"id": 1, "entity_id": 1, "component": "position"}
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    return used / count
+
+
+def bench_memory(count: int = 100_000):
+    return {
+        "{}_bytes".format(kind): _instance_bytes(factory, count)
+        for kind, factory in _kinds().items()
+    }
+
+
+def bench_fields(count: int = 10_000, rounds: int = 20):
+    results = {}
+    for kind, factory in _kinds().items():
+        instances = [factory() for _ in range(count)]
+        for instance in instances:
+            instance.on(EVT_ITEM_CHANGED, _noop)
+
+        start = timer()
+        for _ in range(rounds):
+            for instance in instances:
+                instance["x"]
+        read = timer() - start
+
+        start = timer()
+        for i in range(rounds):
+            for instance in instances:
+                instance["x"] = float(i)
+        write = timer() - start
+
+        results["{}_reads_per_second".format(kind)] = count * rounds / read
+        results["{}_writes_per_second".format(kind)] = count * rounds / write
+
+        if kind != "reactive_dict":
+            start = timer()
+            for _ in range(rounds):
+                for instance in instances:
+                    instance.x
+            read = timer() - start
+
+            start = timer()
+            for i in range(rounds):
+                for instance in instances:
+                    instance.x = float(i)
+            write = timer() - start
+
+            results["{}_attr_reads_per_second".format(kind)] = count * rounds / read
+            results["{}_attr_writes_per_second".format(kind)] = count * rounds / write
+
+    return results
+
+
+if __name__ == "__main__":
+    for bench in (bench_memory, bench_fields):
+        print(bench.__name__, bench())
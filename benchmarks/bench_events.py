@@ -0,0 +1,86 @@
+import asyncio
+from timeit import default_timer as timer
+from typing import Callable, Dict, List
+from becs.events import EventDispatcherMixin
+
+
+class LegacyDispatcher:
+    # the dispatcher as it was before the fast paths, kept for comparison
+    def on(self, event: str, callback: Callable):
+        if not getattr(self, "_LegacyDispatcher__events", None):
+            self.__events: Dict[str, List[Callable]] = dict()
+
+        if event not in self.__events:
+            self.__events[event] = []
+
+        self.__events[event].append(callback)
+
+    def fire(self, event, *kargs, **kwargs):
+        if not getattr(self, "_LegacyDispatcher__events", None):
+            self.__events = dict()
+
+        if event in self.__events:
+            for callback in self.__events[event]:
+                callback(*kargs, **kwargs)
+
+
+def _noop(*kargs):
+    pass
+
+
+def _fire_cost(dispatcher_type, listeners: int, count: int) -> float:
+    dispatcher = dispatcher_type()
+    for _ in range(listeners):
+        dispatcher.on("test", _noop)
+
+    fire = dispatcher.fire
+    start = timer()
+    for _ in range(count):
+        fire("test", 1, 2)
+    elapsed = timer() - start
+
+    return elapsed / count * 1e9
+
+
+def bench_fire(count: int = 200_000):
+    results = {}
+    for listeners in (0, 1, 10):
+        results["legacy_ns_{}".format(listeners)] = _fire_cost(
+            LegacyDispatcher, listeners, count
+        )
+        results["ns_{}".format(listeners)] = _fire_cost(
+            EventDispatcherMixin, listeners, count
+        )
+
+    return results
+
+
+async def _async_noop(*kargs):
+    pass
+
+
+def bench_async_fire(count: int = 20_000):
+    # what firing costs the caller with a coroutine listener, which is only scheduled
+    async def fire_all():
+        dispatcher = EventDispatcherMixin()
+        dispatcher.on("test", _async_noop)
+        fire = dispatcher.fire
+        start = timer()
+        for _ in range(count):
+            fire("test", 1, 2)
+        elapsed = timer() - start
+
+        start = timer()
+        await asyncio.sleep(0)
+        drain = timer() - start
+
+        return elapsed, drain
+
+    elapsed, drain = asyncio.run(fire_all())
+
+    return {"fire_ns": elapsed / count * 1e9, "listener_ns": drain / count * 1e9}
+
+
+if __name__ == "__main__":
+    print(bench_fire.__name__, bench_fire())
+    print(bench_async_fire.__name__, bench_async_fire())
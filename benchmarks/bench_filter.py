@@ -0,0 +1,70 @@
+from timeit import default_timer as timer
+from becs import World
+from becs.columnar import numpy
+from becs.filter import F
+from becs.meta import ComponentMeta, FieldMeta
+
+
+def _world(count: int, columnar: bool) -> World:
+    w = World()
+    w.define_component(
+        ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)]),
+        columnar=columnar,
+    )
+    w.define_component(
+        ComponentMeta("Health", "health", [FieldMeta("HP", "hp", int, 100)]),
+        columnar=columnar,
+    )
+    ids = w.add_entities(count, ["position", "health"])
+    if columnar:
+        w.columns("position")["x"] = numpy.arange(count) % 200
+        w.columns("health")["hp"] = numpy.arange(count) % 100
+    else:
+        for i, entity_id in enumerate(ids):
+            w.get_component(entity_id, "position")["x"] = float(i % 200)
+            w.get_component(entity_id, "health")["hp"] = i % 100
+
+    return w
+
+
+def _filter_seconds(w: World) -> float:
+    selection = w.select("health", "position").where(
+        F("health.hp") < 20, F("position.x") > 100
+    )
+    start = timer()
+    selection.ids()
+    return timer() - start
+
+
+def _loop_seconds(w: World) -> float:
+    # what the same filter costs written as a query loop
+    start = timer()
+    [
+        entity_id
+        for entity_id, health, position in w.query("health", "position")
+        if health["hp"] < 20 and position["x"] > 100
+    ]
+    return timer() - start
+
+
+def bench_filter(count: int = 100_000):
+    results = {
+        "compiled_seconds": _filter_seconds(_world(count, False)),
+        "loop_seconds": _loop_seconds(_world(count, False)),
+    }
+    if numpy is not None:
+        results["vectorized_seconds"] = _filter_seconds(_world(count, True))
+
+    return results
+
+
+def bench_filter_columnar(count: int = 1_000_000):
+    if numpy is None:
+        return {}
+
+    return {"vectorized_seconds": _filter_seconds(_world(count, True))}
+
+
+if __name__ == "__main__":
+    print(bench_filter.__name__, bench_filter())
+    print(bench_filter_columnar.__name__, bench_filter_columnar())
@@ -0,0 +1,61 @@
+import gc
+from timeit import default_timer as timer
+from typing import Dict
+from becs import World
+from becs.meta import ComponentMeta, FieldMeta
+
+
+def _churn(pool_size: int, live: int, rounds: int) -> Dict[str, float]:
+    w = World()
+    for name in ("position", "velocity"):
+        w.define_component(
+            ComponentMeta(
+                name,
+                name,
+                [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+            ),
+            pool_size=pool_size,
+        )
+
+    # projectiles: a tenth of them expire and respawn every round
+    ids = w.add_entities(live, ["position", "velocity"])
+    batch = live // 10
+
+    pauses = []
+    started = [0.0]
+
+    def on_gc(phase, info):
+        if phase == "start":
+            started[0] = timer()
+        else:
+            pauses.append(timer() - started[0])
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    try:
+        start = timer()
+        for _ in range(rounds):
+            w.remove_entities(ids[:batch])
+            ids = ids[batch:] + w.add_entities(batch, ["position", "velocity"])
+        elapsed = timer() - start
+    finally:
+        gc.callbacks.remove(on_gc)
+
+    return {
+        "entities_per_second": batch * rounds / elapsed,
+        "gc_collections": len(pauses),
+        "gc_pause_seconds": sum(pauses),
+    }
+
+
+def bench_churn(live: int = 10_000, rounds: int = 200):
+    results = {}
+    for label, pool_size in (("unpooled", 0), ("pooled", live)):
+        for metric, value in _churn(pool_size, live, rounds).items():
+            results["{}_{}".format(label, metric)] = value
+
+    return results
+
+
+if __name__ == "__main__":
+    print(bench_churn.__name__, bench_churn())
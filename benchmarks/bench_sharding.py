@@ -0,0 +1,41 @@
+import os
+from timeit import default_timer as timer
+from becs.meta import ComponentMeta, FieldMeta
+from becs.sharding import ShardedWorld
+from becs.system import System
+
+
+def move(world, dt):
+    for entity_id, position, velocity in world.query("position", "velocity"):
+        position["x"] += velocity["x"] * dt
+
+
+def _entities_per_second(shards: int, count: int, ticks: int) -> float:
+    with ShardedWorld(shards=shards) as w:
+        for name in ("position", "velocity"):
+            w.define_component(
+                ComponentMeta(name, name, [FieldMeta("X", "x", float, 1.0)])
+            )
+        w.add_entities(count, ["position", "velocity"])
+        w.add_system(System("move", reads=["velocity"], writes=["position"], run=move))
+
+        start = timer()
+        for _ in range(ticks):
+            w.tick(1 / 60)
+        elapsed = timer() - start
+
+    return count * ticks / elapsed
+
+
+def bench_sharded_tick(count: int = 100_000, ticks: int = 10):
+    # one shard per core, scaling shows as the ratio between the two
+    return {
+        "one_shard_entities_per_second": _entities_per_second(1, count, ticks),
+        "all_shards_entities_per_second": _entities_per_second(
+            os.cpu_count() or 1, count, ticks
+        ),
+    }
+
+
+if __name__ == "__main__":
+    print(bench_sharded_tick())
@@ -0,0 +1,90 @@
+import os
+import pickle
+from timeit import default_timer as timer
+from becs import World
+from becs.columnar import numpy
+from becs.meta import ComponentMeta, FieldMeta
+from becs.shared import SharedWorldView
+
+
+def _world(count: int, columnar: bool) -> World:
+    w = World()
+    w.define_component(
+        ComponentMeta(
+            "Position",
+            "position",
+            [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+        ),
+        columnar=columnar,
+    )
+    w.define_component(
+        ComponentMeta(
+            "Unit",
+            "unit",
+            [FieldMeta("Name", "name", str, "unit"), FieldMeta("HP", "hp", int, 10)],
+        )
+    )
+    w.add_entities(count, ["position", "unit"])
+
+    return w
+
+
+def bench_shared(
+    count: int = 100_000, reads: int = 10_000, columnar: bool = numpy is not None
+):
+    w = _world(count, columnar)
+    name = "becs-bench-{}".format(os.getpid())
+    ids = list(w._entities)[:reads]
+
+    publisher = w.publish_shared(name)
+    try:
+        w.mark_changed("position")
+        w.mark_changed("unit")
+        start = timer()
+        publisher.publish()
+        publish = timer() - start
+
+        # nothing changed, no table is encoded or copied again
+        start = timer()
+        publisher.publish()
+        publish_unchanged = timer() - start
+
+        start = timer()
+        view = SharedWorldView(name)
+        attach = timer() - start
+        try:
+            start = timer()
+            for entity_id in ids:
+                view.get_component(entity_id, "position")
+            get_component = timer() - start
+
+            start = timer()
+            for _ in view.query("position", "unit"):
+                pass
+            query = timer() - start
+        finally:
+            view.close()
+    finally:
+        publisher.close()
+
+    # what a reader has to do without shared memory: unpickle the whole state
+    data = pickle.dumps(
+        {cid: dict(comp.items()) for cid, comp in w._components.items()},
+        pickle.HIGHEST_PROTOCOL,
+    )
+    start = timer()
+    pickle.loads(data)
+    unpickle = timer() - start
+
+    return {
+        "publish_seconds": publish,
+        "publish_unchanged_seconds": publish_unchanged,
+        "attach_seconds": attach,
+        "get_component_nanoseconds": get_component / len(ids) * 1e9,
+        "query_seconds": query,
+        "unpickle_seconds": unpickle,
+    }
+
+
+if __name__ == "__main__":
+    print(bench_shared.__name__, bench_shared())
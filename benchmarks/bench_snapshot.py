@@ -0,0 +1,84 @@
+import os
+import pickle
+import tempfile
+from timeit import default_timer as timer
+from becs import World
+from becs.columnar import numpy
+from becs.meta import ComponentMeta, FieldMeta
+
+
+def _world(count: int, columnar: bool) -> World:
+    w = World()
+    w.define_component(
+        ComponentMeta(
+            "Position",
+            "position",
+            [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+        ),
+        columnar=columnar,
+    )
+    w.define_component(
+        ComponentMeta(
+            "Unit",
+            "unit",
+            [FieldMeta("Name", "name", str, "unit"), FieldMeta("HP", "hp", int, 10)],
+        )
+    )
+    w.add_entities(count, ["position", "unit"])
+
+    return w
+
+
+def _pickle_state(w: World):
+    # what a pickle based save has to copy: every record and component dict
+    return (
+        w._entities,
+        {cid: dict(comp.items()) for cid, comp in w._components.items()},
+    )
+
+
+def bench_snapshot(count: int = 100_000, columnar: bool = numpy is not None):
+    w = _world(count, columnar)
+    fd, path = tempfile.mkstemp(suffix=".becs")
+    os.close(fd)
+
+    try:
+        start = timer()
+        w.save(path)
+        save = timer() - start
+        size = os.path.getsize(path)
+
+        start = timer()
+        World.load(path, mmap=True)
+        load_mmap = timer() - start
+
+        start = timer()
+        World.load(path, mmap=False)
+        load = timer() - start
+
+        start = timer()
+        with open(path, "wb") as f:
+            pickle.dump(_pickle_state(w), f, pickle.HIGHEST_PROTOCOL)
+        pickle_save = timer() - start
+        pickle_size = os.path.getsize(path)
+
+        start = timer()
+        with open(path, "rb") as f:
+            pickle.load(f)
+        pickle_load = timer() - start
+    finally:
+        os.remove(path)
+
+    return {
+        "save_seconds": save,
+        "load_seconds": load,
+        "load_mmap_seconds": load_mmap,
+        "bytes": size,
+        "pickle_save_seconds": pickle_save,
+        "pickle_load_seconds": pickle_load,
+        "pickle_bytes": pickle_size,
+    }
+
+
+if __name__ == "__main__":
+    print(bench_snapshot.__name__, bench_snapshot())
@@ -0,0 +1,252 @@
+import gc
+import tracemalloc
+from timeit import default_timer as timer
+from becs import World
+from becs.meta import ComponentMeta, FieldMeta
+from becs.storage import SQLiteStorage
+
+
+def _world(handles: str = "global", storage=None) -> World:
+    w = World(handles=handles, storage=storage)
+    w.define_component(
+        ComponentMeta(
+            "Position",
+            "position",
+            [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+        )
+    )
+    w.define_component(
+        ComponentMeta("Velocity", "velocity", [FieldMeta("X", "x", float, 1.0)])
+    )
+
+    return w
+
+
+def bench_churn(count: int = 20_000):
+    results = {}
+    for handles in ("global", "local"):
+        w = _world(handles)
+
+        start = timer()
+        ids = [w.add_entity("position", "velocity") for _ in range(count)]
+        for entity_id in ids:
+            w.remove_entity(entity_id)
+        elapsed = timer() - start
+
+        start = timer()
+        w.remove_entities(w.add_entities(count, ["position", "velocity"]))
+        batch = timer() - start
+
+        results["{}_entities_per_second".format(handles)] = count / elapsed
+        results["{}_batch_entities_per_second".format(handles)] = count / batch
+
+    return results
+
+
+def bench_spawn(count: int = 10_000):
+    w = _world()
+    w.define_prefab("unit", {"position": {"y": 5.0}, "velocity": {"x": 2.0}})
+
+    start = timer()
+    for _ in range(count):
+        entity_id = w.add_entity("position", "velocity")
+        w.get_component(entity_id, "position")["y"] = 5.0
+        w.get_component(entity_id, "velocity")["x"] = 2.0
+    one_by_one = timer() - start
+
+    start = timer()
+    w.spawn("unit", count)
+    prefab = timer() - start
+
+    return {
+        "entities_per_second": count / one_by_one,
+        "prefab_entities_per_second": count / prefab,
+    }
+
+
+def bench_get_component(count: int = 10_000, rounds: int = 20):
+    w = _world()
+    ids = w.add_entities(count, ["position"])
+    get_component = w.get_component
+
+    start = timer()
+    for _ in range(rounds):
+        for entity_id in ids:
+            get_component(entity_id, "position")
+    elapsed = timer() - start
+
+    return {"lookups_per_second": count * rounds / elapsed}
+
+
+def bench_fields(count: int = 10_000, rounds: int = 20):
+    w = _world()
+    components = [
+        w.get_component(id, "position") for id in w.add_entities(count, ["position"])
+    ]
+
+    start = timer()
+    for _ in range(rounds):
+        for position in components:
+            position["x"]
+    read = timer() - start
+
+    start = timer()
+    for i in range(rounds):
+        for position in components:
+            position["x"] = float(i)
+    write = timer() - start
+
+    return {
+        "reads_per_second": count * rounds / read,
+        "writes_per_second": count * rounds / write,
+    }
+
+
+def bench_query(count: int = 100_000, rounds: int = 10):
+    w = _world()
+    w.add_entities(count, ["position", "velocity"])
+    w.add_entities(count, ["position"])
+    query = w.query("position", "velocity")
+
+    start = timer()
+    for _ in range(rounds):
+        for entity_id, position, velocity in query:
+            pass
+    elapsed = timer() - start
+
+    return {"rows_per_second": count * rounds / elapsed}
+
+
+def bench_find(count: int = 100_000, lookups: int = 100):
+    w = _world()
+    ids = w.add_entities(count, ["position"])
+    for i, entity_id in enumerate(ids):
+        w.get_component(entity_id, "position")["x"] = float(i)
+
+    start = timer()
+    for i in range(lookups // 10):
+        w.find("position", "x", lt=float(i))
+    scan = timer() - start
+
+    w.create_index("position", "x", "sorted")
+    start = timer()
+    for i in range(lookups):
+        w.find("position", "x", lt=float(i))
+    indexed = timer() - start
+
+    return {
+        "scan_lookups_per_second": lookups // 10 / scan,
+        "indexed_lookups_per_second": lookups / indexed,
+    }
+
+
+def bench_tags(count: int = 100_000):
+    w = _world()
+    w.define_component(ComponentMeta("Dead", "dead", []))
+    ids = w.add_entities(count, ["position"])
+
+    start = timer()
+    w.add_components(ids, "dead")
+    added = timer() - start
+
+    start = timer()
+    w.remove_components(ids, "dead")
+    removed = timer() - start
+
+    return {
+        "add_entities_per_second": count / added,
+        "remove_entities_per_second": count / removed,
+    }
+
+
+def bench_storage(count: int = 100_000, cache_size: int = 10_000):
+    storage = SQLiteStorage(cache_size=cache_size)
+    w = _world(storage=storage)
+
+    start = timer()
+    ids = w.add_entities(count, ["position"])
+    added = timer() - start
+
+    start = timer()
+    for entity_id in ids:
+        w.get_component(entity_id, "position")
+    cold = timer() - start
+
+    hot = ids[-cache_size // 2 :]
+    start = timer()
+    for entity_id in hot:
+        w.get_component(entity_id, "position")
+    warm = timer() - start
+
+    start = timer()
+    for i in range(10):
+        w.find("position", "x", gt=float(i))
+    pushed_down = timer() - start
+    storage.close()
+
+    return {
+        "add_entities_per_second": count / added,
+        "cold_lookups_per_second": count / cold,
+        "cached_lookups_per_second": len(hot) / warm,
+        "find_lookups_per_second": 10 / pushed_down,
+    }
+
+
+def bench_history(count: int = 100_000, changed: int = 1_000, ticks: int = 60):
+    w = _world()
+    w.enable_history(ticks)
+    ids = w.add_entities(count, ["position"])
+    w.tick(1 / 60)
+    components = [w.get_component(entity_id, "position") for entity_id in ids[:changed]]
+
+    start = timer()
+    for i in range(ticks):
+        for position in components:
+            position["x"] = float(i)
+        w.tick(1 / 60)
+    recorded = timer() - start
+
+    start = timer()
+    w.rollback(ticks)
+    rolled_back = timer() - start
+
+    return {
+        "recorded_changes_per_second": changed * ticks / recorded,
+        "rolled_back_changes_per_second": changed * ticks / rolled_back,
+    }
+
+
+def _entity_bytes(count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        w = _world()
+        before = tracemalloc.get_traced_memory()[0]
+        w.add_entities(count, ["position", "velocity"])
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    return used / count
+
+
+def bench_memory(sizes=(10_000, 100_000, 1_000_000)):
+    return {
+        "bytes_per_entity_{}".format(count): _entity_bytes(count) for count in sizes
+    }
+
+
+if __name__ == "__main__":
+    for bench in (
+        bench_churn,
+        bench_spawn,
+        bench_get_component,
+        bench_fields,
+        bench_query,
+        bench_find,
+        bench_tags,
+        bench_storage,
+        bench_history,
+        bench_memory,
+    ):
+        print(bench.__name__, bench())
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+from becs import EVT_COMPONENT_ADDED, EVT_ENTITY_ADDED, World
+from becs.aio import EVT_OVERRUN, AsyncWorldRunner
+from becs.events import EventDispatcherMixin
+from becs.exceptions import NoEventLoop
+from becs.meta import ComponentMeta, FieldMeta
+from becs.system import System
+
+
+class AsyncWorldTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.w = World()
+        self.w.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)])
+        )
+
+    async def test_coroutine_listeners(self):
+        added = []
+        done = asyncio.Event()
+
+        async def on_added(entity_id, components):
+            await asyncio.sleep(0)
+            added.append(entity_id)
+            done.set()
+
+        self.w.on(EVT_ENTITY_ADDED, on_added)
+        e1 = self.w.add_entity("position")
+        # scheduled, not run inside add_entity
+        self.assertEqual(added, [])
+
+        await asyncio.wait_for(done.wait(), 1)
+        self.assertEqual(added, [e1])
+
+        self.w.off(EVT_ENTITY_ADDED, on_added)
+        self.w.add_entity()
+        await asyncio.sleep(0)
+        self.assertEqual(added, [e1])
+
+    async def test_listener_from_thread(self):
+        done = asyncio.Event()
+
+        async def on_added(entity_id, components):
+            done.set()
+
+        self.w.on(EVT_ENTITY_ADDED, on_added)
+        thread = threading.Thread(target=self.w.add_entity)
+        thread.start()
+        thread.join()
+
+        await asyncio.wait_for(done.wait(), 1)
+
+    async def test_wait_for(self):
+        e1 = self.w.add_entity()
+        loop = asyncio.get_running_loop()
+        loop.call_soon(self.w.add_entity)
+        loop.call_soon(self.w.add_component, e1, "position")
+
+        entity_id, cid, component = await self.w.wait_for(
+            EVT_COMPONENT_ADDED, lambda entity_id, cid, component: entity_id == e1, 1
+        )
+        self.assertEqual((entity_id, component), (e1, "position"))
+        self.assertEqual(self.w._EventDispatcherMixin__events[EVT_COMPONENT_ADDED], [])
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.w.wait_for(EVT_ENTITY_ADDED, timeout=0.01)
+
+    async def test_runner(self):
+        ticks = []
+        self.w.add_system(System("count", run=lambda world, dt: ticks.append(dt)))
+        runner = AsyncWorldRunner(self.w, rate=200)
+
+        await runner.run(ticks=5)
+        self.assertEqual(ticks, [1 / 200] * 5)
+        self.assertEqual(self.w._tick, 5)
+
+        runner.start()
+        await self.w.wait_for("tick", lambda tick, dt: tick >= 8, 1)
+        await runner.stop()
+        self.assertFalse(runner.running)
+        self.assertEqual(runner.ticks, self.w._tick)
+
+    async def test_stop_before_first_tick(self):
+        runner = AsyncWorldRunner(self.w, rate=200)
+
+        async def start_stop():
+            runner.start()
+            await runner.stop()
+
+        await asyncio.wait_for(start_stop(), 1)
+        self.assertFalse(runner.running)
+        self.assertEqual(runner.ticks, 0)
+
+        # a stopped runner starts again
+        runner.start()
+        await self.w.wait_for("tick", timeout=1)
+        await asyncio.wait_for(runner.stop(), 1)
+        self.assertEqual(runner.ticks, self.w._tick)
+
+    async def test_overrun(self):
+        overruns = []
+        slow = [True]
+
+        def stall(world, dt):
+            if slow and world._tick == 2:
+                slow.clear()
+                time.sleep(0.1)
+
+        self.w.add_system(System("stall", run=stall))
+        runner = AsyncWorldRunner(self.w, rate=100, max_catch_up=3)
+        runner.on(EVT_OVERRUN, lambda tick, late, dropped: overruns.append(dropped))
+
+        await runner.run(ticks=10)
+        self.assertEqual(runner.ticks, 10)
+        self.assertEqual(runner.overruns, len(overruns))
+        self.assertGreaterEqual(runner.overruns, 1)
+        self.assertGreater(overruns[0], 0)
+        self.assertEqual(runner.stats()["dropped"], runner.dropped)
+        self.assertGreaterEqual(runner.max_tick_seconds, 0.1)
+
+
+class NoLoopTests(TestCase):
+    def test_no_event_loop(self):
+        async def listener():
+            pass
+
+        ev = EventDispatcherMixin()
+        ev.on("test", listener)
+        with self.assertRaises(NoEventLoop):
+            ev.fire("test")
@@ -0,0 +1,78 @@
+from unittest import TestCase
+from becs import World
+from becs.archetype import Archetype
+from becs.meta import ComponentMeta, FieldMeta
+
+
+class ArchetypeTests(TestCase):
+    def test_append_and_remove_keeps_rows_packed(self):
+        arch = Archetype(["a", "b"])
+
+        arch.append("1", {"a": "a1", "b": "b1"})
+        arch.append("2", {"a": "a2", "b": "b2"})
+        arch.append("3", {"a": "a3", "b": "b3"})
+
+        cells = arch.remove("1")
+
+        self.assertDictEqual(cells, {"a": "a1", "b": "b1"})
+        self.assertEqual(len(arch), 2)
+        self.assertListEqual(arch.entities, ["3", "2"])
+        self.assertListEqual(arch.columns["a"], ["a3", "a2"])
+        self.assertListEqual(arch.columns["b"], ["b3", "b2"])
+        self.assertEqual(arch.row("3"), 0)
+        self.assertFalse("1" in arch)
+
+    def test_remove_last_row(self):
+        arch = Archetype(["a"])
+
+        arch.append("1", {"a": 1})
+        arch.append("2", {"a": 2})
+        arch.remove("2")
+
+        self.assertListEqual(arch.entities, ["1"])
+        self.assertEqual(arch.row("1"), 0)
+
+
+class WorldArchetypeTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        for name in ("position", "velocity"):
+            self.w.define_component(
+                ComponentMeta(name, name, [FieldMeta("X", "x", float, 0.0)])
+            )
+
+    def test_entities_share_tables(self):
+        e1 = self.w.add_entity("position", "velocity")
+        e2 = self.w.add_entity("velocity", "position")
+        e3 = self.w.add_entity("position")
+
+        both = self.w._archetypes[frozenset(["position", "velocity"])]
+        self.assertListEqual(both.entities, [e1, e2])
+        self.assertIs(both.columns["position"][1], self.w.get_component(e2, "position"))
+        self.assertListEqual(
+            self.w._archetypes[frozenset(["position"])].entities, [e3]
+        )
+
+    def test_add_and_remove_component_move_rows(self):
+        e1 = self.w.add_entity("position")
+        pos = self.w.get_component(e1, "position")
+
+        self.w.add_component(e1, "velocity")
+        self.assertEqual(
+            self.w._entity_archetype[e1].signature,
+            frozenset(["position", "velocity"]),
+        )
+        self.assertEqual(len(self.w._archetypes[frozenset(["position"])]), 0)
+
+        self.w.remove_component(e1, "velocity")
+        arch = self.w._entity_archetype[e1]
+        self.assertEqual(arch.signature, frozenset(["position"]))
+        self.assertIs(arch.columns["position"][arch.row(e1)], pos)
+
+    def test_remove_entity_leaves_tables(self):
+        e1 = self.w.add_entity("position", "velocity")
+        self.w.remove_entity(e1)
+
+        self.assertFalse(e1 in self.w._entity_archetype)
+        for arch in self.w._archetypes.values():
+            self.assertFalse(e1 in arch)
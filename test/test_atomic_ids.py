@@ -1,6 +1,7 @@
+from threading import Thread
 from time import time
 from unittest import TestCase
-from unittest.mock import Mock, call
+from unittest.mock import Mock, call, patch
 from becs.atomic import MAX_SEQUENCE, AtomicID
 from becs.exceptions import InvalidSystemClock
 
@@ -65,3 +66,78 @@ class TestAtomicIds(TestCase):
         node._last_timestamp = (int(time() * 1000) - node._epoch) + 10000
         with self.assertRaises(InvalidSystemClock):
             node.next()
+
+    def test_borrow_next_millisecond(self):
+        node = AtomicID(1)
+
+        # the clock never moves forward, ids must still be unique
+        node._sequence = MAX_SEQUENCE
+        node._last_timestamp = 123
+        node._timestamp = Mock(return_value=123)
+
+        first = node.next()
+        second = node.next()
+
+        self.assertEqual(node._last_timestamp, 124)
+        self.assertEqual(node._sequence, 1)
+        self.assertEqual(second, first + 1)
+        self.assertEqual(node._timestamp.call_count, 3)
+
+    @patch("becs.atomic.sleep")
+    def test_wait_when_drifting_too_far(self, sleep):
+        node = AtomicID(1, max_drift=2)
+
+        node._sequence = MAX_SEQUENCE
+        node._last_timestamp = 125
+        node._timestamp = Mock(return_value=123)
+
+        node.next()
+
+        sleep.assert_called_once_with(0.001)
+        self.assertEqual(node._last_timestamp, 126)
+
+    def test_clock_behind_within_drift(self):
+        node = AtomicID(1, max_drift=5)
+
+        node._last_timestamp = 125
+        node._sequence = 7
+        node._timestamp = Mock(return_value=123)
+
+        node.next()
+
+        self.assertEqual(node._last_timestamp, 125)
+        self.assertEqual(node._sequence, 8)
+
+    def test_next_batch(self):
+        node = AtomicID(1)
+
+        timestamp = 123
+        node._timestamp = Mock(side_effect=lambda: timestamp)
+        node._last_timestamp = timestamp
+        node._sequence = MAX_SEQUENCE - 10
+
+        ids = node.next_batch(MAX_SEQUENCE * 2)
+
+        self.assertEqual(len(ids), MAX_SEQUENCE * 2)
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertListEqual(ids, sorted(ids))
+        self.assertEqual(node._last_timestamp, 125)
+        self.assertTrue(node.next() > ids[-1])
+
+    def test_thread_safety(self):
+        node = AtomicID(1)
+        results = []
+
+        def worker():
+            ids = [node.next() for _ in range(2000)]
+            ids.extend(node.next_batch(2000))
+            results.append(ids)
+
+        threads = [Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        ids = [id for ids in results for id in ids]
+        self.assertEqual(len(set(ids)), 8 * 4000)
@@ -0,0 +1,102 @@
+from unittest import TestCase
+from unittest.mock import Mock
+from becs import (
+    EVT_COMPONENT_ADDED,
+    EVT_COMPONENTS_ADDED,
+    EVT_COMPONENTS_REMOVED,
+    EVT_ENTITIES_ADDED,
+    EVT_ENTITIES_REMOVED,
+    EVT_ENTITY_ADDED,
+    World,
+)
+from becs.exceptions import ComponentNotFound, EntityNotFound
+from becs.meta import ComponentMeta, FieldMeta
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        for name in ("position", "velocity"):
+            self.w.define_component(
+                ComponentMeta(
+                    name,
+                    name,
+                    [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+                )
+            )
+
+    def test_add_entities(self):
+        added = Mock()
+        single = Mock()
+        self.w.on(EVT_ENTITIES_ADDED, added)
+        self.w.on(EVT_ENTITY_ADDED, single)
+        self.w.on(EVT_COMPONENT_ADDED, single)
+
+        ids = self.w.add_entities(
+            3, ["position", "velocity"], initial_values={"position": {"x": 5.0}}
+        )
+
+        self.assertEqual(len(set(ids)), 3)
+        added.assert_called_once_with(ids, ("position", "velocity"))
+        single.assert_not_called()
+
+        for id in ids:
+            self.assertEqual(self.w.get_component(id, "position"), {"x": 5.0, "y": 0.0})
+            self.assertEqual(self.w.get_component(id, "velocity"), {"x": 0.0, "y": 0.0})
+
+        self.assertListEqual(list(self.w.query("position", "velocity").entities()), ids)
+
+        # components are wired exactly like single adds
+        pos = self.w.get_component(ids[0], "position")
+        self.assertEqual(pos.tag["entity_id"], ids[0])
+        self.w.remove_component(ids[0], "velocity")
+        self.assertListEqual(
+            list(self.w.query("position", exclude=["velocity"]).entities()), [ids[0]]
+        )
+
+    def test_remove_entities(self):
+        removed = Mock()
+        self.w.on(EVT_ENTITIES_REMOVED, removed)
+
+        ids = self.w.add_entities(4, ["position"])
+        self.w.remove_entities(ids[1:3])
+
+        removed.assert_called_once_with(ids[1:3])
+        self.assertListEqual(
+            sorted(self.w.query("position").entities()), sorted([ids[0], ids[3]])
+        )
+        self.assertEqual(len(self.w._components), 2)
+
+        with self.assertRaises(EntityNotFound):
+            self.w.remove_entities([ids[0], ids[1]])
+
+        # nothing is removed when validation fails
+        self.assertTrue(ids[0] in self.w._entities)
+
+    def test_add_and_remove_components(self):
+        added = Mock()
+        removed = Mock()
+        self.w.on(EVT_COMPONENTS_ADDED, added)
+        self.w.on(EVT_COMPONENTS_REMOVED, removed)
+
+        ids = self.w.add_entities(3, ["position"])
+        cids = self.w.add_components(ids[:2], "velocity")
+
+        added.assert_called_once_with(ids[:2], cids, "velocity")
+        self.assertListEqual(
+            list(self.w.query("position", "velocity").entities()), ids[:2]
+        )
+
+        self.w.remove_components(ids[:2], "velocity")
+
+        removed.assert_called_once_with(ids[:2], cids, "velocity")
+        self.assertEqual(len(self.w.query("position", "velocity")), 0)
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.add_components(ids, "missing")
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.remove_components(ids, "velocity")
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.add_entities(1, ["missing"])
@@ -0,0 +1,135 @@
+from unittest import TestCase, skipUnless
+from becs import World
+from becs.columnar import numpy
+from becs.exceptions import ComponentNotFound
+from becs.meta import ComponentMeta, FieldMeta
+from becs.system import System
+
+
+class ChangeTrackingTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        for name in ("position", "health"):
+            self.w.define_component(
+                ComponentMeta(name, name, [FieldMeta("Value", "value", int, 0)])
+            )
+
+        self.e1, self.e2, self.e3 = self.w.add_entities(3, ["position", "health"])
+
+    def test_changed_since(self):
+        tick = self.w.change_tick
+        self.assertListEqual(self.w.changed_since(tick, "position"), [])
+
+        self.w.tick(0.1)
+        self.w.get_component(self.e2, "position")["value"] = 1
+        self.w.get_component(self.e1, "position")["value"] = 1
+        self.w.get_component(self.e2, "position")["value"] = 2
+
+        self.assertListEqual(self.w.changed_since(tick, "position"), [self.e2, self.e1])
+        self.assertListEqual(self.w.changed_since(tick, "health"), [])
+
+    def test_reads_do_not_consume_changes(self):
+        tick = self.w.change_tick
+        self.w.tick(0.1)
+
+        comp = self.w.get_component(self.e3, "health")
+        comp["value"] = 5
+        comp.get("value")
+        comp["value"]
+
+        self.assertListEqual(self.w.changed_since(tick, "health"), [self.e3])
+        self.assertListEqual(self.w.changed_since(tick, "health"), [self.e3])
+
+    def test_added_and_removed(self):
+        tick = self.w.change_tick
+        self.w.tick(0.1)
+
+        e4 = self.w.add_entity("position")
+        self.w.remove_component(self.e1, "position")
+        self.w.get_component(self.e1, "health")["value"] = 1
+        self.w.remove_entity(self.e1)
+
+        self.assertListEqual(self.w.changed_since(tick, "position"), [e4])
+        self.assertListEqual(self.w.changed_since(tick, "health"), [])
+
+    def test_mark_changed(self):
+        tick = self.w.change_tick
+        self.w.tick(0.1)
+
+        self.w.mark_changed("position", [self.e3])
+        self.assertListEqual(self.w.changed_since(tick, "position"), [self.e3])
+
+        self.w.mark_changed("health")
+        self.assertListEqual(
+            self.w.changed_since(tick, "health"), [self.e1, self.e2, self.e3]
+        )
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.changed_since(tick, "missing")
+
+    def test_systems_consume_independently(self):
+        seen = {"writer": [], "reader": [], "late": []}
+
+        def writer(world, dt):
+            world.get_component(self.e1, "position")["value"] += 1
+
+        def observer(name):
+            def run(world, dt):
+                system = world.get_system(name)
+                seen[name].append(
+                    world.changed_since(system.last_change_tick, "position")
+                )
+
+            return run
+
+        self.w.add_system(System("writer", writes=["position"], run=writer))
+        self.w.add_system(System("reader", reads=["position"], run=observer("reader")))
+        self.w.add_system(
+            System(
+                "late", reads=["position"], stage="post-update", run=observer("late")
+            )
+        )
+
+        self.w.tick(0.1)
+        self.w.tick(0.1)
+
+        # every observer sees the write of each frame, regardless of the others
+        self.assertListEqual(seen["reader"][1], [self.e1])
+        self.assertListEqual(seen["late"][1], [self.e1])
+
+    def test_deferred_events(self):
+        seen = []
+
+        def writer(world, dt):
+            system = world.get_system("writer")
+            seen.append(world.changed_since(system.last_change_tick, "position"))
+            if len(seen) == 1:
+                world.get_component(self.e1, "position")["value"] = 1
+
+        self.w.defer_events()
+        tick = self.w.change_tick
+        self.w.tick(0.1)
+
+        # stamped as the write happens, not when the events are flushed
+        self.w.get_component(self.e2, "position")["value"] = 1
+        self.assertListEqual(self.w.changed_since(tick, "position"), [self.e2])
+
+        self.w.add_system(System("writer", writes=["position"], run=writer))
+        self.w.tick(0.1)
+        self.w.tick(0.1)
+
+        # the system's own write is not new to it on the next tick
+        self.assertListEqual(seen, [[self.e2], []])
+
+    @skipUnless(numpy, "numpy is not installed")
+    def test_columnar_changes(self):
+        w = World()
+        w.define_component(
+            ComponentMeta("P", "p", [FieldMeta("X", "x", float, 0.0)]), columnar=True
+        )
+        e1 = w.add_entity("p")
+        tick = w.change_tick
+        w.tick(0.1)
+
+        w.get_component(e1, "p")["x"] = 1.0
+        self.assertListEqual(w.changed_since(tick, "p"), [e1])
@@ -0,0 +1,89 @@
+from unittest import TestCase, skipUnless
+from unittest.mock import Mock
+from becs import World
+from becs.columnar import numpy
+from becs.exceptions import ComponentNotColumnar
+from becs.meta import ComponentMeta, FieldMeta
+from becs.reactive_dict import EVT_ITEM_CHANGED
+
+
+@skipUnless(numpy, "numpy is not installed")
+class ColumnarTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        self.w.define_component(
+            ComponentMeta(
+                "Position",
+                "position",
+                [
+                    FieldMeta("X", "x", float, 1.5),
+                    FieldMeta("Y", "y", float),
+                    FieldMeta("Layer", "layer", int, 2),
+                ],
+            ),
+            columnar=True,
+        )
+
+    def test_define_non_numeric(self):
+        meta = ComponentMeta("Name", "name", [FieldMeta("Name", "name", str)])
+
+        with self.assertRaises(ComponentNotColumnar):
+            self.w.define_component(meta, columnar=True)
+
+        self.w.define_component(meta)
+        with self.assertRaises(ComponentNotColumnar):
+            self.w.columns("name")
+
+    def test_row_proxy(self):
+        e1 = self.w.add_entity("position")
+        pos = self.w.get_component(e1, "position")
+
+        self.assertEqual(pos["x"], 1.5)
+        self.assertEqual(pos["y"], 0.0)
+        self.assertEqual(pos["layer"], 2)
+        self.assertEqual(pos, {"x": 1.5, "y": 0.0, "layer": 2})
+
+        changed = Mock()
+        pos.on(EVT_ITEM_CHANGED, changed)
+        pos["x"] = 3.0
+        pos["x"] = 3.0
+
+        self.assertEqual(pos["x"], 3.0)
+        changed.assert_called_once_with(pos, "x", 3.0, 1.5)
+
+    def test_vectorized_columns(self):
+        ids = [self.w.add_entity("position") for _ in range(100)]
+
+        cols = self.w.columns("position")
+        self.assertEqual(len(cols), 100)
+
+        cols["x"] += 1.0
+        cols["y"] = numpy.arange(100)
+
+        self.assertEqual(self.w.get_component(ids[10], "position")["x"], 2.5)
+        self.assertEqual(self.w.get_component(ids[10], "position")["y"], 10.0)
+
+    def test_remove_keeps_rows_aligned(self):
+        ids = [self.w.add_entity("position") for _ in range(3)]
+        for i, eid in enumerate(ids):
+            self.w.get_component(eid, "position")["layer"] = i
+
+        self.w.remove_component(ids[0], "position")
+
+        store = self.w.column_store("position")
+        self.assertEqual(len(store), 2)
+        self.assertEqual(self.w.get_component(ids[2], "position")["layer"], 2)
+        self.assertListEqual(list(self.w.columns("position")["layer"]), [2, 1])
+        self.assertListEqual(list(store.rows([ids[1], ids[2]])), [1, 0])
+
+    def test_bulk_rows(self):
+        ids = self.w.add_entities(100, ["position"], {"position": {"y": 4.0}})
+
+        self.assertEqual(len(self.w.columns("position")), 100)
+        self.assertEqual(
+            self.w.get_component(ids[99], "position"), {"x": 1.5, "y": 4.0, "layer": 2}
+        )
+
+        self.w.remove_entities(ids[:50])
+        self.assertEqual(len(self.w.columns("position")), 50)
+        self.assertEqual(self.w.get_component(ids[99], "position")["y"], 4.0)
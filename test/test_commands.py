@@ -0,0 +1,198 @@
+import threading
+from unittest import TestCase
+from becs import (
+    EVT_COMPONENT_ADDED,
+    EVT_COMPONENTS_ADDED,
+    EVT_COMPONENTS_REMOVED,
+    EVT_ENTITIES_ADDED,
+    EVT_ENTITIES_REMOVED,
+    HANDLES_LOCAL,
+    World,
+)
+from becs.commands import CommandBuffer
+from becs.exceptions import ComponentNotFound
+from becs.meta import ComponentMeta, FieldMeta
+from becs.system import System
+
+
+class CommandBufferTests(TestCase):
+    def setUp(self):
+        self.w = World(handles=HANDLES_LOCAL)
+        for name in ("position", "velocity"):
+            self.w.define_component(
+                ComponentMeta(name, name, [FieldMeta("X", "x", float, 0.0)])
+            )
+        self.w.define_component(ComponentMeta("Dead", "dead", []))
+        self.events = []
+        for event in (
+            EVT_COMPONENT_ADDED,
+            EVT_COMPONENTS_ADDED,
+            EVT_COMPONENTS_REMOVED,
+            EVT_ENTITIES_ADDED,
+            EVT_ENTITIES_REMOVED,
+        ):
+            self.w.on(event, lambda *kargs, event=event: self.events.append(event))
+
+    def test_modify_while_iterating(self):
+        ids = self.w.add_entities(10, ["position"])
+        self.events.clear()
+        commands = self.w.commands
+
+        for entity_id, position in self.w.query("position"):
+            if entity_id % 2:
+                commands.add(entity_id, "velocity", {"x": 2.0})
+            else:
+                commands.despawn(entity_id)
+
+        self.assertEqual(len(commands), 10)
+        self.assertEqual(self.w.apply_commands(), 10)
+
+        self.assertEqual(len(commands), 0)
+        self.assertEqual(sorted(self.w._entities), ids[1::2])
+        self.assertEqual(self.w.get_component(ids[1], "velocity")["x"], 2.0)
+        # one batch event per group, none per entity
+        self.assertEqual(self.events, [EVT_ENTITIES_REMOVED, EVT_COMPONENTS_ADDED])
+
+    def test_grouping(self):
+        e1, e2 = self.w.add_entities(2, ["position"])
+        self.events.clear()
+        commands = CommandBuffer()
+        commands.spawn(["position"])
+        commands.spawn(["position"], count=2)
+        commands.spawn(["position"], {"position": {"x": 1.0}})
+        commands.add(e1, "dead")
+        commands.add(e2, "dead")
+        commands.remove(e2, "position")
+        commands.remove(e2, "position")
+        commands.apply(self.w)
+
+        self.assertEqual(len(self.w._entities), 6)
+        self.assertEqual(self.w._tags["dead"], {e1, e2})
+        self.assertFalse(self.w.entity_has_component(e2, "position"))
+        self.assertEqual(
+            self.events,
+            [
+                EVT_COMPONENTS_REMOVED,
+                EVT_COMPONENTS_ADDED,
+                EVT_ENTITIES_ADDED,
+                EVT_ENTITIES_ADDED,
+            ],
+        )
+        self.assertEqual(
+            sorted(c["x"] for _, c in self.w.query("position")),
+            [0.0, 0.0, 0.0, 0.0, 1.0],
+        )
+
+    def test_moot_commands(self):
+        e1, e2 = self.w.add_entities(2, ["position"])
+        commands = CommandBuffer()
+        commands.remove(e1, "position")
+        commands.add(e1, "velocity")
+        commands.despawn(e1)
+        commands.remove(e2, "velocity")
+        commands.despawn(e2)
+        commands.despawn(e2)
+        commands.apply(self.w)
+
+        self.assertEqual(self.w._entities, {})
+
+    def test_add_existing_component(self):
+        e1 = self.w.add_entity("position")
+        position = self.w.get_component(e1, "position")
+        commands = CommandBuffer()
+        commands.add(e1, "position", {"x": 1.0})
+        commands.apply(self.w)
+
+        self.assertIs(self.w.get_component(e1, "position"), position)
+        self.assertEqual(position["x"], 0.0)
+        self.assertEqual(len(self.w._components), 1)
+
+    def test_unknown_component(self):
+        e1, e2 = self.w.add_entities(2, ["position"])
+        self.events.clear()
+        commands = CommandBuffer()
+        commands.remove(e1, "position")
+        commands.despawn(e2)
+        commands.add(e1, "missing")
+        commands.spawn(["position"])
+
+        with self.assertRaises(ComponentNotFound):
+            commands.apply(self.w)
+
+        # nothing applied, nothing lost
+        self.assertEqual(self.events, [])
+        self.assertTrue(self.w.entity_has_component(e1, "position"))
+        self.assertEqual(len(commands), 4)
+
+        commands.spawn(["nope"], count=2)
+        with self.assertRaises(ComponentNotFound):
+            commands.apply(self.w)
+
+        self.assertEqual(len(commands), 5)
+
+    def test_spawn_callback(self):
+        spawned = []
+        commands = CommandBuffer()
+        commands.spawn(["position"], count=2, callback=spawned.append)
+        commands.spawn(["velocity"])
+        commands.spawn(["position"], callback=spawned.append)
+        commands.apply(self.w)
+
+        self.assertEqual([len(ids) for ids in spawned], [2, 1])
+        ids = spawned[0] + spawned[1]
+        self.assertEqual(len(set(ids)), 3)
+        for entity_id in ids:
+            self.assertEqual(self.w.list_entity_components(entity_id), ["position"])
+
+    def test_deterministic(self):
+        def run(order):
+            w = World(handles=HANDLES_LOCAL)
+            w.define_component(
+                ComponentMeta("position", "position", [FieldMeta("X", "x", float, 0.0)])
+            )
+            w.define_component(ComponentMeta("Dead", "dead", []))
+            ids = w.add_entities(6, ["position"])
+            added = []
+            w.on(EVT_COMPONENTS_ADDED, lambda ids, cids, comp: added.extend(ids))
+            commands = CommandBuffer()
+            for i in order:
+                commands.add(ids[i], "dead")
+            commands.apply(w)
+            return added
+
+        self.assertEqual(run([5, 1, 3, 0]), run([0, 3, 1, 5]))
+
+    def test_threads(self):
+        ids = self.w.add_entities(1000, ["position"])
+        commands = self.w.commands
+
+        def work(chunk):
+            for entity_id in chunk:
+                commands.add(entity_id, "dead")
+
+        threads = [threading.Thread(target=work, args=(ids[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.w.apply_commands()
+        self.assertEqual(len(self.w._tags["dead"]), 1000)
+
+    def test_applied_between_batches(self):
+        seen = []
+
+        def spawner(world, dt):
+            world.commands.spawn(["position"], count=3)
+
+        def counter(world, dt):
+            seen.append(len(world.query("position")))
+
+        self.w.add_system(System("spawner", writes=["position"], run=spawner))
+        self.w.add_system(System("counter", reads=["position"], run=counter))
+        tick = self.w.change_tick
+
+        self.w.tick(0.1)
+
+        self.assertEqual(seen, [3])
+        self.assertEqual(len(self.w.changed_since(tick, "position")), 3)
@@ -0,0 +1,112 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+from becs import World
+from becs.compiled import SlotComponent
+from becs.exceptions import InvalidFieldName
+from becs.meta import ComponentMeta, FieldMeta
+from becs.reactive_dict import EVT_ITEM_CHANGED
+
+POSITION = ComponentMeta(
+    "Position",
+    "position",
+    [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 2.0)],
+)
+
+
+class CompiledComponentTests(TestCase):
+    def test_compile(self):
+        Position = POSITION.compile()
+        position = Position()
+
+        self.assertTrue(issubclass(Position, SlotComponent))
+        self.assertFalse(hasattr(position, "__dict__"))
+        self.assertEqual(position.x, 0.0)
+        self.assertEqual(position["y"], 2.0)
+        self.assertEqual(position, {"x": 0.0, "y": 2.0})
+        self.assertEqual(Position(y=5.0).y, 5.0)
+        self.assertEqual(list(position.keys()), ["x", "y"])
+
+        with self.assertRaises(KeyError):
+            position["z"]
+
+        with self.assertRaises(AttributeError):
+            position.z = 1
+
+    def test_observable(self):
+        position = POSITION.compile()()
+        listener = Mock()
+        position.on(EVT_ITEM_CHANGED, listener)
+
+        position.x = 1.0
+        position["y"] = 3.0
+        position["y"] = 3.0
+
+        listener.assert_any_call(position, "x", 1.0, 0.0)
+        listener.assert_any_call(position, "y", 3.0, 2.0)
+        self.assertEqual(listener.call_count, 2)
+
+    def test_not_observable(self):
+        position = POSITION.compile(observable=False)()
+        listener = Mock()
+        position.on(EVT_ITEM_CHANGED, listener)
+        position.x = 1.0
+
+        listener.assert_not_called()
+
+    def test_invalid_field_name(self):
+        for name in ("keys", "tag", "not valid", "class"):
+            with self.assertRaises(InvalidFieldName):
+                ComponentMeta("Bad", "bad", [FieldMeta("Bad", name, int)]).compile()
+
+    def test_world(self):
+        w = World()
+        w.define_component(POSITION, slots=True)
+        e1 = w.add_entity("position")
+        ids = w.add_entities(2, ["position"], {"position": {"x": 4.0}})
+        tick = w.change_tick
+        w.tick(0.1)
+
+        position = w.get_component(e1, "position")
+        position.x = 9.0
+
+        self.assertIsInstance(position, SlotComponent)
+        self.assertEqual(position.tag["entity_id"], e1)
+        self.assertEqual(w.get_component(ids[1], "position").x, 4.0)
+        self.assertEqual(w.changed_since(tick, "position"), [e1])
+
+        w.remove_component(e1, "position")
+        position.x = 1.0
+        self.assertEqual(w.changed_since(tick, "position"), [])
+
+    def test_world_not_observable(self):
+        w = World()
+        w.define_component(POSITION, slots=True, observable=False)
+        e1 = w.add_entity("position")
+        tick = w.change_tick
+        w.tick(0.1)
+
+        w.get_component(e1, "position").x = 9.0
+
+        self.assertEqual(w.changed_since(tick, "position"), [])
+
+    def test_snapshot(self):
+        w = World()
+        w.define_component(POSITION, slots=True, observable=False)
+        w.define_component(ComponentMeta("Enemy", "enemy", []), slots=True)
+        e1 = w.add_entity("position", "enemy")
+        w.get_component(e1, "position").x = 3.0
+
+        fd, path = tempfile.mkstemp(suffix=".becs")
+        os.close(fd)
+        try:
+            w.save(path)
+            loaded = World.load(path)
+        finally:
+            os.remove(path)
+
+        position = loaded.get_component(e1, "position")
+        self.assertEqual(position, {"x": 3.0, "y": 2.0})
+        self.assertIs(type(position), loaded._slot_classes["position"])
+        self.assertIsInstance(loaded.get_component(e1, "enemy"), SlotComponent)
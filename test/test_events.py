@@ -1,6 +1,8 @@
+import gc
+import weakref
 from unittest import TestCase
-from unittest.mock import Mock
-from becs.events import EventDispatcherMixin
+from unittest.mock import Mock, call
+from becs.events import EventDispatcherMixin, EventQueue, WeakListener
 
 class TestEvents(TestCase):
 
@@ -40,4 +42,83 @@ class TestEvents(TestCase):
 
         ev.fire("test", 1, 2, 3)
 
-        cb.assert_called_once_with(1, 2, 3)
\ No newline at end of file
+        cb.assert_called_once_with(1, 2, 3)
+
+    def test_fire_without_listeners(self):
+        ev = EventDispatcherMixin()
+
+        ev.fire("test", 1)
+
+        self.assertIsNone(getattr(ev, "_EventDispatcherMixin__events", None))
+
+    def test_weak_listener(self):
+        class Listener:
+            def __init__(self):
+                self.calls = []
+
+            def handle(self, value):
+                self.calls.append(value)
+
+        ev = EventDispatcherMixin()
+        listener = Listener()
+        ev.on("test", listener.handle, weak=True)
+
+        ev.fire("test", 1)
+        self.assertListEqual(listener.calls, [1])
+
+        ev.off("test", listener.handle)
+        ev.fire("test", 2)
+        self.assertListEqual(listener.calls, [1])
+
+        ev.on("test", listener.handle, weak=True)
+        ref = weakref.ref(listener)
+        del listener
+        gc.collect()
+
+        self.assertIsNone(ref())
+        ev.fire("test", 3)
+
+        # dead listeners are dropped when new ones subscribe
+        other = Mock()
+        ev.on("test", WeakListener(other))
+        self.assertListEqual(
+            getattr(ev, "_EventDispatcherMixin__events")["test"], [other]
+        )
+
+    def test_deferred(self):
+        ev = EventDispatcherMixin()
+        cb = Mock()
+        ev.on("test", cb)
+
+        queue = EventQueue()
+        ev.set_event_queue(queue)
+
+        ev.fire("test", 1)
+        ev.fire("test", 2)
+        cb.assert_not_called()
+        self.assertEqual(len(queue), 2)
+
+        queue.flush()
+        cb.assert_has_calls([call(1), call(2)])
+        self.assertEqual(len(queue), 0)
+
+    def test_deferred_coalesce(self):
+        class Dispatcher(EventDispatcherMixin):
+            _coalesce = {
+                "test": (lambda kargs: kargs[0], lambda queued, kargs: kargs + queued)
+            }
+
+        ev = Dispatcher()
+        cb = Mock()
+        ev.on("test", cb)
+
+        queue = EventQueue()
+        ev.set_event_queue(queue)
+
+        ev.fire("test", "a", 1)
+        ev.fire("test", "b", 1)
+        ev.fire("test", "a", 2)
+        queue.flush()
+
+        cb.assert_has_calls([call("b", 1), call("a", 2, "a", 1)])
+        self.assertEqual(cb.call_count, 2)
@@ -0,0 +1,144 @@
+from unittest import TestCase, skipUnless
+from becs import HANDLES_LOCAL, World
+from becs.columnar import numpy
+from becs.exceptions import ComponentNotFound, FieldNotFound
+from becs.filter import F
+from becs.meta import ComponentMeta, FieldMeta
+from becs.storage import SQLiteStorage
+
+
+class FilterTests(TestCase):
+    columnar = False
+    slots = False
+
+    def world(self) -> World:
+        return World()
+
+    def setUp(self):
+        self.w = self.world()
+        self.w.define_component(
+            ComponentMeta(
+                "Position",
+                "position",
+                [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+            ),
+            columnar=self.columnar,
+        )
+        self.w.define_component(
+            ComponentMeta(
+                "Health",
+                "health",
+                [FieldMeta("HP", "hp", int, 100), FieldMeta("Name", "name", str, "")],
+            ),
+            slots=self.slots,
+        )
+        self.w.define_component(ComponentMeta("Dead", "dead", []))
+
+        self.ids = self.w.add_entities(20, ["position", "health"])
+        for i, entity_id in enumerate(self.ids):
+            self.w.get_component(entity_id, "position")["x"] = float(i * 10)
+            self.w.get_component(entity_id, "health")["hp"] = i
+        self.w.add_components(self.ids[:2], "dead")
+        self.extra = self.w.add_entity("position")
+
+    def test_where(self):
+        found = self.w.select("health", "position").where(
+            F("health.hp") < 10, F("position.x") > 30
+        )
+        self.assertEqual(sorted(found.entities()), sorted(self.ids[4:10]))
+        self.assertEqual(len(found), 6)
+
+        rows = list(found)
+        self.assertEqual(len(rows[0]), 3)
+        self.assertEqual(rows[0][1]["hp"], rows[0][2]["x"] / 10)
+
+    def test_ids(self):
+        ids = self.w.select("position").where(F("position.x") >= 150).ids()
+        self.assertEqual(sorted(ids.tolist()), sorted(int(id) for id in self.ids[15:]))
+
+    def test_combinators(self):
+        found = self.w.select("position").where(
+            (F("position.x") < 20) | ~(F("health.hp") != 19)
+        )
+        self.assertEqual(sorted(found.entities()), sorted(self.ids[:2] + self.ids[19:]))
+
+        found = self.w.select("health").where(
+            (F("health.hp") > 2) & (F("health.hp") <= 4), F("health.name") == ""
+        )
+        self.assertEqual(sorted(found.entities()), sorted(self.ids[3:5]))
+
+    def test_tags(self):
+        found = self.w.select("position", "dead").where(F("position.x") < 100)
+        self.assertEqual(sorted(found.entities()), sorted(self.ids[:2]))
+
+        found = self.w.select("position", exclude=["dead"]).where(
+            F("position.x") < 100
+        )
+        self.assertEqual(
+            sorted(found.entities()), sorted(self.ids[2:10] + [self.extra])
+        )
+
+    def test_reuse(self):
+        found = self.w.select("health").where(F("health.hp") == 5)
+        self.assertEqual(found.entities(), [self.ids[5]])
+
+        self.w.get_component(self.ids[6], "health")["hp"] = 5
+        self.w.remove_entity(self.ids[5])
+        self.assertEqual(found.entities(), [self.ids[6]])
+
+    def test_errors(self):
+        with self.assertRaises(ComponentNotFound):
+            self.w.select("missing")
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.select("position").where(F("missing.x") > 1)
+
+        with self.assertRaises(FieldNotFound):
+            self.w.select("position").where(F("position.z") > 1)
+
+        with self.assertRaises(FieldNotFound):
+            F("position")
+
+        with self.assertRaises(TypeError):
+            self.w.select("position").where(F("position.x") > 1 and F("position.y") > 1)
+
+
+class SlotFilterTests(FilterTests):
+    slots = True
+
+
+@skipUnless(numpy, "numpy is not installed")
+class ColumnarFilterTests(FilterTests):
+    columnar = True
+
+    def test_column_stores(self):
+        self.w.define_component(
+            ComponentMeta("Velocity", "velocity", [FieldMeta("X", "x", float, 0.0)]),
+            columnar=True,
+        )
+        # rows in a different order than position's, and not every entity
+        ids = self.ids[::-1][:15]
+        self.w.add_components(ids, "velocity")
+        for i, entity_id in enumerate(ids):
+            self.w.get_component(entity_id, "velocity")["x"] = float(i)
+
+        found = self.w.select("position").where(
+            F("position.x") >= 50, F("velocity.x") < 10
+        )
+        self.assertEqual(sorted(found.entities()), sorted(self.ids[10:]))
+        self.assertEqual(len(found.where(F("health.hp") < 12)), 2)
+
+
+@skipUnless(numpy, "numpy is not installed")
+class LocalHandleColumnarFilterTests(FilterTests):
+    columnar = True
+
+    def world(self) -> World:
+        return World(handles=HANDLES_LOCAL)
+
+
+class StorageFilterTests(FilterTests):
+    def world(self) -> World:
+        storage = SQLiteStorage(cache_size=8)
+        self.addCleanup(storage.close)
+        return World(storage=storage)
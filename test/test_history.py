@@ -0,0 +1,205 @@
+from unittest import TestCase
+from becs import HANDLES_LOCAL, World
+from becs.exceptions import HistoryNotEnabled
+from becs.meta import ComponentMeta, FieldMeta
+
+
+class HistoryTests(TestCase):
+    handles = "global"
+
+    def setUp(self):
+        self.w = World(handles=self.handles)
+        self.w.define_component(
+            ComponentMeta(
+                "Position",
+                "position",
+                [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+            )
+        )
+        self.w.define_component(
+            ComponentMeta("Velocity", "velocity", [FieldMeta("X", "x", float, 1.0)])
+        )
+        self.w.define_component(ComponentMeta("Dead", "dead", []))
+        self.history = self.w.enable_history(ticks=8)
+
+    def state(self):
+        return {
+            entity_id: {
+                name: dict(self.w.get_component(entity_id, name).items())
+                for name in self.w.list_entity_components(entity_id)
+            }
+            for entity_id in self.w._entities
+        }
+
+    def test_field_deltas(self):
+        e1 = self.w.add_entity("position")
+        self.w.tick(0.1)
+        start = self.state()
+
+        position = self.w.get_component(e1, "position")
+        for i in range(1, 4):
+            position["x"] = float(i)
+            position["x"] = float(i) * 2
+            self.w.tick(0.1)
+
+        self.assertEqual(len(self.history), 4)
+        self.assertEqual(len(self.history._records[-1]), 1)
+
+        self.assertEqual(self.w.rollback(2), 2)
+        self.assertEqual(position["x"], 2.0)
+        self.assertEqual(self.w._tick, 2)
+
+        self.w.rollback(1)
+        self.assertEqual(self.state(), start)
+
+        self.assertEqual(self.w.replay(), 3)
+        self.assertEqual(position["x"], 6.0)
+        self.assertEqual(self.w._tick, 4)
+
+    def test_structural(self):
+        e1, e2 = self.w.add_entities(2, ["position", "velocity"])
+        self.w.get_component(e1, "position")["x"] = 5.0
+        self.w.tick(0.1)
+        start = self.state()
+
+        self.w.get_component(e1, "position")["x"] = 7.0
+        self.w.remove_component(e1, "velocity")
+        self.w.add_component(e2, "dead")
+        self.w.remove_entity(e2)
+        e3 = self.w.add_entity("position")
+        self.w.add_components([e1, e3], "dead")
+        self.w.tick(0.1)
+        end = self.state()
+
+        self.w.rollback()
+        self.assertEqual(self.state(), start)
+        self.assertEqual(self.w.query("position", "velocity").entities().__next__(), e1)
+
+        self.w.replay()
+        self.assertEqual(self.state(), end)
+        self.assertNotIn(e2, self.w._entities)
+        self.assertIn(e3, self.w._tags["dead"])
+
+    def test_batch(self):
+        ids = self.w.add_entities(10, ["position", "dead"])
+        self.w.tick(0.1)
+        start = self.state()
+
+        self.w.remove_entities(ids[:5])
+        self.w.remove_components(ids[5:], "dead")
+        self.w.tick(0.1)
+
+        self.w.rollback()
+        self.assertEqual(self.state(), start)
+        self.assertEqual(len(self.w.query("position", "dead")), 10)
+
+    def test_pending_changes(self):
+        e1 = self.w.add_entity("position")
+        self.w.tick(0.1)
+        self.w.get_component(e1, "position")["x"] = 3.0
+        self.w.add_entity("velocity")
+
+        self.assertEqual(self.w.rollback(0), 0)
+        self.assertEqual(self.w.get_component(e1, "position")["x"], 0.0)
+        self.assertEqual(list(self.w._entities), [e1])
+
+    def test_fork(self):
+        e1 = self.w.add_entity("position")
+        position = self.w.get_component(e1, "position")
+        for i in range(3):
+            position["x"] = float(i + 1)
+            self.w.tick(0.1)
+
+        self.w.rollback(2)
+        self.assertEqual(self.history.replayable, 2)
+
+        position["y"] = 1.0
+        self.w.tick(0.1)
+        self.assertEqual(self.history.replayable, 0)
+        self.assertEqual(self.w.replay(), 0)
+        self.assertEqual(dict(position), {"x": 1.0, "y": 1.0})
+
+    def test_ring_buffer(self):
+        e1 = self.w.add_entity("position")
+        position = self.w.get_component(e1, "position")
+        for i in range(20):
+            position["x"] = float(i + 1)
+            self.w.tick(0.1)
+
+        self.assertEqual(len(self.history), 8)
+        self.assertEqual(self.w.rollback(100), 8)
+        self.assertEqual(position["x"], 12.0)
+
+    def test_idle_ticks(self):
+        self.w.add_entity("position")
+        for _ in range(5):
+            self.w.tick(0.1)
+
+        self.assertEqual(len(self.history), 1)
+
+    def test_rollback_idle_ticks(self):
+        e1 = self.w.add_entity("position")
+        position = self.w.get_component(e1, "position")
+        self.w.tick(0.1)
+        position["x"] = 1.0
+        self.w.tick(0.1)
+        self.w.tick(0.1)
+        self.w.tick(0.1)
+
+        # only idle ticks are undone
+        self.assertEqual(self.w.rollback(1), 1)
+        self.assertEqual(self.w._tick, 3)
+        self.assertEqual(position["x"], 1.0)
+
+        self.assertEqual(self.w.rollback(2), 2)
+        self.assertEqual(self.w._tick, 1)
+        self.assertEqual(position["x"], 0.0)
+
+        self.assertEqual(self.history.replayable, 3)
+        self.assertEqual(self.w.replay(1), 1)
+        self.assertEqual(position["x"], 1.0)
+        self.assertEqual(self.w.replay(), 2)
+        self.assertEqual(self.w._tick, 4)
+
+    def test_rollback_limit(self):
+        e1 = self.w.add_entity("position")
+        position = self.w.get_component(e1, "position")
+        for i in range(12):
+            if i % 4 == 0:
+                position["x"] = float(i)
+            self.w.tick(0.1)
+
+        # ticks are kept, idle or not
+        self.assertEqual(self.w.rollback(100), 8)
+        self.assertEqual(self.w._tick, 4)
+        self.assertEqual(position["x"], 0.0)
+
+    def test_deferred_events(self):
+        e1 = self.w.add_entity("position")
+        self.w.defer_events()
+        self.w.tick(0.1)
+
+        position = self.w.get_component(e1, "position")
+        position["x"] = 1.0
+        position["x"] = 2.0
+        self.w.tick(0.1)
+        position["x"] = 3.0
+        self.w.remove_component(e1, "position")
+        self.w.tick(0.1)
+
+        self.w.rollback()
+        self.assertEqual(self.w.get_component(e1, "position")["x"], 2.0)
+        self.w.rollback()
+        self.assertEqual(self.w.get_component(e1, "position")["x"], 0.0)
+
+    def test_not_enabled(self):
+        self.w.disable_history()
+        with self.assertRaises(HistoryNotEnabled):
+            self.w.rollback()
+
+        with self.assertRaises(HistoryNotEnabled):
+            self.w.replay()
+
+
+class LocalHandleHistoryTests(HistoryTests):
+    handles = HANDLES_LOCAL
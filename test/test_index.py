@@ -0,0 +1,155 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from becs import World
+from becs.columnar import numpy
+from becs.exceptions import ComponentNotFound, FieldNotFound
+from becs.index import INDEX_SORTED, HashIndex, SortedIndex
+from becs.meta import ComponentMeta, FieldMeta
+
+
+class IndexTests(TestCase):
+    def test_hash_index(self):
+        index = HashIndex("unit", "zone")
+        index.add(1, "a")
+        index.add(2, "a")
+        index.add(3, "b")
+        index.update(2, "b")
+        index.remove(3)
+
+        self.assertEqual(index.find("a"), [1])
+        self.assertEqual(index.find("b"), [2])
+        self.assertEqual(index.find("c"), [])
+
+        with self.assertRaises(ValueError):
+            index.find(lt=1)
+
+    def test_sorted_index(self):
+        index = SortedIndex("unit", "hp")
+        for entity_id, hp in enumerate([5, 1, 9, 5, None, 3]):
+            index.add(entity_id, hp)
+
+        self.assertEqual(index.find(5), [0, 3])
+        self.assertEqual(index.find(lt=5), [1, 5])
+        self.assertEqual(index.find(le=5), [1, 5, 0, 3])
+        self.assertEqual(index.find(gt=3, lt=9), [0, 3])
+        self.assertEqual(index.find(ge=9), [2])
+        self.assertEqual(index.find(None), [4])
+
+        index.update(0, 10)
+        index.remove(3)
+
+        self.assertEqual(index.find(5), [])
+        self.assertEqual(index.find(gt=5), [2, 0])
+
+
+class WorldIndexTests(TestCase):
+    columnar = False
+
+    def setUp(self):
+        self.w = World()
+        self.w.define_component(
+            ComponentMeta(
+                "Unit",
+                "unit",
+                [FieldMeta("Zone", "zone", str, "a"), FieldMeta("HP", "hp", int, 10)],
+            )
+        )
+        self.w.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)]),
+            columnar=self.columnar,
+        )
+        self.e1, self.e2, self.e3 = self.w.add_entities(3, ["unit", "position"])
+
+    def test_create_index(self):
+        self.w.get_component(self.e2, "unit")["zone"] = "b"
+
+        index = self.w.create_index("unit", "zone")
+
+        self.assertIs(self.w.create_index("unit", "zone"), index)
+        self.assertEqual(
+            sorted(self.w.find("unit", "zone", "a")), sorted([self.e1, self.e3])
+        )
+        self.assertEqual(self.w.find("unit", "zone", "b"), [self.e2])
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.create_index("missing", "zone")
+
+        with self.assertRaises(FieldNotFound):
+            self.w.create_index("unit", "missing")
+
+    def test_kept_up_to_date(self):
+        self.w.create_index("unit", "hp", INDEX_SORTED)
+        self.w.get_component(self.e1, "unit")["hp"] = 3
+        self.w.get_component(self.e2, "unit")["hp"] = 20
+        e4 = self.w.add_entity("unit")
+        self.w.remove_component(self.e3, "unit")
+
+        self.assertEqual(self.w.find("unit", "hp", lt=10), [self.e1])
+        self.assertEqual(self.w.find("unit", "hp", ge=10), [e4, self.e2])
+
+        self.w.remove_entities([self.e1, e4])
+        self.assertEqual(self.w.find("unit", "hp", lt=100), [self.e2])
+
+    def test_scan_without_index(self):
+        self.w.get_component(self.e1, "unit")["hp"] = 3
+
+        self.assertEqual(self.w.find("unit", "hp", lt=10), [self.e1])
+        self.assertEqual(self.w.find("unit", "hp", 3), [self.e1])
+
+        # a hash index can't answer a range, the lookup falls back to a scan
+        self.w.create_index("unit", "hp")
+        self.assertEqual(self.w.find("unit", "hp", lt=10), [self.e1])
+
+    def test_scan_without_criteria(self):
+        self.w.get_component(self.e2, "unit")["zone"] = None
+        everyone = sorted([self.e1, self.e2, self.e3])
+
+        self.w.create_index("unit", "zone")
+        self.assertEqual(sorted(self.w.find("unit", "zone")), everyone)
+
+        # a sorted index keeps None apart, only a scan finds every entity
+        self.w.drop_index("unit", "zone")
+        self.w.create_index("unit", "zone", INDEX_SORTED)
+        self.assertEqual(sorted(self.w.find("unit", "zone")), everyone)
+
+    def test_drop_index(self):
+        self.w.create_index("unit", "zone")
+        self.w.drop_index("unit", "zone")
+        self.w.get_component(self.e1, "unit")["zone"] = "b"
+
+        self.assertEqual(self.w.find("unit", "zone", "b"), [self.e1])
+        self.assertNotIn("unit", self.w._indexes)
+
+    def test_mark_changed(self):
+        self.w.create_index("position", "x", INDEX_SORTED)
+        self.w.get_component(self.e2, "position")["x"] = 2.0
+
+        self.assertEqual(self.w.find("position", "x", gt=1.0), [self.e2])
+
+        if self.columnar:
+            self.w.columns("position")["x"] += 5.0
+            self.w.mark_changed("position")
+
+            self.assertEqual(self.w.find("position", "x", gt=6.0), [self.e2])
+            self.assertEqual(len(self.w.find("position", "x", ge=5.0)), 3)
+
+    def test_snapshot(self):
+        self.w.create_index("unit", "zone")
+        self.w.get_component(self.e3, "unit")["zone"] = "c"
+
+        fd, path = tempfile.mkstemp(suffix=".becs")
+        os.close(fd)
+        try:
+            self.w.save(path)
+            loaded = World.load(path)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(len(loaded._indexes["unit"]), 1)
+        self.assertEqual(loaded.find("unit", "zone", "c"), [self.e3])
+
+
+@skipUnless(numpy, "numpy is not installed")
+class ColumnarWorldIndexTests(WorldIndexTests):
+    columnar = True
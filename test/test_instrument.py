@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from becs import EVT_COMPONENT_ADDED, EVT_ENTITY_ADDED, EVT_TICK, World
+from becs.events import EventDispatcherMixin
+from becs.exceptions import ProfilingNotEnabled
+from becs.instrument import Profiler
+from becs.meta import ComponentMeta, FieldMeta
+from becs.system import System
+
+
+class InstrumentTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        self.w.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)])
+        )
+
+    def test_disabled_is_untouched(self):
+        self.assertEqual(self.w.stats(), {})
+        self.assertNotIn("add_entity", vars(self.w))
+
+        self.w.enable_profiling()
+        self.assertIn("add_entity", vars(self.w))
+        self.assertIn("fire", vars(self.w))
+
+        self.w.disable_profiling()
+        for name in ("add_entity", "fire", "_dispatch"):
+            self.assertNotIn(name, vars(self.w))
+        self.assertNotIn("_run_system", vars(self.w._scheduler))
+        self.assertEqual(self.w.stats(), {})
+
+    def test_operations(self):
+        self.w.enable_profiling()
+        e1 = self.w.add_entity("position")
+        self.w.get_component(e1, "position")
+        self.w.get_component(e1, "position")
+        self.w.remove_component(e1, "position")
+
+        stats = self.w.stats()["operation"]
+
+        self.assertEqual(stats["add_entity"]["count"], 1)
+        # add_entity adds its components through add_component
+        self.assertEqual(stats["add_component"]["count"], 1)
+        self.assertEqual(stats["get_component"]["count"], 2)
+        self.assertEqual(stats["remove_component"]["count"], 1)
+        self.assertGreaterEqual(
+            stats["add_entity"]["total_seconds"],
+            stats["add_component"]["total_seconds"],
+        )
+
+    def test_events_and_listeners(self):
+        calls = []
+
+        def on_added(*kargs):
+            calls.append(kargs)
+
+        self.w.on(EVT_ENTITY_ADDED, on_added)
+        self.w.enable_profiling()
+        self.w.add_entity("position")
+
+        stats = self.w.stats()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(stats["event"][EVT_ENTITY_ADDED]["count"], 1)
+        self.assertEqual(stats["event"][EVT_COMPONENT_ADDED]["count"], 1)
+        self.assertEqual(stats["listener"][on_added.__qualname__]["count"], 1)
+
+    def test_deferred_listeners(self):
+        calls = []
+        self.w.on(EVT_ENTITY_ADDED, lambda *kargs: calls.append(kargs))
+        self.w.enable_profiling()
+        self.w.defer_events()
+        self.w.add_entity()
+
+        self.assertEqual(calls, [])
+        self.assertNotIn("listener", self.w.stats())
+
+        self.w.flush_events()
+
+        self.assertEqual(len(calls), 1)
+        listeners = self.w.stats()["listener"].values()
+        self.assertEqual(sum(s["count"] for s in listeners), 1)
+
+    def test_systems(self):
+        self.w.add_system(System("move", writes=["position"], run=lambda w, dt: None))
+        self.w.enable_profiling()
+        self.w.tick(0.1)
+        self.w.tick(0.1)
+
+        stats = self.w.stats()
+
+        self.assertEqual(stats["system"]["move"]["count"], 2)
+        self.assertEqual(stats["operation"]["tick"]["count"], 2)
+        self.assertEqual(stats["event"][EVT_TICK]["count"], 2)
+
+    def test_chrome_trace(self):
+        with self.assertRaises(ProfilingNotEnabled):
+            self.w.export_trace("unused.json")
+
+        self.w.enable_profiling(trace=True)
+        self.w.add_entity("position")
+
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            self.w.export_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            os.remove(path)
+
+        names = [event["name"] for event in trace["traceEvents"]]
+        self.assertIn("add_entity", names)
+        self.assertIn(EVT_ENTITY_ADDED, names)
+        for event in trace["traceEvents"]:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["dur"], 0)
+
+    def test_any_dispatcher(self):
+        dispatcher = EventDispatcherMixin()
+        dispatcher.on("test", lambda: None)
+        profiler = Profiler()
+        profiler.attach(dispatcher)
+
+        dispatcher.fire("test")
+        dispatcher.fire("other")
+        profiler.detach()
+        dispatcher.fire("test")
+
+        stats = profiler.stats()
+        self.assertEqual(stats["event"]["test"]["count"], 1)
+        self.assertEqual(stats["event"]["other"]["count"], 1)
+
+        profiler.reset()
+        self.assertEqual(profiler.stats(), {})
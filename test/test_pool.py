@@ -0,0 +1,108 @@
+from unittest import TestCase
+from unittest.mock import Mock
+from becs import World
+from becs.meta import ComponentMeta, FieldMeta
+from becs.pool import ComponentPool
+from becs.reactive_dict import EVT_ITEM_CHANGED
+
+POSITION = ComponentMeta(
+    "Position",
+    "position",
+    [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+)
+
+
+class ComponentPoolTests(TestCase):
+    def test_reuse(self):
+        pool = ComponentPool(POSITION, max_size=2)
+        first = pool.acquire({"x": 1.0})
+        self.assertEqual(first, {"x": 1.0, "y": 0.0})
+
+        listener = Mock()
+        first.on(EVT_ITEM_CHANGED, listener)
+        first.tag = {"id": "1"}
+        first["y"] = 2.0
+        self.assertTrue(pool.release(first))
+        self.assertEqual(first, {"x": 0.0, "y": 0.0})
+        self.assertIsNone(first.tag)
+
+        second = pool.acquire()
+        self.assertIs(second, first)
+        second["x"] = 3.0
+        listener.assert_called_once()
+
+        self.assertEqual(pool.stats()["hits"], 1)
+        self.assertEqual(pool.stats()["misses"], 1)
+
+    def test_max_size(self):
+        pool = ComponentPool(POSITION, max_size=2)
+        instances = pool.acquire_many(3)
+        self.assertEqual([pool.release(i) for i in instances], [True, True, False])
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+        reused = pool.acquire_many(3, {"y": 5.0})
+        self.assertEqual([i["y"] for i in reused], [5.0] * 3)
+        self.assertEqual(pool.stats()["hits"], 2)
+        self.assertEqual(pool.stats()["misses"], 4)
+
+    def test_slots(self):
+        slot_class = POSITION.compile()
+        pool = ComponentPool(POSITION, slot_class)
+        first = pool.acquire({"x": 1.0})
+        listener = Mock()
+        first.on(EVT_ITEM_CHANGED, listener)
+        pool.release(first)
+
+        second = pool.acquire({"y": 2.0})
+        self.assertIs(second, first)
+        self.assertEqual(dict(second.items()), {"x": 0.0, "y": 2.0})
+        second.x = 4.0
+        listener.assert_not_called()
+
+
+class WorldPoolTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        self.w.define_component(POSITION, pool_size=100)
+
+    def test_churn(self):
+        ids = self.w.add_entities(10, ["position"])
+        instances = [self.w.get_component(id, "position") for id in ids]
+        instances[0]["x"] = 5.0
+        self.w.remove_entities(ids)
+
+        ids = self.w.add_entities(10, ["position"], {"position": {"y": 1.0}})
+        reused = [self.w.get_component(id, "position") for id in ids]
+        self.assertEqual({id(i) for i in reused}, {id(i) for i in instances})
+        self.assertEqual([i["x"] for i in reused], [0.0] * 10)
+        self.assertEqual([i["y"] for i in reused], [1.0] * 10)
+        self.assertEqual(reused[0].tag["entity_id"], ids[0])
+
+        # reused instances report changes for their new entity only
+        tick = self.w.change_tick
+        self.w.tick(0.1)
+        reused[3]["x"] = 1.0
+        self.assertEqual(self.w.changed_since(tick, "position"), [ids[3]])
+
+        e1 = self.w.add_entity()
+        self.w.remove_component(ids[0], "position")
+        self.w.add_component(e1, "position")
+        self.assertIs(self.w.get_component(e1, "position"), reused[0])
+        self.assertEqual(self.w.pool_stats()["position"]["hits"], 11)
+
+    def test_deferred_events(self):
+        self.w.defer_events()
+        e1 = self.w.add_entity("position")
+        position = self.w.get_component(e1, "position")
+        position["x"] = 1.0
+        self.w.remove_entity(e1)
+
+        # held back while a queued change still points at it
+        e2 = self.w.add_entity("position")
+        self.assertIsNot(self.w.get_component(e2, "position"), position)
+        self.assertEqual(self.w.pool_stats()["position"]["size"], 0)
+
+        self.w.tick(0.1)
+        self.assertEqual(self.w.pool_stats()["position"]["size"], 1)
+        self.assertEqual(position, {"x": 0.0, "y": 0.0})
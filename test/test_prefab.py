@@ -0,0 +1,96 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from becs import EVT_ENTITIES_ADDED, World
+from becs.columnar import numpy
+from becs.exceptions import ComponentNotFound, FieldNotFound, PrefabNotFound
+from becs.meta import ComponentMeta, FieldMeta
+
+
+class PrefabTests(TestCase):
+    columnar = False
+
+    def setUp(self):
+        self.w = World()
+        self.w.define_component(
+            ComponentMeta(
+                "Position",
+                "position",
+                [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+            ),
+            columnar=self.columnar,
+        )
+        self.w.define_component(
+            ComponentMeta(
+                "Unit",
+                "unit",
+                [FieldMeta("Name", "name", str, ""), FieldMeta("HP", "hp", int, 10)],
+            )
+        )
+        self.w.define_component(ComponentMeta("Enemy", "enemy", []))
+        self.w.define_prefab(
+            "orc", {"position": {"y": 5.0}, "unit": {"name": "orc"}, "enemy": None}
+        )
+
+    def test_spawn(self):
+        events = []
+        self.w.on(EVT_ENTITIES_ADDED, lambda *kargs: events.append(kargs))
+
+        ids = self.w.spawn("orc", count=100)
+
+        self.assertEqual(len(ids), 100)
+        self.assertEqual(events, [(ids, ("position", "unit", "enemy"))])
+        for entity_id in (ids[0], ids[-1]):
+            position = self.w.get_component(entity_id, "position")
+            unit = self.w.get_component(entity_id, "unit")
+            self.assertEqual(position, {"x": 0.0, "y": 5.0})
+            self.assertEqual(unit, {"name": "orc", "hp": 10})
+            self.assertTrue(self.w.entity_has_component(entity_id, "enemy"))
+
+    def test_copies_are_independent(self):
+        e1, e2 = self.w.spawn("orc", count=2)
+        self.w.get_component(e1, "unit")["hp"] = 1
+        self.w.get_component(e1, "position")["x"] = 3.0
+
+        self.assertEqual(self.w.get_component(e2, "unit")["hp"], 10)
+        self.assertEqual(self.w.get_component(e2, "position")["x"], 0.0)
+        self.assertEqual(self.w.get_prefab("orc").values["unit"], {"name": "orc"})
+        self.assertEqual(self.w.get_component_meta("unit").defaults()["hp"], 10)
+
+    def test_changes_tracked(self):
+        tick = self.w.change_tick
+        self.w.tick(0.1)
+        e1 = self.w.spawn("orc")[0]
+        self.w.tick(0.1)
+
+        self.assertEqual(self.w.changed_since(tick, "unit"), [e1])
+
+    def test_invalid(self):
+        with self.assertRaises(PrefabNotFound):
+            self.w.spawn("missing")
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.define_prefab("bad", {"missing": None})
+
+        with self.assertRaises(FieldNotFound):
+            self.w.define_prefab("bad", {"unit": {"missing": 1}})
+
+        with self.assertRaises(FieldNotFound):
+            self.w.define_prefab("bad", {"enemy": {"missing": 1}})
+
+    def test_snapshot(self):
+        fd, path = tempfile.mkstemp(suffix=".becs")
+        os.close(fd)
+        try:
+            self.w.save(path)
+            loaded = World.load(path)
+        finally:
+            os.remove(path)
+
+        e1 = loaded.spawn("orc")[0]
+        self.assertEqual(loaded.get_component(e1, "unit")["name"], "orc")
+
+
+@skipUnless(numpy, "numpy is not installed")
+class ColumnarPrefabTests(PrefabTests):
+    columnar = True
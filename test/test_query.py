@@ -0,0 +1,73 @@
+from unittest import TestCase
+from becs import World
+from becs.exceptions import ComponentNotFound
+from becs.meta import ComponentMeta, FieldMeta
+
+
+class QueryTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        for name in ("position", "velocity", "frozen"):
+            self.w.define_component(
+                ComponentMeta(name, name, [FieldMeta("X", "x", float, 0.0)])
+            )
+
+    def test_query_matches(self):
+        e1 = self.w.add_entity("position", "velocity")
+        e2 = self.w.add_entity("position")
+        e3 = self.w.add_entity("velocity", "position", "frozen")
+
+        q = self.w.query("position", "velocity")
+
+        self.assertSetEqual(set(q.entities()), {e1, e3})
+        self.assertEqual(len(q), 2)
+        self.assertTrue(e1 in q)
+        self.assertFalse(e2 in q)
+
+        rows = {row[0]: row[1:] for row in q}
+        self.assertIs(rows[e3][0], self.w.get_component(e3, "position"))
+        self.assertIs(rows[e3][1], self.w.get_component(e3, "velocity"))
+
+    def test_query_exclude(self):
+        e1 = self.w.add_entity("position", "velocity")
+        self.w.add_entity("position", "velocity", "frozen")
+
+        q = self.w.query("position", exclude=["frozen"])
+
+        self.assertListEqual(list(q.entities()), [e1])
+
+    def test_query_is_cached(self):
+        q = self.w.query("position", exclude=["frozen"])
+
+        self.assertIs(self.w.query("position", exclude=("frozen",)), q)
+        self.assertIsNot(self.w.query("position"), q)
+
+    def test_query_is_live(self):
+        q = self.w.query("position", "velocity")
+        self.assertEqual(len(q), 0)
+
+        e1 = self.w.add_entity("position")
+        self.assertEqual(len(q), 0)
+
+        self.w.add_component(e1, "velocity")
+        self.assertListEqual(list(q.entities()), [e1])
+
+        self.w.remove_component(e1, "position")
+        self.assertEqual(len(q), 0)
+
+        self.w.add_component(e1, "position")
+        self.assertListEqual(list(q.entities()), [e1])
+
+        self.w.remove_entity(e1)
+        self.assertEqual(len(q), 0)
+
+    def test_query_is_live_with_deferred_events(self):
+        q = self.w.query("position")
+        self.w.defer_events()
+
+        e1 = self.w.add_entity("position", "velocity")
+        self.assertListEqual(list(q.entities()), [e1])
+
+    def test_query_exceptions(self):
+        with self.assertRaises(ComponentNotFound):
+            self.w.query("missing")
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from unittest.mock import Mock
+from becs.events import EventQueue
 from becs.reactive_dict import EVT_ITEM_ADDED, EVT_ITEM_CHANGED, EVT_ITEM_REMOVED, ReactiveDict
 
 class ReactiveDictTests(TestCase):
@@ -64,28 +65,26 @@ class ReactiveDictTests(TestCase):
         mock_removed.assert_not_called()
         mock_modified.assert_called_once_with(rd, "to_modify", 2, 1)
 
-        # reading key resets its "changed" flag
-        self.assertListEqual(rd.keys_changed(), ["to_modify"])
-        no_op = rd.get("to_modify")
-        self.assertListEqual(rd.keys_changed(), [])
-
-        # reading key resets its "changed" flag
-        rd["to_modify"] = 3
-        self.assertListEqual(rd.keys_changed(), ["to_modify"])
-        no_op = rd["to_modify"]
-        self.assertListEqual(rd.keys_changed(), [])
-
-        # looping over keys resets "changed" flag
-        rd["to_modify1"] = 1
-        rd["to_modify2"] = 2
-        rd["to_modify3"] = 3
-        rd["to_modify4"] = 4
-        ## modify
-        rd["to_modify1"] = 2
-        rd["to_modify2"] = 3
-        rd["to_modify3"] = 4
-        rd["to_modify4"] = 5
-
-        self.assertListEqual(rd.keys_changed(), ["to_modify1", "to_modify2", "to_modify3", "to_modify4"])
-        rd.items()
-        self.assertListEqual(rd.keys_changed(), [])
+        # setting the same value again is not a change
+        rd["to_modify"] = 2
+        mock_modified.assert_called_once()
+
+        # a key present with a falsy value is changed, not added
+        rd["empty"] = None
+        rd["empty"] = 1
+        mock_added.assert_called_with(rd, "empty", None, None)
+        mock_modified.assert_called_with(rd, "empty", 1, None)
+
+    def test_deferred_changes_coalesce(self):
+        rd = ReactiveDict({"key": 1})
+        mock_modified = Mock()
+        rd.on(EVT_ITEM_CHANGED, mock_modified)
+
+        queue = EventQueue()
+        rd.set_event_queue(queue)
+
+        rd["key"] = 2
+        rd["key"] = 3
+        queue.flush()
+
+        mock_modified.assert_called_once_with(rd, "key", 3, 1)
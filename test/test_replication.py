@@ -0,0 +1,243 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase, skipUnless
+from becs import HANDLES_LOCAL, World
+from becs.columnar import numpy
+from becs.exceptions import InvalidDelta
+from becs.meta import ComponentMeta, FieldMeta
+from becs.replication import (
+    DeltaRecorder,
+    InProcessTransport,
+    PipeTransport,
+    Replicator,
+    SocketTransport,
+    receive_deltas,
+)
+
+
+def define(w: World, columnar: bool = False):
+    w.define_component(
+        ComponentMeta(
+            "Position",
+            "position",
+            [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+        ),
+        columnar=columnar,
+    )
+    w.define_component(
+        ComponentMeta(
+            "Unit",
+            "unit",
+            [
+                FieldMeta("Name", "name", str, ""),
+                FieldMeta("HP", "hp", int, 10),
+                FieldMeta("Tags", "tags", list, None),
+            ],
+        )
+    )
+
+
+def state(w: World):
+    return {
+        entity_id: {
+            comp: dict(w.get_component(entity_id, comp).items()) for comp in entity
+        }
+        for entity_id, entity in w._entities.items()
+    }
+
+
+class ReplicationTests(TestCase):
+    columnar = False
+    handles = "global"
+
+    def setUp(self):
+        self.source = World(handles=self.handles)
+        self.replica = World(handles=self.handles)
+        define(self.source, self.columnar)
+        define(self.replica, self.columnar)
+        self.recorder = DeltaRecorder(self.source)
+
+    def sync(self):
+        data = self.recorder.flush()
+        if data is not None:
+            self.replica.apply_delta(data)
+
+        return data
+
+    def test_spawn_and_fields(self):
+        e1 = self.source.add_entity("position", "unit")
+        self.source.get_component(e1, "position")["x"] = 4.0
+        self.source.get_component(e1, "unit")["name"] = "orc"
+        self.source.get_component(e1, "unit")["tags"] = ["big", 1]
+        self.sync()
+
+        self.assertEqual(state(self.replica), state(self.source))
+
+        self.source.get_component(e1, "unit")["hp"] = 3
+        self.sync()
+
+        self.assertEqual(self.replica.get_component(e1, "unit")["hp"], 3)
+        self.assertEqual(list(self.replica.query("unit").entities()), [e1])
+
+    def test_structural_changes(self):
+        e1 = self.source.add_entity("position")
+        e2 = self.source.add_entity("position", "unit")
+        self.sync()
+
+        self.source.remove_component(e2, "unit")
+        self.source.add_component(e1, "unit")
+        self.source.remove_entity(e2)
+        self.sync()
+
+        self.assertEqual(state(self.replica), state(self.source))
+        self.assertEqual(set(self.replica._entities), {e1})
+
+    def test_batch_changes(self):
+        ids = self.source.add_entities(10, ["position"], {"position": {"y": 2.0}})
+        self.source.add_components(ids[:5], "unit")
+        self.sync()
+
+        self.assertEqual(state(self.replica), state(self.source))
+
+        self.source.remove_components(ids[:2], "unit")
+        self.source.remove_entities(ids[8:])
+        self.sync()
+
+        self.assertEqual(state(self.replica), state(self.source))
+
+    def test_changes_cancel_out(self):
+        e1 = self.source.add_entity("position")
+        self.sync()
+
+        e2 = self.source.add_entity("position")
+        self.source.remove_entity(e2)
+        self.source.add_component(e1, "unit")
+        self.source.remove_component(e1, "unit")
+
+        self.assertEqual(len(self.recorder), 0)
+        self.assertIsNone(self.sync())
+
+    def test_only_last_value_is_sent(self):
+        e1 = self.source.add_entity("position")
+        self.sync()
+
+        position = self.source.get_component(e1, "position")
+        for i in range(100):
+            position["x"] = float(i)
+
+        data = self.sync()
+
+        self.assertLess(len(data), 64)
+        self.assertEqual(self.replica.get_component(e1, "position")["x"], 99.0)
+
+    def test_mark_changed(self):
+        ids = self.source.add_entities(3, ["position", "unit"])
+        self.sync()
+
+        # writes that fire no events, reported afterwards
+        if self.columnar:
+            self.source.columns("position")["x"] += 2.0
+        else:
+            for entity_id in ids:
+                position = self.source.get_component(entity_id, "position")
+                dict.__setitem__(position, "x", 2.0)
+
+        self.source.get_component(ids[0], "position")["y"] = 1.0
+        self.source.mark_changed("position")
+        self.sync()
+
+        self.assertEqual(state(self.replica), state(self.source))
+        self.assertEqual(self.replica.get_component(ids[2], "position")["x"], 2.0)
+        self.assertEqual(self.replica.get_component(ids[0], "position")["y"], 1.0)
+
+        self.source.mark_changed("position", ids[1:])
+        self.source.remove_entity(ids[1])
+        self.sync()
+
+        self.assertEqual(state(self.replica), state(self.source))
+
+    def test_full_state(self):
+        ids = self.source.add_entities(3, ["position", "unit"])
+        self.source.get_component(ids[0], "unit")["name"] = "late"
+
+        late = World(handles=self.handles)
+        define(late, self.columnar)
+        late.apply_delta(self.recorder.full_state())
+
+        self.assertEqual(state(late), state(self.source))
+
+    def test_full_state_twice(self):
+        ids = self.source.add_entities(3, ["position", "unit"])
+        self.sync()
+        self.source.get_component(ids[0], "unit")["name"] = "again"
+
+        self.replica.apply_delta(self.recorder.full_state())
+
+        self.assertEqual(state(self.replica), state(self.source))
+        self.assertEqual(len(self.replica._components), 6)
+
+    def test_invalid_delta(self):
+        with self.assertRaises(InvalidDelta):
+            self.replica.apply_delta(b"nope")
+
+        with self.assertRaises(InvalidDelta):
+            self.replica.apply_delta(b"XX" + bytes(20))
+
+
+class LocalReplicationTests(ReplicationTests):
+    handles = HANDLES_LOCAL
+
+
+@skipUnless(numpy, "numpy is not installed")
+class ColumnarReplicationTests(ReplicationTests):
+    columnar = True
+
+
+class TransportTests(TestCase):
+    def setUp(self):
+        self.source = World()
+        self.replica = World()
+        define(self.source)
+        define(self.replica)
+
+    def replicate(self, sender, receiver):
+        replicator = Replicator(self.source, sender)
+        e1 = self.source.add_entity("position")
+        self.source.tick(0.1)
+        self.source.get_component(e1, "position")["x"] = 1.5
+        self.source.tick(0.1)
+        self.source.tick(0.1)
+
+        self.assertEqual(receive_deltas(self.replica, receiver, timeout=5), 2)
+        self.assertEqual(self.replica.get_component(e1, "position")["x"], 1.5)
+
+        replicator.close()
+
+    def test_in_process(self):
+        transport = InProcessTransport()
+        self.replicate(transport, transport)
+
+    def test_pipe(self):
+        sender, receiver = PipeTransport.pair()
+        self.replicate(sender, receiver)
+        sender.close()
+        receiver.close()
+
+    def test_unix_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), "replica.sock")
+        server = SocketTransport.listen(path)
+        accepted = []
+        thread = threading.Thread(
+            target=lambda: accepted.append(SocketTransport.accept(server))
+        )
+        thread.start()
+        sender = SocketTransport.connect(path)
+        thread.join()
+
+        self.replicate(sender, accepted[0])
+
+        sender.close()
+        accepted[0].close()
+        server.close()
+        os.unlink(path)
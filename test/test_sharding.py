@@ -0,0 +1,132 @@
+import threading
+from unittest import TestCase
+from becs.exceptions import ComponentNotFound, EntityNotFound, ShardFailed
+from becs.meta import ComponentMeta, FieldMeta
+from becs.sharding import ShardedWorld, node_of
+from becs.system import System
+
+
+def move(world, dt):
+    for entity_id, position, velocity in world.query("position", "velocity"):
+        position["x"] += velocity["x"] * dt
+
+
+def total_x(world):
+    return sum(position["x"] for _, position in world.query("position"))
+
+
+class FakeShard:
+    def __init__(self, node_id: int, fail: bool = False):
+        self.node_id = node_id
+        self.lock = threading.Lock()
+        self.fail = fail
+        self.pending = []
+
+    def send(self, target, args, kwargs):
+        if self.fail:
+            raise ShardFailed(self.node_id)
+
+        self.pending.append(target)
+
+    def receive(self):
+        return self.pending.pop(0)
+
+
+class ShardedWorldTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.w = ShardedWorld(shards=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.w.shutdown()
+
+    def setUp(self):
+        for name in ("position", "velocity"):
+            self.w.define_component(
+                ComponentMeta(name, name, [FieldMeta("X", "x", float, 1.0)])
+            )
+
+    def tearDown(self):
+        self.w.remove_entities(self.w.entities())
+
+    def test_ownership(self):
+        ids = self.w.add_entities(10, ["position"])
+        self.assertEqual(len(ids), 10)
+        self.assertEqual({node_of(entity_id) for entity_id in ids}, {1, 2})
+        self.assertEqual(self.w.count("position"), 10)
+
+        e1 = self.w.add_entity("position")
+        self.assertEqual(self.w.shard_of(e1).node_id, node_of(e1))
+
+    def test_routing(self):
+        e1, e2 = self.w.add_entities(2, ["position"])
+        self.w.add_component(e2, "velocity")
+        self.assertTrue(self.w.entity_has_component(e2, "velocity"))
+        self.assertEqual(self.w.list_entity_components(e1), ["position"])
+
+        position = self.w.get_component(e2, "position")
+        position["x"] = 4.0
+        self.assertEqual(self.w.get_component(e2, "position")["x"], 4.0)
+        self.assertEqual(self.w.find("position", "x", 4.0), [e2])
+
+        self.w.remove_component(e2, "velocity")
+        self.assertFalse(self.w.entity_has_component(e2, "velocity"))
+
+        self.w.remove_entity(e1)
+        with self.assertRaises(EntityNotFound) as raised:
+            self.w.get_component(e1, "position")
+        self.assertEqual(raised.exception.entity_id, e1)
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.add_component(e2, "missing")
+
+        with self.assertRaises(EntityNotFound):
+            self.w.get_component("not-an-id", "position")
+
+    def test_batches(self):
+        ids = self.w.add_entities(6, ["position"])
+        cids = self.w.add_components(ids, "velocity")
+        self.assertEqual(len(cids), 6)
+        self.assertEqual(self.w.count("position", "velocity"), 6)
+
+        self.w.remove_components(ids[:3], "velocity")
+        self.assertEqual(sorted(self.w.entities("velocity")), sorted(ids[3:]))
+
+        self.w.remove_entities(ids[:4])
+        self.assertEqual(sorted(self.w.entities("position")), sorted(ids[4:]))
+
+    def test_systems(self):
+        self.w.add_entities(8, ["position", "velocity"])
+        self.w.add_system(
+            System("move", writes=["position"], reads=["velocity"], run=move)
+        )
+        try:
+            self.w.tick(1.0)
+            self.w.tick(1.0)
+        finally:
+            self.w.remove_system("move")
+
+        self.assertEqual(sum(self.w.map(total_x)), 8 * 3.0)
+        self.assertEqual(len(self.w.map(total_x)), 2)
+
+    def test_prefabs(self):
+        self.w.define_prefab("unit", {"position": {"x": 2.0}, "velocity": None})
+        ids = self.w.spawn("unit", 5)
+
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(self.w.get_component(ids[-1], "position"), {"x": 2.0})
+
+    def test_empty_batches(self):
+        self.assertEqual(self.w.add_components([], "position"), [])
+
+    def test_failed_send(self):
+        shards = [FakeShard(1), FakeShard(2), FakeShard(3, fail=True)]
+        calls = [(shard, ("count", (), {})) for shard in shards]
+
+        with self.assertRaises(ShardFailed):
+            self.w._gather(calls)
+
+        # replies of the shards already called are read, their pipes stay in step
+        self.assertEqual([shard.pending for shard in shards], [[], [], []])
+        self.assertFalse(any(shard.lock.locked() for shard in shards))
@@ -0,0 +1,214 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+from unittest import TestCase, skipUnless
+from becs import HANDLES_LOCAL, World
+from becs.columnar import numpy
+from becs.exceptions import ComponentNotFound, EntityNotFound
+from becs.meta import ComponentMeta, FieldMeta
+from becs.shared import SharedWorldView
+
+
+def read_shared(name, entity_id, conn):
+    with SharedWorldView(name) as view:
+        conn.send(
+            (
+                view.get_component(entity_id, "position"),
+                view.list_entity_components(entity_id),
+                len(list(view.query("position", "unit"))),
+            )
+        )
+
+
+# a reader that isn't a child of the publisher, with a resource tracker of its own
+READER = """
+import sys
+from becs.shared import SharedWorldView
+
+with SharedWorldView(sys.argv[1]) as view:
+    print(len(view.entities()))
+"""
+
+
+class SharedWorldTests(TestCase):
+    handles = "global"
+
+    def setUp(self):
+        self.name = "becs-test-{}".format(os.getpid())
+        self.w = World(handles=self.handles)
+        self.w.define_component(
+            ComponentMeta(
+                "Position",
+                "position",
+                [FieldMeta("X", "x", float, 0.0), FieldMeta("Y", "y", float, 0.0)],
+            )
+        )
+        self.w.define_component(
+            ComponentMeta(
+                "Unit",
+                "unit",
+                [FieldMeta("Name", "name", str, "orc"), FieldMeta("HP", "hp", int, 10)],
+            )
+        )
+        self.w.define_component(ComponentMeta("Dead", "dead", []))
+        self.ids = self.w.add_entities(10, ["position", "unit"])
+        self.w.add_components(self.ids[:3], "dead")
+
+        self.publisher = self.w.publish_shared(self.name)
+        self.view = SharedWorldView(self.name)
+
+    def tearDown(self):
+        self.view.close()
+        self.publisher.close()
+
+    def test_read(self):
+        e1 = self.ids[5]
+        self.assertEqual(self.view.get_component(e1, "position"), {"x": 0.0, "y": 0.0})
+        self.assertEqual(self.view.get_component(e1, "unit"), {"name": "orc", "hp": 10})
+        self.assertEqual(
+            self.view.list_entity_components(self.ids[0]), ["position", "unit", "dead"]
+        )
+        self.assertTrue(self.view.entity_has_component(self.ids[0], "dead"))
+        self.assertFalse(self.view.entity_has_component(e1, "dead"))
+        self.assertEqual(sorted(self.view.entities()), sorted(self.ids))
+
+        rows = list(self.view.query("position", "unit", exclude=["dead"]))
+        self.assertEqual(sorted(row[0] for row in rows), sorted(self.ids[3:]))
+        self.assertEqual(rows[0][2], {"name": "orc", "hp": 10})
+
+        with self.assertRaises(EntityNotFound):
+            self.view.get_component("missing", "position")
+
+        with self.assertRaises(ComponentNotFound):
+            self.view.get_component(self.ids[0], "missing")
+
+    def test_ticks(self):
+        e1 = self.ids[5]
+        self.w.get_component(e1, "position")["x"] = 2.0
+        self.w.get_component(e1, "unit")["name"] = "troll"
+        self.assertEqual(self.view.get_component(e1, "position")["x"], 0.0)
+
+        self.w.tick(0.1)
+        self.assertEqual(self.view.get_component(e1, "position")["x"], 0.0)
+        self.assertTrue(self.view.refresh())
+        self.assertFalse(self.view.refresh())
+        self.assertEqual(self.view.tick, 1)
+        self.assertEqual(self.view.get_component(e1, "position")["x"], 2.0)
+        self.assertEqual(self.view.get_component(e1, "unit")["name"], "troll")
+
+        self.w.remove_entity(e1)
+        self.w.tick(0.1)
+        self.w.tick(0.1)
+        # the frame the view was on has been overwritten, reads move to the latest
+        with self.assertRaises(EntityNotFound):
+            self.view.get_component(e1, "position")
+        self.assertEqual(self.view.tick, 3)
+
+    def test_growth(self):
+        generation = self.publisher.generation
+        self.w.add_entities(50_000, ["position", "unit"])
+        self.publisher.publish()
+
+        self.assertGreater(self.publisher.generation, generation)
+        self.view.refresh()
+        self.assertEqual(len(self.view.entities()), 50_010)
+
+    def test_every(self):
+        self.publisher.close()
+        self.publisher = self.w.publish_shared(self.name, every=2)
+        self.view.close()
+        self.view = SharedWorldView(self.name)
+
+        self.w.tick(0.1)
+        self.assertFalse(self.view.refresh())
+        self.w.tick(0.1)
+        self.assertTrue(self.view.refresh())
+        self.assertEqual(self.view.tick, 2)
+
+    def test_other_process(self):
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=read_shared, args=(self.name, self.ids[0], child)
+        )
+        process.start()
+        self.assertTrue(parent.poll(30))
+        self.assertEqual(
+            parent.recv(),
+            ({"x": 0.0, "y": 0.0}, ["position", "unit", "dead"], 10),
+        )
+        process.join()
+
+    def test_independent_process(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        for _ in range(2):
+            result = subprocess.run(
+                [sys.executable, "-c", READER, self.name],
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            self.assertEqual(result.stdout.strip(), "10", result.stderr)
+
+        # the reader exiting left the segments in place
+        self.w.tick(0.1)
+        with SharedWorldView(self.name) as view:
+            self.assertEqual(view.tick, 1)
+
+    def test_incremental(self):
+        def versions():
+            return {
+                name: table.version for name, table in self.publisher._tables.items()
+            }
+
+        before = versions()
+        self.w.tick(0.1)
+        self.assertEqual(versions(), before)
+
+        e1 = self.ids[5]
+        self.w.get_component(e1, "position")["x"] = 2.0
+        self.w.tick(0.1)
+        changed = versions()
+        self.assertNotEqual(changed["position"], before["position"])
+        self.assertEqual(changed["unit"], before["unit"])
+        self.assertEqual(changed[None], before[None])
+
+        # both buffers get the changed table
+        for _ in range(2):
+            self.view.refresh()
+            self.assertEqual(self.view.get_component(e1, "position")["x"], 2.0)
+            self.assertEqual(self.view.get_component(e1, "unit")["hp"], 10)
+            self.w.tick(0.1)
+
+        self.w.remove_component(e1, "unit")
+        self.w.remove_entity(self.ids[6])
+        self.w.tick(0.1)
+        self.view.refresh()
+        self.assertEqual(self.view.list_entity_components(e1), ["position"])
+        with self.assertRaises(EntityNotFound):
+            self.view.get_component(self.ids[6], "position")
+
+        self.assertEqual(len(list(self.view.query("unit"))), 8)
+        self.assertEqual(versions()["dead"], before["dead"])
+
+    @skipUnless(numpy, "numpy is not installed")
+    def test_columns(self):
+        self.w.define_component(
+            ComponentMeta("Velocity", "velocity", [FieldMeta("X", "x", float, 0.0)]),
+            columnar=True,
+        )
+        self.w.add_components(self.ids, "velocity")
+        self.w.columns("velocity")["x"] += 1.5
+        self.w.tick(0.1)
+        self.view.refresh()
+
+        self.assertEqual(self.view.get_component(self.ids[4], "velocity"), {"x": 1.5})
+        columns = self.view.columns("velocity")
+        self.assertEqual(columns["x"].sum(), 15.0)
+        del columns
+
+
+class LocalHandleSharedWorldTests(SharedWorldTests):
+    handles = HANDLES_LOCAL
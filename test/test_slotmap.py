@@ -0,0 +1,100 @@
+from unittest import TestCase
+from becs import HANDLES_LOCAL, World
+from becs.exceptions import EntityNotFound
+from becs.meta import ComponentMeta, FieldMeta
+from becs.slotmap import SequenceID, SlotMap, generation_of, slot_of
+
+
+class SlotMapTests(TestCase):
+    def test_allocate_and_reuse(self):
+        slots = SlotMap()
+
+        a = slots.allocate()
+        b = slots.allocate()
+        self.assertListEqual([a, b], [0, 1])
+
+        slots.release(a)
+        self.assertFalse(slots.is_alive(a))
+        self.assertEqual(len(slots), 1)
+
+        c = slots.allocate()
+        self.assertEqual(slot_of(c), 0)
+        self.assertEqual(generation_of(c), 1)
+        self.assertNotEqual(a, c)
+        self.assertTrue(slots.is_alive(c))
+
+    def test_allocate_many(self):
+        slots = SlotMap()
+
+        first = slots.allocate_many(3)
+        slots.release(first[1])
+        handles = slots.allocate_many(3)
+
+        self.assertListEqual(first, [0, 1, 2])
+        self.assertEqual(slot_of(handles[0]), 1)
+        self.assertListEqual(handles[1:], [3, 4])
+        self.assertEqual(len(slots), 5)
+
+    def test_claim(self):
+        slots = SlotMap()
+        handle = (3 << 32) | 2
+        slots.claim(handle)
+
+        self.assertTrue(slots.is_alive(handle))
+        self.assertEqual(len(slots), 1)
+        self.assertEqual(sorted(slot_of(slots.allocate()) for _ in range(2)), [0, 1])
+
+        slots.release(handle)
+        slots.claim((4 << 32) | 2)
+        self.assertEqual(generation_of(slots.allocate()), 0)
+
+    def test_sequence_id(self):
+        ids = SequenceID()
+
+        self.assertEqual(ids.next(), 1)
+        self.assertListEqual(ids.next_batch(3), [2, 3, 4])
+
+
+class LocalHandleWorldTests(TestCase):
+    def setUp(self):
+        self.w = World(handles=HANDLES_LOCAL)
+        self.w.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)])
+        )
+
+    def test_entities_are_handles(self):
+        e1 = self.w.add_entity("position")
+        e2, e3 = self.w.add_entities(2, ["position"])
+
+        self.assertListEqual([e1, e2, e3], [0, 1, 2])
+        self.assertIsInstance(self.w._entities[e1]["position"], int)
+        self.assertEqual(self.w.get_component(e2, "position")["x"], 0.0)
+
+    def test_stale_handles(self):
+        e1 = self.w.add_entity("position")
+        self.w.remove_entity(e1)
+        e2 = self.w.add_entity("position")
+
+        self.assertEqual(slot_of(e1), slot_of(e2))
+        with self.assertRaises(EntityNotFound):
+            self.w.get_component(e1, "position")
+
+    def test_global_id(self):
+        e1 = self.w.add_entity()
+        gid = self.w.global_id(e1)
+
+        self.assertTrue(gid > 0xFFFFFFFF)
+        self.assertEqual(self.w.global_id(e1), gid)
+
+        self.w.remove_entity(e1)
+        with self.assertRaises(EntityNotFound):
+            self.w.global_id(e1)
+
+    def test_global_mode(self):
+        w = World()
+        e1 = w.add_entity()
+
+        self.assertEqual(w.global_id(e1), int(e1))
+
+        with self.assertRaises(ValueError):
+            World(handles="other")
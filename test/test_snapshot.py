@@ -0,0 +1,152 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from becs import HANDLES_LOCAL, World
+from becs.columnar import numpy
+from becs.exceptions import EntityNotFound, InvalidSnapshot
+from becs.meta import ComponentMeta, FieldMeta
+
+
+def define(w: World, columnar: bool = False):
+    w.define_component(
+        ComponentMeta(
+            "Position",
+            "position",
+            [FieldMeta("X", "x", float, 0.0), FieldMeta("Layer", "layer", int, 1)],
+        ),
+        columnar=columnar,
+    )
+    w.define_component(
+        ComponentMeta(
+            "Unit",
+            "unit",
+            [
+                FieldMeta("Name", "name", str, ""),
+                FieldMeta("HP", "hp", int, 10),
+                FieldMeta("Alive", "alive", bool, True),
+            ],
+        )
+    )
+    w.define_component(ComponentMeta("Enemy", "enemy", []))
+
+
+class SnapshotTests(TestCase):
+    columnar = False
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".becs")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def assertSameWorld(self, w: World, loaded: World):
+        self.assertSetEqual(set(loaded._entities), set(w._entities))
+        for entity_id in w._entities:
+            self.assertSetEqual(
+                set(loaded.list_entity_components(entity_id)),
+                set(w.list_entity_components(entity_id)),
+            )
+            for comp in w.list_entity_components(entity_id):
+                self.assertEqual(
+                    dict(loaded.get_component(entity_id, comp).items()),
+                    dict(w.get_component(entity_id, comp).items()),
+                )
+
+        self.assertSetEqual(
+            set(loaded.query("position").entities()),
+            set(w.query("position").entities()),
+        )
+
+    def build(self, w: World):
+        define(w, columnar=self.columnar)
+        ids = w.add_entities(5, ["position", "unit"])
+        w.add_entity("enemy", "unit")
+        w.add_entity()
+
+        w.get_component(ids[0], "unit")["name"] = "orc"
+        w.get_component(ids[0], "unit")["hp"] = "unknown"
+        w.get_component(ids[1], "unit")["extra"] = [1, 2]
+        w.get_component(ids[2], "position")["x"] = 2.5
+        w.remove_entity(ids[3])
+
+        return ids
+
+    def test_round_trip(self):
+        w = World(3)
+        ids = self.build(w)
+        w.save(self.path)
+
+        loaded = World.load(self.path, mmap=False)
+
+        self.assertEqual(loaded._node_id, 3)
+        self.assertSameWorld(w, loaded)
+        self.assertEqual(loaded.get_component(ids[1], "unit")["extra"], [1, 2])
+        self.assertIs(loaded.get_component(ids[0], "unit")["alive"], True)
+        self.assertTrue(loaded._eid.next() > int(ids[-1]))
+
+        # loaded worlds keep working
+        loaded.get_component(ids[2], "position")["x"] = 3.0
+        loaded.add_component(ids[2], "enemy")
+        loaded.remove_entity(ids[0])
+
+    def test_pool_size(self):
+        w = World()
+        define(w, columnar=self.columnar)
+        projectile = ComponentMeta(
+            "Projectile", "projectile", [FieldMeta("X", "x", float, 0.0)]
+        )
+        w.define_component(projectile, pool_size=16)
+        w.add_entities(2, ["projectile"])
+        w.save(self.path)
+
+        loaded = World.load(self.path)
+
+        self.assertEqual(loaded._pools["projectile"].max_size, 16)
+        self.assertNotIn("unit", loaded._pools)
+
+    def test_round_trip_local_handles(self):
+        w = World(handles=HANDLES_LOCAL)
+        ids = self.build(w)
+        gid = w.global_id(ids[0])
+        w.save(self.path)
+
+        loaded = World.load(self.path)
+
+        self.assertSameWorld(w, loaded)
+        self.assertEqual(loaded.global_id(ids[0]), gid)
+        with self.assertRaises(EntityNotFound):
+            loaded.get_component(ids[3], "position")
+
+        # the freed slot is reused with a new generation
+        self.assertNotIn(loaded.add_entity(), ids)
+
+    @skipUnless(numpy, "numpy is not installed")
+    def test_columnar_mmap(self):
+        self.columnar = True
+        w = World()
+        ids = self.build(w)
+        w.save(self.path)
+
+        loaded = World.load(self.path, mmap=True)
+
+        self.assertSameWorld(w, loaded)
+        cols = loaded.columns("position")
+        cols["x"] += 1.0
+        self.assertEqual(loaded.get_component(ids[2], "position")["x"], 3.5)
+
+        # the mapping is copy on write, the file is untouched
+        self.assertEqual(
+            World.load(self.path).get_component(ids[2], "position")["x"], 2.5
+        )
+
+        for _ in range(10):
+            loaded.add_entity("position")
+        self.assertEqual(len(loaded.columns("position")), 14)
+
+    def test_invalid_snapshot(self):
+        with open(self.path, "wb") as f:
+            f.write(b"nope")
+
+        with self.assertRaises(InvalidSnapshot):
+            World.load(self.path)
@@ -0,0 +1,180 @@
+import os
+import tempfile
+from unittest import TestCase, skipUnless
+from becs import HANDLES_LOCAL, World
+from becs.columnar import numpy
+from becs.meta import ComponentMeta, FieldMeta
+from becs.storage import SQLiteStorage
+
+
+class SQLiteStorageTests(TestCase):
+    handles = "global"
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.storage = SQLiteStorage(self.path, cache_size=16)
+        self.w = World(handles=self.handles, storage=self.storage)
+        self.w.define_component(
+            ComponentMeta(
+                "Unit",
+                "unit",
+                [FieldMeta("Zone", "zone", str, "a"), FieldMeta("HP", "hp", int, 10)],
+            )
+        )
+        self.w.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)]),
+            slots=True,
+        )
+        self.w.define_component(ComponentMeta("Dead", "dead", []))
+
+    def tearDown(self):
+        self.storage.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_bounded_cache(self):
+        ids = self.w.add_entities(100, ["unit", "position"])
+        self.assertLessEqual(len(self.storage.resident()), 16)
+
+        for i, entity_id in enumerate(ids):
+            self.w.get_component(entity_id, "unit")["hp"] = i
+            self.w.get_component(entity_id, "position")["x"] = float(i)
+
+        self.assertLessEqual(len(self.storage.resident()), 16)
+        self.assertEqual(
+            [self.w.get_component(entity_id, "unit")["hp"] for entity_id in ids],
+            list(range(100)),
+        )
+        self.assertEqual(self.w.get_component(ids[3], "position")["x"], 3.0)
+
+        stats = self.w.storage.stats()
+        self.assertGreater(stats["misses"], 0)
+        self.assertGreater(stats["evictions"], 0)
+
+        self.w.get_component(ids[-1], "unit")
+        self.assertEqual(self.w.storage.stats()["hits"], stats["hits"] + 1)
+
+    def test_query(self):
+        ids = self.w.add_entities(50, ["unit"])
+        self.w.add_components(ids[:10], "position")
+        self.w.add_components(ids[:5], "dead")
+
+        rows = list(self.w.query("unit", "position"))
+        self.assertEqual(sorted(row[0] for row in rows), sorted(ids[:10]))
+        self.assertEqual(rows[0][1], {"zone": "a", "hp": 10})
+
+        for entity_id, unit in self.w.query("unit"):
+            unit["zone"] = "b"
+
+        self.assertEqual(len(self.w.query("unit", exclude=["dead"])), 45)
+        self.assertEqual(sorted(self.w.find("unit", "zone", "b")), sorted(ids))
+
+    def test_find(self):
+        ids = self.w.add_entities(40, ["unit"])
+        for i, entity_id in enumerate(ids):
+            self.w.get_component(entity_id, "unit")["hp"] = i
+
+        self.assertEqual(sorted(self.w.find("unit", "hp", lt=3)), sorted(ids[:3]))
+        self.assertEqual(self.w.find("unit", "hp", 20), [ids[20]])
+        self.assertEqual(sorted(self.storage.find("unit", "hp", ge=38)), ids[38:])
+
+        # values the column can't hold make lookups on the field fall back to a scan
+        self.w.get_component(ids[0], "unit")["hp"] = [1]
+        self.storage.flush()
+        self.assertIsNone(self.storage.find("unit", "hp", 1))
+        self.assertEqual(self.w.find("unit", "hp", [1]), [ids[0]])
+
+    def test_remove(self):
+        ids = self.w.add_entities(40, ["unit", "position"])
+        self.w.remove_entities(ids[:30])
+        self.w.remove_component(ids[30], "unit")
+
+        self.assertEqual(len(self.storage), 19)
+        self.assertEqual(sorted(self.w.find("unit", "zone", "a")), sorted(ids[31:]))
+
+    def test_stale_reference(self):
+        e1 = self.w.add_entity("unit")
+        unit = self.w.get_component(e1, "unit")
+        self.w.add_entities(40, ["unit"])
+        self.assertFalse(any(c is unit for c in self.storage.resident()))
+
+        # written through once evicted
+        unit["hp"] = 1
+        self.assertEqual(self.w.get_component(e1, "unit")["hp"], 1)
+
+    def test_reloaded_reference(self):
+        storage = SQLiteStorage(cache_size=2)
+        self.addCleanup(storage.close)
+        w = World(handles=self.handles, storage=storage)
+        w.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", int, 0)])
+        )
+        e1, e2, e3 = w.add_entities(3, ["position"])
+        held = w.get_component(e1, "position")
+        w.get_component(e2, "position")
+        w.get_component(e3, "position")
+
+        # an evicted instance that is still held comes back instead of a copy
+        self.assertIs(w.get_component(e1, "position"), held)
+        held["x"] = 42
+        self.assertEqual(w.find("position", "x", 42), [e1])
+
+        w.get_component(e2, "position")
+        w.get_component(e3, "position")
+        self.assertEqual(w.get_component(e1, "position")["x"], 42)
+
+    def test_deferred_events(self):
+        e1 = self.w.add_entity("unit")
+        self.w.defer_events()
+        self.w.get_component(e1, "unit")["hp"] = 1
+        self.w.add_entities(40, ["unit"])
+        self.w.flush_events()
+
+        self.assertEqual(self.w.get_component(e1, "unit")["hp"], 1)
+
+    def test_extra_keys(self):
+        e1 = self.w.add_entity("unit")
+        self.w.get_component(e1, "unit")["name"] = "orc"
+        self.w.add_entities(40, ["unit"])
+
+        self.assertEqual(self.w.get_component(e1, "unit")["name"], "orc")
+
+    def test_snapshot(self):
+        ids = self.w.add_entities(40, ["unit"])
+        self.w.get_component(ids[0], "unit")["hp"] = 1
+        fd, path = tempfile.mkstemp(suffix=".becs")
+        os.close(fd)
+        try:
+            self.w.save(path)
+            loaded = World.load(path)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(loaded.get_component(ids[0], "unit")["hp"], 1)
+        self.assertEqual(len(loaded.query("unit")), 40)
+
+
+class LocalHandleStorageTests(SQLiteStorageTests):
+    handles = HANDLES_LOCAL
+
+
+@skipUnless(numpy, "numpy is not installed")
+class ColumnarStorageTests(TestCase):
+    def test_columnar(self):
+        with SQLiteStorage(cache_size=8) as storage:
+            w = World(storage=storage)
+            w.define_component(
+                ComponentMeta(
+                    "Position", "position", [FieldMeta("X", "x", float, 0.0)]
+                ),
+                columnar=True,
+            )
+            ids = w.add_entities(20, ["position"])
+            w.get_component(ids[0], "position")["x"] = 2.0
+
+            self.assertEqual(w.get_component(ids[0], "position")["x"], 2.0)
+            self.assertEqual(w.columns("position")["x"][0], 2.0)
+            self.assertEqual(w.find("position", "x", 2.0), [ids[0]])
+            self.assertLessEqual(len(storage.resident()), 8)
@@ -0,0 +1,154 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock
+from becs import EVT_TICK, World
+from becs.exceptions import CyclicSystemOrder, StageNotFound, SystemNotFound
+from becs.system import Scheduler, System
+
+
+def noop(world, dt):
+    pass
+
+
+class SystemTests(TestCase):
+    def test_conflicts(self):
+        move = System("move", reads=["velocity"], writes=["position"], run=noop)
+        render = System("render", reads=["position"], run=noop)
+        physics = System("physics", writes=["velocity"], run=noop)
+        ai = System("ai", reads=["velocity"], run=noop)
+
+        self.assertTrue(move.conflicts(render))
+        self.assertTrue(render.conflicts(move))
+        self.assertTrue(move.conflicts(physics))
+        self.assertFalse(render.conflicts(ai))
+
+    def test_subclass(self):
+        class Move(System):
+            reads = frozenset(["velocity"])
+            writes = frozenset(["position"])
+
+        with self.assertRaises(ValueError):
+            Move(reads=["mass"])
+
+        with self.assertRaises(ValueError):
+            System("a")
+
+        class Steer(Move):
+            def run(self, world, dt):
+                world.append(dt)
+
+        steer = Steer(reads=["mass"])
+        self.assertEqual(steer.name, "Steer")
+        self.assertEqual(steer.reads, frozenset(["velocity", "mass"]))
+
+        calls = []
+        steer.run(calls, 0.1)
+        self.assertEqual(calls, [0.1])
+
+
+class SchedulerTests(TestCase):
+    def test_plan_batches(self):
+        s = Scheduler()
+        s.add(System("move", reads=["velocity"], writes=["position"], run=noop))
+        s.add(System("ai", reads=["target"], writes=["intent"], run=noop))
+        s.add(System("render", reads=["position"], run=noop))
+        s.add(System("audio", reads=["sound"], run=noop))
+        s.add(System("input", writes=["intent"], stage="pre-update", run=noop))
+
+        plan = [[[sys.name for sys in batch] for batch in stage] for stage in s.plan()]
+
+        self.assertListEqual(
+            plan, [[["input"]], [["move", "ai", "audio"], ["render"]], []]
+        )
+
+    def test_plan_undeclared(self):
+        s = Scheduler()
+        s.add(System("move", writes=["position"], run=noop))
+        s.add(System("log", run=noop))
+        s.add(System("ai", writes=["intent"], run=noop))
+        s.add(System("audio", reads=["sound"], run=noop))
+
+        plan = [[sys.name for sys in batch] for batch in s.plan()[1]]
+
+        # declaring nothing, log may touch anything and runs alone
+        self.assertListEqual(plan, [["move"], ["log"], ["ai", "audio"]])
+
+    def test_plan_ordering(self):
+        s = Scheduler()
+        s.add(System("b", after=["a"], run=noop))
+        s.add(System("a", run=noop))
+        s.add(System("c", before=["a"], run=noop))
+
+        plan = [[sys.name for sys in batch] for batch in s.plan()[1]]
+
+        self.assertListEqual(plan, [["c"], ["a"], ["b"]])
+
+    def test_cycle(self):
+        s = Scheduler()
+        s.add(System("a", after=["b"], run=noop))
+        s.add(System("b", after=["a"], run=noop))
+
+        with self.assertRaises(CyclicSystemOrder):
+            s.plan()
+
+    def test_exceptions(self):
+        s = Scheduler(["only"])
+
+        with self.assertRaises(StageNotFound):
+            s.add(System("a", run=noop))
+
+        with self.assertRaises(SystemNotFound):
+            s.remove("a")
+
+        with self.assertRaises(SystemNotFound):
+            s.get("a")
+
+    def test_parallel_batch(self):
+        s = Scheduler(max_workers=2)
+        barrier = threading.Barrier(2, timeout=5)
+
+        # both systems must be running at the same time to pass the barrier
+        s.add(System("a", writes=["a"], run=lambda w, dt: barrier.wait()))
+        s.add(System("b", writes=["b"], run=lambda w, dt: barrier.wait()))
+
+        s.run(None, 0.1)
+        s.shutdown()
+
+    def test_errors_propagate(self):
+        s = Scheduler()
+
+        def boom(world, dt):
+            raise ValueError("boom")
+
+        s.add(System("a", writes=["a"], run=boom))
+        s.add(System("b", writes=["b"], run=Mock()))
+
+        with self.assertRaises(ValueError):
+            s.run(None, 0.1)
+
+        s.shutdown()
+
+
+class WorldSystemTests(TestCase):
+    def test_tick(self):
+        w = World()
+        calls = []
+        tick = Mock()
+        w.on(EVT_TICK, tick)
+
+        w.add_system(System("a", run=lambda world, dt: calls.append(("a", dt))))
+        w.add_system(
+            System("b", after=["a"], run=lambda world, dt: calls.append(("b", dt)))
+        )
+
+        w.tick(0.5)
+
+        self.assertListEqual(calls, [("a", 0.5), ("b", 0.5)])
+        tick.assert_called_once_with(1, 0.5)
+        self.assertEqual(w.get_system("a").name, "a")
+
+        w.remove_system("a")
+        with self.assertRaises(SystemNotFound):
+            w.get_system("a")
+
+        w.shutdown()
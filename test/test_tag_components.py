@@ -0,0 +1,163 @@
+import os
+import tempfile
+from unittest import TestCase
+from becs import (
+    EVT_COMPONENT_ADDED,
+    EVT_COMPONENT_REMOVED,
+    EVT_COMPONENTS_ADDED,
+    HANDLES_LOCAL,
+    World,
+)
+from becs.exceptions import ComponentNotFound, EntityNotFound
+from becs.meta import TAG_INSTANCE, ComponentMeta, FieldMeta
+from becs.replication import DeltaRecorder
+
+
+class TagComponentTests(TestCase):
+    def setUp(self):
+        self.w = World()
+        self.w.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)])
+        )
+        self.w.define_component(ComponentMeta("Enemy", "enemy", []))
+        self.w.define_component(ComponentMeta("Dead", "dead", []))
+
+    def test_no_instances(self):
+        e1 = self.w.add_entity("position", "enemy")
+
+        self.assertIn("enemy", self.w._tags)
+        self.assertEqual(list(self.w._entities[e1]), ["position"])
+        self.assertEqual(len(self.w._components), 1)
+        self.assertTrue(self.w.entity_has_component(e1, "enemy"))
+        self.assertFalse(self.w.entity_has_component(e1, "dead"))
+        self.assertIs(self.w.get_component(e1, "enemy"), TAG_INSTANCE)
+        self.assertEqual(set(self.w.list_entity_components(e1)), {"position", "enemy"})
+
+        # the entity stays in the same archetype
+        self.assertEqual(
+            self.w._entity_archetype[e1].signature, frozenset(["position"])
+        )
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.get_component(e1, "dead")
+
+    def test_add_and_remove(self):
+        added = []
+        removed = []
+        self.w.on(EVT_COMPONENT_ADDED, lambda *kargs: added.append(kargs))
+        self.w.on(EVT_COMPONENT_REMOVED, lambda *kargs: removed.append(kargs))
+
+        e1 = self.w.add_entity()
+        self.w.add_component(e1, "dead")
+        self.w.remove_component(e1, "dead")
+
+        self.assertEqual(added, [(e1, None, "dead")])
+        self.assertEqual(removed, [(e1, None, "dead")])
+        self.assertFalse(self.w.entity_has_component(e1, "dead"))
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.remove_component(e1, "dead")
+
+        self.w.add_component(e1, "dead")
+        self.w.remove_entity(e1)
+        self.assertEqual(len(removed), 2)
+        self.assertNotIn(e1, self.w._tags["dead"])
+
+    def test_bulk(self):
+        events = []
+        self.w.on(EVT_COMPONENTS_ADDED, lambda *kargs: events.append(kargs))
+        ids = self.w.add_entities(1000, ["position", "enemy"])
+        self.w.add_components(ids[:500], "dead")
+
+        self.assertEqual(len(self.w._tags["enemy"]), 1000)
+        self.assertEqual(len(self.w._tags["dead"]), 500)
+        self.assertEqual(events[0][0], ids[:500])
+
+        self.w.remove_components(ids[:100], "dead")
+        self.assertEqual(len(self.w._tags["dead"]), 400)
+
+        with self.assertRaises(ComponentNotFound):
+            self.w.remove_components(ids[:200], "dead")
+
+        with self.assertRaises(EntityNotFound):
+            self.w.remove_components(["missing"], "dead")
+
+        self.w.remove_entities(ids[:600])
+        self.assertEqual(len(self.w._tags["enemy"]), 400)
+        self.assertEqual(len(self.w._tags["dead"]), 0)
+
+    def test_query(self):
+        e1, e2, e3 = self.w.add_entities(3, ["position", "enemy"])
+        e4 = self.w.add_entity("position")
+        self.w.add_component(e2, "dead")
+
+        alive = self.w.query("position", "enemy", exclude=["dead"])
+        self.assertEqual(sorted(alive.entities()), sorted([e1, e3]))
+        self.assertEqual(len(alive), 2)
+        self.assertIn(e1, alive)
+        self.assertNotIn(e2, alive)
+        self.assertNotIn(e4, alive)
+
+        rows = {row[0]: row[1:] for row in alive}
+        self.assertIs(rows[e1][0], self.w.get_component(e1, "position"))
+        self.assertIs(rows[e1][1], TAG_INSTANCE)
+
+        self.assertEqual(list(self.w.query("dead").entities()), [e2])
+        self.assertEqual(list(self.w.query("position", "dead")), [
+            (e2, self.w.get_component(e2, "position"), TAG_INSTANCE)
+        ])
+
+        # queries follow later tag changes
+        self.w.remove_component(e2, "dead")
+        self.assertEqual(len(alive), 3)
+
+    def test_changes(self):
+        tick = self.w.change_tick
+        self.w.tick(0.1)
+        ids = self.w.add_entities(2, ["enemy"])
+        e3 = self.w.add_entity("dead")
+
+        self.assertEqual(self.w.changed_since(tick, "enemy"), ids)
+        self.assertEqual(self.w.changed_since(tick, "dead"), [e3])
+
+        self.w.remove_entities(ids)
+        self.assertEqual(self.w.changed_since(tick, "enemy"), [])
+
+    def test_snapshot(self):
+        w = World(handles=HANDLES_LOCAL)
+        w.define_component(ComponentMeta("Enemy", "enemy", []))
+        ids = w.add_entities(3, ["enemy"])
+        w.remove_component(ids[1], "enemy")
+
+        fd, path = tempfile.mkstemp(suffix=".becs")
+        os.close(fd)
+        try:
+            w.save(path)
+            loaded = World.load(path)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(loaded._tags["enemy"], {ids[0], ids[2]})
+        self.assertEqual(len(loaded.query("enemy")), 2)
+
+    def test_replication(self):
+        replica = World()
+        replica.define_component(
+            ComponentMeta("Position", "position", [FieldMeta("X", "x", float, 0.0)])
+        )
+        replica.define_component(ComponentMeta("Enemy", "enemy", []))
+        replica.define_component(ComponentMeta("Dead", "dead", []))
+        recorder = DeltaRecorder(self.w)
+
+        e1, e2 = self.w.add_entities(2, ["position", "enemy"])
+        self.w.add_component(e2, "dead")
+        replica.apply_delta(recorder.flush())
+
+        self.assertEqual(replica._tags["enemy"], {e1, e2})
+        self.assertEqual(replica._tags["dead"], {e2})
+
+        late = World()
+        for meta in self.w._componentMeta.values():
+            late.define_component(meta)
+        late.apply_delta(recorder.full_state())
+        self.assertEqual(late._tags["dead"], {e2})
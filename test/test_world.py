@@ -1,6 +1,15 @@
+import gc
+import weakref
 from unittest import TestCase
 from unittest.mock import MagicMock, Mock, call
-from becs import EVT_COMPONENT_DEFINED, EVT_COMPONENT_REMOVED, EVT_ENTITY_ADDED, EVT_ENTITY_REMOVED, World
+from becs import (
+    EVT_COMPONENT_DEFINED,
+    EVT_COMPONENT_MODIFIED,
+    EVT_COMPONENT_REMOVED,
+    EVT_ENTITY_ADDED,
+    EVT_ENTITY_REMOVED,
+    World,
+)
 from becs.exceptions import ComponentInstanceNotFound, ComponentNotFound, EntityNotFound
 from becs.meta import ComponentMeta, FieldMeta
 from becs.reactive_dict import EVT_ITEM_CHANGED
@@ -208,3 +217,45 @@ class WorldTests(TestCase):
 
         with self.assertRaises(ComponentInstanceNotFound):
             w.get_component("123", "test")
+
+    def test_components_do_not_pin_world(self):
+        w = World()
+        w.define_component(ComponentMeta("Test", "test", [FieldMeta("F", "f", int, 1)]))
+        comp = w.get_component(w.add_entity("test"), "test")
+
+        ref = weakref.ref(w)
+        del w
+        gc.collect()
+
+        self.assertIsNone(ref())
+        comp["f"] = 2
+
+    def test_defer_events(self):
+        w = World()
+        w.define_component(ComponentMeta("Test", "test", [FieldMeta("F", "f", int, 1)]))
+        added = Mock()
+        modified = Mock()
+        component_modified = Mock()
+        w.on(EVT_ENTITY_ADDED, added)
+        w.on(EVT_COMPONENT_MODIFIED, component_modified)
+
+        w.defer_events()
+        entity_id = w.add_entity("test")
+        comp = w.get_component(entity_id, "test")
+        comp.on(EVT_ITEM_CHANGED, modified)
+        comp["f"] = 2
+        comp["f"] = 3
+
+        added.assert_not_called()
+        modified.assert_not_called()
+        component_modified.assert_not_called()
+
+        w.tick(0.1)
+
+        added.assert_called_once_with(entity_id, ("test",))
+        modified.assert_called_once_with(comp, "f", 3, 1)
+        component_modified.assert_called_once_with(entity_id, "test", "f", 3, 1)
+
+        w.defer_events(False)
+        comp["f"] = 4
+        self.assertEqual(modified.call_count, 2)